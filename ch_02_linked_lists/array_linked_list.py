@@ -0,0 +1,551 @@
+"""
+Array-backed implementation of the linked list used in chapter 2.
+
+Instead of allocating a Python object per node, ArrayLinkedList keeps node values and next
+pointers in two parallel columns. A next pointer is an integer index into the columns, -1 stands
+for None. Node objects are created lazily only when somebody asks for them, so the exercises from
+chapter 2 can work with this list exactly as they work with LinkedList.
+
+"""
+from array import array, typecodes
+from math import isqrt
+import unittest
+from weakref import KeyedRef
+
+from .linked_list import LinkedList, flat_memoryview, numpy
+
+
+class ArrayListNode:
+    """
+    Node of an ArrayLinkedList.
+
+    This is a light proxy which reads and writes the columns of the list it belongs to. The list
+    never creates two proxies for the same node at a time, so nodes can be compared by identity as
+    usual.
+
+    Args:
+        lst (ArrayLinkedList): List which stores the node.
+        index (int): Index of the node in the list columns.
+
+    Attributes:
+        index (int): Index of the node in the list columns.
+
+    """
+    __slots__ = ('_list', 'index', '__weakref__')
+
+    def __init__(self, lst, index):
+        self._list = lst
+        self.index = index
+
+    @property
+    def value(self):
+        """
+        Value of the node.
+        """
+        return self._list.values[self.index]
+
+    @value.setter
+    def value(self, value):
+        self._list.values[self.index] = value
+
+    @property
+    def next(self):
+        """
+        Pointer to the next node in the list or None.
+        """
+        next_index = self._list.links[self.index]
+        if next_index < 0:
+            return None
+        return self._list.node(next_index)
+
+    @next.setter
+    def next(self, node):
+        self._list.links[self.index] = self._list._index_of(node)
+        self._list.invalidate()
+
+
+class ArrayLinkedList(LinkedList):
+    """
+    Singly linked list which stores its nodes in arrays.
+
+    Values are stored in a list, or in a typed array if typecode is given. Next pointers are stored
+    in an array of 64-bit integers. Slots of nodes which were unlinked from the list can be
+    returned to a free-list with release() or collect() and are reused by new nodes.
+
+    A list created with from_buffer() uses the buffer itself as the values column. The column is
+    copied to an array only when the list needs to grow.
+
+    Nodes relink through the list, so the cached length and tail are dropped exactly when nodes
+    are relinked, and the list keeps its cache after handing nodes out. Call invalidate() after
+    changing links or head_index directly.
+
+    Args:
+        iterable: Optional iterable of arbitrary objects used to populate the list.
+        typecode (str): Optional array typecode for the values column, see the array module.
+            Typed storage takes a few bytes per value instead of a reference to a Python object.
+
+    Attributes:
+        values (list, array or memoryview): Values of the nodes.
+        links (array): Index of the next node for every node, -1 if there is no next node.
+        head_index (int): Index of the first node of the list, -1 for empty list.
+
+    """
+
+    def __init__(self, iterable=None, typecode=None):
+        self.values = [] if typecode is None else array(typecode)
+        self.links = array('q')
+        self.head_index = -1
+        self._free_index = -1
+        self._nodes = {}
+        super().__init__(iterable)
+
+    @property
+    def _head(self):
+        if self.head_index < 0:
+            return None
+        return self.node(self.head_index)
+
+    @_head.setter
+    def _head(self, node):
+        self.head_index = self._index_of(node)
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """
+        Create a list which uses a buffer-protocol object as its values column.
+
+        The values are not copied if the buffer is contiguous and its format is supported by the
+        array module, so changes of node values are visible in the buffer and vice versa. Links are
+        created in bulk.
+
+        Args:
+            buffer: Bytes, bytearray, array, NumPy array or any other buffer-protocol object.
+
+        Returns:
+            ArrayLinkedList
+
+        """
+        view = flat_memoryview(buffer)
+        lst = cls()
+        if view.format in typecodes and view.c_contiguous:
+            lst.values = view
+        else:
+            lst.values = view.tolist()
+        lst._link_slots(0)
+        return lst
+
+    def to_numpy(self, dtype=None):
+        if numpy is None or isinstance(self.values, list):
+            return super().to_numpy(dtype)
+        order = numpy.fromiter(self._indices(), dtype=numpy.int64, count=len(self))
+        values = numpy.frombuffer(self.values, dtype=self.typecode)[order]
+        return values if dtype is None else values.astype(dtype)
+
+    @property
+    def typecode(self):
+        """
+        Typecode of the values column, None if the values are stored in a list.
+        """
+        if isinstance(self.values, list):
+            return None
+        if isinstance(self.values, memoryview):
+            return self.values.format
+        return self.values.typecode
+
+    def extend(self, iterable):
+        """
+        Add values from an iterable to the end of the list.
+
+        New nodes are appended to the columns in bulk, without creating node objects. If a value
+        cannot be stored or the iterable raises, the list is left unchanged.
+
+        Complexity: O(K) time, where K is the number of added values.
+
+        """
+        if iterable is self:
+            iterable = list(iterable)
+        self._make_growable()
+        start = len(self.values)
+        try:
+            self.values.extend(iterable)
+            self._link_slots(start)
+        except BaseException:
+            del self.values[start:]
+            raise
+
+    def _link_slots(self, start):
+        """
+        Append nodes stored in the column slots from start to the end of the columns to the list.
+        """
+        tail = self._last()
+        end = len(self.values)
+        if end == start:
+            return
+        self.links.extend(range(start + 1, end + 1))
+        self.links[-1] = -1
+        if tail is None:
+            self.head_index = start
+        else:
+            self.links[tail.index] = start
+
+        if self._checkpoints is not None:
+            step = self._checkpoint_step
+            first = -(-self._size // step) * step
+            for position in range(first, self._size + end - start, step):
+                self._checkpoints.append(self.node(start + position - self._size))
+
+        self._tail = self.node(end - 1)
+        self._size += end - start
+
+    def _make_growable(self):
+        if isinstance(self.values, memoryview):
+            values = array(self.values.format)
+            values.frombytes(self.values.cast('B'))
+            self.values = values
+
+    def _indices(self):
+        links = self.links
+        index = self.head_index
+        while index >= 0:
+            yield index
+            index = links[index]
+
+    def __iter__(self):
+        values = self.values
+        links = self.links
+        index = self.head_index
+        while index >= 0:
+            yield values[index]
+            index = links[index]
+
+    def _recount(self):
+        links = self.links
+        size = 0
+        tail_index = index = self.head_index
+        checkpoint = -1
+        power = 1
+        while index >= 0:
+            if index == checkpoint:
+                raise ValueError('linked list has a loop')
+            size += 1
+            if size == power:
+                checkpoint = index
+                power *= 2
+            tail_index = index
+            index = links[index]
+        self._size = size
+        self._tail = self.node(tail_index) if size else None
+
+    def _rebuild_index(self):
+        step = self._index_step or max(1, isqrt(len(self)))
+        links = self.links
+        checkpoints = []
+        index = self.head_index
+        position = 0
+        while index >= 0:
+            if position % step == 0:
+                checkpoints.append(self.node(index))
+            index = links[index]
+            position += 1
+        self._checkpoints = checkpoints
+        self._checkpoint_step = step
+
+    def _walk(self, node, steps):
+        links = self.links
+        index = node.index
+        for i in range(steps):
+            index = links[index]
+            if index < 0:
+                return None
+        return self.node(index)
+
+    def _new_list(self):
+        return type(self)(typecode=self.typecode)
+
+    def _expose(self, node=None):
+        pass
+
+    def _link(self, node, next_node):
+        self.links[node.index] = self._index_of(next_node)
+
+    def node(self, index):
+        """
+        Get node stored at the given index of the columns.
+
+        Args:
+            index (int): Column index, not a position in the list.
+
+        Returns:
+            ArrayListNode
+
+        """
+        node_ref = self._nodes.get(index)
+        if node_ref is not None:
+            node = node_ref()
+            if node is not None:
+                return node
+        node = ArrayListNode(self, index)
+        self._nodes[index] = KeyedRef(node, self._forget_node, index)
+        return node
+
+    def release(self, node):
+        """
+        Return a node slot to the free-list so that it can be reused by new nodes.
+
+        The node must be already unlinked from the list and must not be used after the call.
+
+        Args:
+            node (ArrayListNode): Node to release.
+
+        """
+        self._release_index(self._index_of(node))
+
+    def collect(self):
+        """
+        Release slots of all the nodes which are not reachable from the head.
+
+        Slots of nodes still referenced by node objects are kept.
+
+        Complexity: O(C) time, O(C) additional space, where C is the size of the columns.
+
+        Returns:
+            int: Number of released slots.
+
+        """
+        size = len(self.links)
+        used = bytearray(size)
+
+        index = self.head_index
+        while index >= 0 and not used[index]:
+            used[index] = 1
+            index = self.links[index]
+
+        index = self._free_index
+        while index >= 0:
+            used[index] = 1
+            index = self.links[index]
+
+        released = 0
+        for index in range(size):
+            if not used[index] and index not in self._nodes:
+                self._release_index(index)
+                released += 1
+        return released
+
+    def _new_node(self, value, next_node=None):
+        next_index = self._index_of(next_node)
+        if self._free_index < 0:
+            self._make_growable()
+            index = len(self.links)
+            self.values.append(value)
+            self.links.append(next_index)
+        else:
+            index = self._free_index
+            self._free_index = self.links[index]
+            self.values[index] = value
+            self.links[index] = next_index
+        return self.node(index)
+
+    def _forget_node(self, node_ref):
+        if self._nodes.get(node_ref.key) is node_ref:
+            del self._nodes[node_ref.key]
+
+    def _release_index(self, index):
+        if isinstance(self.values, list):
+            self.values[index] = None
+        self.links[index] = self._free_index
+        self._free_index = index
+
+    def _index_of(self, node):
+        if node is None:
+            return -1
+        if not isinstance(node, ArrayListNode) or node._list is not self:
+            raise ValueError('node belongs to a different list')
+        return node.index
+
+
+class TestArrayLinkedList(unittest.TestCase):
+    """
+    Test for ArrayLinkedList class.
+    """
+
+    def test_init(self):
+        for lst in (ArrayLinkedList(), ArrayLinkedList([]), ArrayLinkedList('')):
+            self.assertIsNone(lst.head)
+            self.assertEqual(lst.head_index, -1)
+
+        iterables = [
+            'qwertyuiop',
+            [1, 2, 3, 4, 5, 6, 7, 8, 9],
+            (1, 'a', 'abc', [1, 2, 3], ('a', 'b', 1), None)
+        ]
+        for iterable in iterables:
+            for lst in (ArrayLinkedList(iterable), ArrayLinkedList(iter(iterable))):
+                node = lst.head
+                for value in iterable:
+                    self.assertEqual(node.value, value)
+                    node = node.next
+                self.assertIsNone(node)
+
+    def test_typecode(self):
+        lst = ArrayLinkedList(range(5), typecode='q')
+        self.assertIsInstance(lst.values, array)
+        self.assertEqual(lst, LinkedList(range(5)))
+        with self.assertRaises(TypeError):
+            ArrayLinkedList(['a'], typecode='q')
+
+    def test_repr_eq_getitem(self):
+        lst = ArrayLinkedList([1, 'a', (2, 'b')])
+        self.assertEqual(repr(lst), "ArrayLinkedList([1, 'a', (2, 'b')])")
+        self.assertEqual(lst, LinkedList([1, 'a', (2, 'b')]))
+        self.assertNotEqual(lst, LinkedList([1, 'a']))
+        self.assertEqual(lst[1].value, 'a')
+        with self.assertRaises(IndexError):
+            lst[3]
+
+    def test_append_extend(self):
+        lst = ArrayLinkedList(typecode='q')
+        lst.append(1)
+        lst.extend([2, 3])
+        lst.appendleft(0)
+        lst.extend([])
+        self.assertEqual(lst, LinkedList([0, 1, 2, 3]))
+        self.assertEqual(len(lst), 4)
+        self.assertEqual(lst.tail.value, 3)
+
+        lst.head.next = None
+        lst.extend([4, 5])
+        self.assertEqual(lst, LinkedList([0, 4, 5]))
+        self.assertIs(lst.tail, lst[2])
+
+    def test_extend_error(self):
+        def values():
+            yield 5
+            raise RuntimeError
+
+        for typecode in (None, 'q'):
+            lst = ArrayLinkedList([1, 2, 3], typecode)
+            if typecode is not None:
+                self.assertRaises(TypeError, lst.extend, [4, 'x'])
+            self.assertRaises(RuntimeError, lst.extend, values())
+            self.assertEqual(len(lst.values), len(lst.links))
+            lst.append(9)
+            self.assertEqual(lst, LinkedList([1, 2, 3, 9]))
+            self.assertEqual(len(lst), 4)
+
+        lst = ArrayLinkedList([1, 2, 3], 'q')
+        lst[2].next = lst[0]
+        self.assertRaises(ValueError, lst.extend, [4])
+        self.assertEqual(len(lst.values), 3)
+
+    def test_index_and_slice(self):
+        lst = ArrayLinkedList(range(10), typecode='q')
+        lst.build_index(3)
+        lst.extend(range(10, 20))
+        lst.append(20)
+        for i in range(21):
+            self.assertEqual(lst[i].value, i)
+        sliced = lst[5:15:2]
+        self.assertIsInstance(sliced, ArrayLinkedList)
+        self.assertEqual(sliced.values.typecode, 'q')
+        self.assertEqual(sliced, LinkedList([5, 7, 9, 11, 13]))
+
+        lst[4].next = lst[6]
+        self.assertEqual(lst[5].value, 6)
+        self.assertEqual(lst[19].value, 20)
+        self.assertRaises(IndexError, lst.__getitem__, 20)
+
+    def test_from_buffer(self):
+        buffer = array('q', range(5))
+        lst = ArrayLinkedList.from_buffer(buffer)
+        self.assertIsInstance(lst.values, memoryview)
+        self.assertEqual(lst.typecode, 'q')
+        self.assertEqual(lst, LinkedList(range(5)))
+        self.assertEqual(len(lst), 5)
+        self.assertIs(lst.tail, lst[4])
+
+        lst[1].value = 10
+        self.assertEqual(buffer[1], 10)
+
+        lst.append(5)
+        self.assertIsInstance(lst.values, array)
+        self.assertEqual(lst, LinkedList([0, 10, 2, 3, 4, 5]))
+        lst[2].value = 20
+        self.assertEqual(buffer[2], 2)
+
+        lst = ArrayLinkedList.from_buffer(b'abc')
+        self.assertEqual(lst, LinkedList([97, 98, 99]))
+        with self.assertRaises(TypeError):
+            lst.head.value = 1
+        lst.appendleft(0)
+        self.assertEqual(lst, LinkedList([0, 97, 98, 99]))
+
+        lst = ArrayLinkedList.from_buffer(memoryview(b'abcd')[::2])
+        self.assertEqual(lst.typecode, None)
+        self.assertEqual(lst, LinkedList([97, 99]))
+        self.assertEqual(lst[:], LinkedList([97, 99]))
+        self.assertEqual(ArrayLinkedList.from_buffer(b''), LinkedList())
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_numpy(self):
+        ndarray = numpy.arange(6, dtype=numpy.int64)
+        lst = ArrayLinkedList.from_numpy(ndarray)
+        lst[0].value = 7
+        self.assertEqual(ndarray[0], 7)
+        lst.head = lst[2]
+        lst.node(1).next = None
+        lst[3].next = lst.node(1)
+        self.assertEqual(lst.to_numpy().tolist(), [2, 3, 4, 5, 1])
+        self.assertEqual(lst.to_numpy(numpy.float64).dtype, numpy.float64)
+
+    def test_loop(self):
+        lst = ArrayLinkedList(range(10), typecode='q')
+        lst[9].next = lst[3]
+        self.assertRaises(ValueError, len, lst)
+        self.assertRaises(ValueError, lst.append, 10)
+        lst[9].next = None
+        self.assertEqual(len(lst), 10)
+
+    def test_node_identity(self):
+        lst = ArrayLinkedList('abc')
+        self.assertIs(lst.head, lst[0])
+        self.assertIs(lst.head.next, lst[1])
+        self.assertIsNot(lst[1], lst[2])
+
+    def test_relink(self):
+        lst = ArrayLinkedList('abcd')
+        lst[1].next = lst[3]
+        self.assertEqual(lst, LinkedList('abd'))
+        lst.head = lst[1]
+        self.assertEqual(lst, LinkedList('bd'))
+        lst.head.next.value = 'x'
+        self.assertEqual(lst, LinkedList('bx'))
+
+        with self.assertRaises(ValueError):
+            lst.head.next = LinkedList('z').head
+        with self.assertRaises(ValueError):
+            lst.head = ArrayLinkedList('z').head
+
+    def test_free_list(self):
+        lst = ArrayLinkedList('abcd')
+        removed = lst.head.next
+        lst.head.next = removed.next
+        lst.release(removed)
+        del removed
+
+        lst.head.next = lst._new_node('x', lst.head.next)
+        self.assertEqual(lst, LinkedList('axcd'))
+        self.assertEqual(len(lst.links), 4)
+
+    def test_collect(self):
+        lst = ArrayLinkedList('abcdef')
+        kept = lst.node(4)
+        lst[0].next = lst[3]
+        lst[1].next = lst.node(5)
+        self.assertEqual(lst.collect(), 2)
+        self.assertEqual(lst.collect(), 0)
+
+        lst[1].next = lst._new_node('y', lst._new_node('z', lst[1].next))
+        self.assertEqual(lst, LinkedList('adyzf'))
+        self.assertEqual(len(lst.links), 6)
+        self.assertEqual(kept.value, 'e')
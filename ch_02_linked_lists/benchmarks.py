@@ -0,0 +1,595 @@
+"""
+Benchmarks for the linked lists and algorithms from chapter 2.
+
+Run from the project directory::
+
+    python -m ch_02_linked_lists.benchmarks [-n SIZE] [NAME ...]
+
+Each benchmark returns a table which is printed by main(). Default sizes are moderate so that the
+whole suite finishes in a couple of minutes, pass a bigger size to reproduce results for huge
+lists.
+
+"""
+from array import array
+import argparse
+from functools import reduce
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import unittest
+
+from .array_linked_list import ArrayLinkedList
+from .doubly_linked_list import DoublyLinkedList
+from .linked_list import LinkedList
+from .mapped_linked_list import MappedLinkedList, save_list
+from .pr_01_remove_dups import REMOVE_DUPS_METHODS, remove_dups1
+from .pr_02_kth_to_last import get_kth_to_last
+from .pr_04_partition import partition, partition_by, partition_parallel, partition_stable
+from .pr_05_sum_lists import (reverse_list, sum_lists, sum_lists_bulk, sum_many_reversed_lists,
+                              sum_many_reversed_lists_parallel, sum_reversed_lists,
+                              sum_reversed_lists_bulk)
+from .pr_06_palindrome import is_palindrome1, is_palindrome2, is_palindrome_hash
+from .pr_07_intersection import MergeForest, get_intersection
+from .pr_08_loop_detection import brent_loop, floyd_loop
+from .xor_linked_list import XorLinkedList
+
+
+def measure_time(func, *args):
+    """
+    Call a function once and measure wall time of the call.
+
+    Garbage collector is disabled during the measurement.
+
+    Returns:
+        float: Time in seconds.
+
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        func(*args)
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def measure_memory(func, *args):
+    """
+    Call a function and measure the amount of memory held by its result.
+
+    Returns:
+        tuple: Size of the memory in bytes and the result of the call.
+
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return size, result
+
+
+def measure_peak_memory(func, *args):
+    """
+    Call a function and measure the peak amount of memory allocated during the call.
+
+    Returns:
+        int: Size of the memory in bytes.
+
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def traverse(lst):
+    """
+    Walk through all the nodes of a list following next pointers.
+    """
+    node = lst.head
+    while node:
+        node = node.next
+
+
+def benchmark_storage(size):
+    """
+    Compare memory footprint and speed of ListNode and array based linked lists.
+    """
+    layouts = [
+        ('LinkedList', LinkedList),
+        ('ArrayLinkedList', ArrayLinkedList),
+        ("ArrayLinkedList 'q'", lambda values: ArrayLinkedList(values, typecode='q')),
+    ]
+    values = range(size)
+    duplicates = [i % (size // 2 + 1) for i in range(size)]
+
+    rows = []
+    for name, factory in layouts:
+        memory, lst = measure_memory(factory, values)
+        rows.append((
+            name,
+            '{:.1f}'.format(memory / size),
+            '{:.3f}'.format(measure_time(factory, values)),
+            '{:.3f}'.format(measure_time(traverse, lst)),
+            '{:.3f}'.format(measure_time(reverse_list, lst)),
+            '{:.3f}'.format(measure_time(partition, lst, size // 2)),
+            '{:.3f}'.format(measure_time(remove_dups1, factory(duplicates))),
+        ))
+        del lst
+
+    header = ('layout', 'bytes/node', 'build, s', 'traverse, s', 'reverse, s', 'partition, s',
+              'remove_dups1, s')
+    return header, rows
+
+
+def benchmark_doubly_linked(size):
+    """
+    Compare memory and operation latency of singly, doubly and XOR linked lists.
+    """
+    layouts = [
+        ('LinkedList', LinkedList),
+        ('DoublyLinkedList', DoublyLinkedList),
+        ('XorLinkedList', XorLinkedList),
+        ("XorLinkedList 'q'", lambda values: XorLinkedList(values, typecode='q')),
+    ]
+    values = list(range(size // 2)) + list(range(size // 2))[::-1]
+    operations = 1000
+
+    def append_values(lst):
+        for i in range(operations):
+            lst.append(i)
+
+    def last_nodes(lst):
+        for i in range(operations):
+            get_kth_to_last(lst, 10)
+
+    rows = []
+    for name, factory in layouts:
+        memory, lst = measure_memory(factory, values)
+        rows.append((
+            name,
+            '{:.1f}'.format(memory / len(values)),
+            '{:.3f}'.format(measure_time(sum, lst)),
+            '{:.3f}'.format(measure_time(is_palindrome2, lst)),
+            '{:.2f}'.format(measure_time(last_nodes, lst) / operations * 1e6),
+            '{:.0f}'.format(measure_time(append_values, lst) / operations * 1e9),
+        ))
+        del lst
+
+    header = ('layout', 'bytes/node', 'traverse, s', 'is_palindrome2, s', 'get_kth_to_last(10), us',
+              'append, ns')
+    return header, rows
+
+
+def benchmark_append(size):
+    """
+    Show that append() and len() take constant time regardless of the list length, also after the
+    nodes have been handed out.
+    """
+    operations = min(size, 10000)
+
+    def append_values(lst):
+        for i in range(operations):
+            lst.append(i)
+
+    def get_length(lst):
+        for i in range(operations):
+            len(lst)
+
+    rows = []
+    for name, factory in (('LinkedList', LinkedList), ('ArrayLinkedList', ArrayLinkedList)):
+        for length in sorted({size // 100, size // 10, size}):
+            lst = factory(range(length))
+            # Hand the nodes out first, as the exercises do.
+            lst.head.next
+            rows.append((
+                name,
+                length,
+                '{:.0f}'.format(measure_time(append_values, lst) / operations * 1e9),
+                '{:.0f}'.format(measure_time(get_length, lst) / operations * 1e9),
+            ))
+            del lst
+
+    return ('layout', 'length', 'append, ns', 'len, ns'), rows
+
+
+def benchmark_index(size):
+    """
+    Compare random access by index with and without the skip-pointer index.
+    """
+    lookups = 1000
+    keys = [random.randrange(size) for i in range(lookups)]
+
+    def lookup(lst):
+        for key in keys:
+            lst[key]
+
+    def lookup_slices(lst):
+        for key in keys:
+            lst[key:key + 10]
+
+    rows = []
+    for name, factory in (('LinkedList', LinkedList), ('ArrayLinkedList', ArrayLinkedList)):
+        for step in (0, None, 64):
+            lst = factory(range(size))
+            if step == 0:
+                index_time = 0
+            else:
+                index_time = measure_time(lst.build_index, step)
+            rows.append((
+                name,
+                'none' if step == 0 else step or 'sqrt',
+                '{:.3f}'.format(index_time),
+                '{:.2f}'.format(measure_time(lookup, lst) / lookups * 1e6),
+                '{:.2f}'.format(measure_time(lookup_slices, lst) / lookups * 1e6),
+            ))
+            del lst
+
+    return ('layout', 'step', 'build index, s', 'lst[i], us', 'lst[i:i+10], us'), rows
+
+
+def benchmark_remove_dups(size):
+    """
+    Compare time and peak memory of the remove_dups methods for few and many duplicates.
+
+    The quadratic runner method is measured on a 1000 times shorter list.
+    """
+    rows = []
+    for distinct in (size, size // 10 or 1):
+        values = [random.randrange(distinct) for i in range(size)]
+        for method, function in REMOVE_DUPS_METHODS.items():
+            length = max(1, size // 1000) if method == 'runner' else size
+            lst = LinkedList(values[:length])
+            memory = measure_peak_memory(function, lst)
+            lst = LinkedList(values[:length])
+            rows.append((
+                method,
+                length,
+                distinct,
+                '{:.1f}'.format(memory / length),
+                '{:.3f}'.format(measure_time(function, lst)),
+            ))
+            del lst
+
+    return ('method', 'length', 'value range', 'peak bytes/node', 'time, s'), rows
+
+
+def benchmark_partition(size):
+    """
+    Compare splice-to-head partition with the stable, multi-way and parallel ones.
+
+    Alternating and "large then small" inputs are adversarial for partition(), which moves every
+    small node to the head there.
+    """
+    half = size // 2
+    shuffled = list(range(size))
+    random.shuffle(shuffled)
+    inputs = [
+        ('sorted', range(size)),
+        ('random', shuffled),
+        ('alternating', [i // 2 + (0 if i % 2 else half) for i in range(size)]),
+        ('large then small', list(range(half, size)) + list(range(half))),
+    ]
+    quartiles = [size // 4, half, size * 3 // 4]
+    methods = [
+        ('LinkedList', 'partition', LinkedList, lambda lst: partition(lst, half)),
+        ('LinkedList', 'partition_stable', LinkedList, lambda lst: partition_stable(lst, half)),
+        ('LinkedList', 'partition_by, 4 ranges', LinkedList,
+         lambda lst: partition_by(lst, quartiles)),
+        ("ArrayLinkedList 'q'", 'partition_stable', lambda values: ArrayLinkedList(values, 'q'),
+         lambda lst: partition_stable(lst, half)),
+        ("ArrayLinkedList 'q'", 'partition_parallel, 4 ranges',
+         lambda values: ArrayLinkedList(values, 'q'),
+         lambda lst: partition_parallel(lst, quartiles, max_workers=4)),
+    ]
+
+    rows = []
+    for input_name, values in inputs:
+        for layout, name, factory, method in methods:
+            lst = factory(values)
+            rows.append((input_name, layout, name, '{:.3f}'.format(measure_time(method, lst))))
+            del lst
+    return ('input', 'layout', 'method', 'time, s'), rows
+
+
+def benchmark_palindrome(size):
+    """
+    Compare throughput and peak memory of the palindrome checks.
+    """
+    half = [random.randrange(1000) for i in range(size // 2)]
+    middle_changed = half + half[::-1]
+    middle_changed[len(half)] = -1
+    inputs = [
+        ('palindrome', half + half[::-1]),
+        ('middle differs', middle_changed),
+        ('ends differ', half + half[::-1] + [-1]),
+    ]
+    methods = [
+        ('is_palindrome1', is_palindrome1),
+        ('is_palindrome2', is_palindrome2),
+        ('is_palindrome_hash', is_palindrome_hash),
+    ]
+
+    rows = []
+    for input_name, values in inputs:
+        lst = LinkedList(values)
+        for name, method in methods:
+            rows.append((
+                input_name,
+                name,
+                '{:.1f}'.format(len(values) / measure_time(method, lst) / 1e6),
+                '{:.2f}'.format(measure_peak_memory(method, lst) / 2 ** 20),
+            ))
+        del lst
+    return ('input', 'method', 'M nodes/s', 'peak memory, MiB'), rows
+
+
+def benchmark_from_buffer(size):
+    """
+    Compare building lists value by value and in bulk from a buffer.
+    """
+    buffer = array('q', range(size))
+    builders = [
+        ('LinkedList(iterable)', LinkedList),
+        ('LinkedList.from_buffer', LinkedList.from_buffer),
+        ('ArrayLinkedList(iterable)', ArrayLinkedList),
+        ("ArrayLinkedList(iterable, 'q')", lambda values: ArrayLinkedList(values, typecode='q')),
+        ('ArrayLinkedList.from_buffer', ArrayLinkedList.from_buffer),
+    ]
+    rows = [(name, '{:.3f}'.format(measure_time(builder, buffer))) for name, builder in builders]
+    return ('constructor', 'time, s'), rows
+
+
+def benchmark_streaming(size):
+    """
+    Compare memory used by a pipeline over materialized lists and over lazy combinators.
+    """
+    lst = LinkedList(range(size))
+
+    def materialized():
+        values = [value for value in lst]
+        odd = [value for value in values if value % 2]
+        squares = [value * value for value in odd]
+        chunks = [squares[i:i + 100] for i in range(0, len(squares), 100)]
+        return max(sum(chunk) for chunk in chunks)
+
+    def streamed():
+        return max(
+            sum(value * value for value in chunk if value % 2) for chunk in lst.chunked(100)
+        )
+
+    rows = []
+    for name, pipeline in (('materialized', materialized), ('streamed', streamed)):
+        rows.append((
+            name,
+            '{:.2f}'.format(measure_peak_memory(pipeline) / 2 ** 20),
+            '{:.3f}'.format(measure_time(pipeline)),
+        ))
+    return ('pipeline', 'peak memory, MiB', 'time, s'), rows
+
+
+def benchmark_sum_lists(size):
+    """
+    Find the crossover point between per-digit and bulk summation of digit lists.
+    """
+    rows = []
+    length = 1
+    while length <= size:
+        lst1 = LinkedList(random.randrange(10) for i in range(length))
+        lst2 = LinkedList(random.randrange(10) for i in range(length))
+        repeat = max(1, 10000 // length)
+
+        def run(func):
+            return measure_time(lambda: [func(lst1, lst2) for i in range(repeat)]) / repeat * 1e6
+
+        rows.append((
+            length,
+            '{:.1f}'.format(run(sum_lists)),
+            '{:.1f}'.format(run(sum_lists_bulk)),
+            '{:.1f}'.format(run(sum_reversed_lists)),
+            '{:.1f}'.format(run(sum_reversed_lists_bulk)),
+        ))
+        length *= 10
+
+    header = ('digits', 'sum_lists, us', 'bulk, us', 'sum_reversed_lists, us', 'bulk, us')
+    return header, rows
+
+
+def benchmark_sum_many(size):
+    """
+    Compare pairwise, single pass and parallel summation of many digit lists.
+    """
+    length = 100
+    lists = [LinkedList(random.randrange(10) for j in range(length))
+             for i in range(max(2, size // length))]
+    methods = [
+        ('pairwise sum_reversed_lists', lambda: reduce(sum_reversed_lists, lists)),
+        ('sum_many_reversed_lists', lambda: sum_many_reversed_lists(lists)),
+        ('parallel, default threshold', lambda: sum_many_reversed_lists_parallel(lists)),
+    ]
+    for workers in (1, 2, 4):
+        methods.append((
+            'parallel, {} workers'.format(workers),
+            lambda workers=workers: sum_many_reversed_lists_parallel(lists, workers, min_digits=0)
+        ))
+    rows = [(name, len(lists), '{:.3f}'.format(measure_time(method))) for name, method in methods]
+    return ('method', 'lists', 'time, s'), rows
+
+
+def benchmark_intersection(size):
+    """
+    Compare pairwise get_intersection() calls with a MergeForest over the same lists.
+
+    Lists have prefixes of random length and merge into random nodes of earlier lists, about
+    size nodes in total.
+    """
+    rows = []
+    for count in (10, 100, 300):
+        prefix = max(1, size // count)
+        lists = []
+        for i in range(count):
+            lst = LinkedList(range(random.randrange(prefix) + 1))
+            if lists:
+                other = random.choice(lists)
+                lst.tail.next = other[random.randrange(len(other))]
+            lists.append(lst)
+
+        def pairwise():
+            return [get_intersection(lists[i], lists[j])
+                    for i in range(count) for j in range(i + 1, count)]
+
+        def forest():
+            return list(MergeForest(lists).pairs())
+
+        rows.append((count, 'pairwise get_intersection', '{:.3f}'.format(measure_time(pairwise))))
+        rows.append((count, 'MergeForest.pairs', '{:.3f}'.format(measure_time(forest))))
+        del lists
+
+    return ('lists', 'method', 'time, s'), rows
+
+
+def benchmark_loop(size):
+    """
+    Compare step counts and time of Floyd's and Brent's loop detection on different loop shapes.
+    """
+    shapes = [
+        ('long tail', size - size // 100 - 1),
+        ('balanced', size // 2),
+        ('long cycle', size // 100),
+    ]
+    layouts = [
+        ('LinkedList', LinkedList),
+        ("ArrayLinkedList 'q'", lambda values: ArrayLinkedList(values, typecode='q')),
+    ]
+
+    rows = []
+    for layout, factory in layouts:
+        lst = factory(range(size))
+        last = lst.tail
+        for shape, mu in shapes:
+            last.next = lst[mu]
+            for name, find_loop in (('floyd', floyd_loop), ('brent', brent_loop)):
+                info = find_loop(lst)
+                rows.append((
+                    layout,
+                    shape,
+                    info.mu,
+                    info.lam,
+                    name,
+                    info.steps,
+                    '{:.3f}'.format(measure_time(find_loop, lst)),
+                ))
+        del lst, last
+
+    return ('layout', 'shape', 'mu', 'lambda', 'method', 'steps', 'time, s'), rows
+
+
+def benchmark_mapped(size):
+    """
+    Compare rebuilding a list from source data with opening a saved memory-mapped list.
+    """
+    source = array('q', range(size))
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'list.bin')
+        save_time = measure_time(save_list, ArrayLinkedList.from_buffer(source), path)
+
+        def rebuild():
+            lst = LinkedList(source)
+            return len(lst), lst.tail, lst[size // 2]
+
+        def open_mapped():
+            with MappedLinkedList(path) as lst:
+                return len(lst), lst.tail
+
+        def open_mapped_middle():
+            with MappedLinkedList(path) as lst:
+                return len(lst), lst.tail, lst[size // 2]
+
+        def traverse_mapped():
+            with MappedLinkedList(path) as lst:
+                for value in lst:
+                    pass
+
+        rows.append(('rebuild LinkedList, len, tail, middle', measure_time(rebuild)))
+        rows.append(('save MappedLinkedList', save_time))
+        rows.append(('open MappedLinkedList, len, tail', measure_time(open_mapped)))
+        rows.append(('open MappedLinkedList, len, tail, middle', measure_time(open_mapped_middle)))
+        rows.append(('open MappedLinkedList, traverse', measure_time(traverse_mapped)))
+
+    rows = [(name, '{:.3f}'.format(seconds * 1e3)) for name, seconds in rows]
+    return ('operation', 'time, ms'), rows
+
+
+BENCHMARKS = {
+    'append': (benchmark_append, 10000000),
+    'doubly_linked': (benchmark_doubly_linked, 1000000),
+    'from_buffer': (benchmark_from_buffer, 1000000),
+    'index': (benchmark_index, 100000),
+    'storage': (benchmark_storage, 1000000),
+    'streaming': (benchmark_streaming, 1000000),
+    'intersection': (benchmark_intersection, 100000),
+    'loop': (benchmark_loop, 1000000),
+    'mapped': (benchmark_mapped, 10000000),
+    'palindrome': (benchmark_palindrome, 1000000),
+    'partition': (benchmark_partition, 1000000),
+    'remove_dups': (benchmark_remove_dups, 1000000),
+    'sum_lists': (benchmark_sum_lists, 1000000),
+    'sum_many': (benchmark_sum_many, 1000000),
+}
+
+
+def print_table(title, header, rows):
+    """
+    Print benchmark results as a plain text table.
+    """
+    widths = [max(len(str(row[i])) for row in [header] + rows) for i in range(len(header))]
+    print(title)
+    for row in [header] + rows:
+        print('  '.join(str(cell).rjust(width) for cell, width in zip(row, widths)))
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run chapter 2 benchmarks.')
+    parser.add_argument('names', nargs='*', metavar='NAME',
+                        help='benchmarks to run, all by default: ' + ', '.join(sorted(BENCHMARKS)))
+    parser.add_argument('-n', '--size', type=int, help='problem size')
+    args = parser.parse_args(argv)
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error('unknown benchmark: {}'.format(name))
+
+    for name in args.names or sorted(BENCHMARKS):
+        benchmark, default_size = BENCHMARKS[name]
+        size = args.size or default_size
+        header, rows = benchmark(size)
+        print_table('{} (size={})'.format(name, size), header, rows)
+
+
+class TestBenchmarks(unittest.TestCase):
+    """
+    Run all the benchmarks on tiny inputs to make sure they keep working.
+    """
+
+    def test_benchmarks(self):
+        for name, (benchmark, default_size) in BENCHMARKS.items():
+            with self.subTest(name=name):
+                header, rows = benchmark(100)
+                self.assertTrue(rows)
+                for row in rows:
+                    self.assertEqual(len(row), len(header))
+
+
+if __name__ == '__main__':
+    main()
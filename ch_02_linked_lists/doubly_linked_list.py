@@ -0,0 +1,209 @@
+"""
+Doubly linked list for use in exercises from chapter 2.
+
+DoublyLinkedList is a LinkedList whose nodes also point to their predecessors. The previous node
+pointers are maintained by the next pointer setter, so the algorithms which relink nodes of a
+singly linked list work with this list as well.
+
+"""
+import unittest
+
+from .linked_list import LinkedList
+
+
+class DListNode:
+    """
+    Node of a doubly linked list.
+
+    Setting the next pointer of a node also sets the previous pointer of the new next node.
+
+    Args:
+        value: Value of the node. It can be any object.
+        next_node (DListNode): Pointer to the next node in the list or None.
+
+    Attributes:
+        value: Value of the node. It can be any object.
+        prev (DListNode): Pointer to the previous node in the list or None.
+
+    """
+    __slots__ = ('value', 'prev', '_next')
+
+    def __init__(self, value, next_node=None):
+        self.value = value
+        self.prev = None
+        self.next = next_node
+
+    @property
+    def next(self):
+        """
+        Pointer to the next node in the list or None.
+        """
+        return self._next
+
+    @next.setter
+    def next(self, node):
+        self._next = node
+        if node is not None:
+            node.prev = self
+
+
+class DoublyLinkedList(LinkedList):
+    """
+    Doubly linked list.
+
+    Has the same interface as LinkedList. Access by index walks from the nearer end of the list,
+    and any node can be removed in O(1) time.
+
+    Args:
+        iterable: Optional iterable of arbitrary objects used to populate the list.
+
+    """
+
+    @property
+    def _head(self):
+        return self._first
+
+    @_head.setter
+    def _head(self, node):
+        if node is not None:
+            node.prev = None
+        self._first = node
+
+    def _new_node(self, value, next_node=None):
+        return DListNode(value, next_node)
+
+    def __reversed__(self):
+        node = self._last()
+        while node:
+            yield node.value
+            node = node.prev
+
+    def _node_at(self, key):
+        """
+        Get node by index without handing it out.
+
+        Nodes in the second half of a list without the skip-pointer index are found walking back
+        from the tail.
+
+        Complexity: O(min(K, N - K)) time for index K, O(step) time if the list is indexed.
+
+        """
+        if isinstance(key, int) and not self._indexed and key >= 0 and self._head:
+            length = len(self)
+            if key >= length:
+                raise IndexError('linked list index out of range')
+            if key >= length // 2:
+                node = self._tail
+                for i in range(length - 1 - key):
+                    node = node.prev
+                return node
+        return super()._node_at(key)
+
+    def remove(self, node):
+        """
+        Remove a node from the list in O(1) time.
+
+        Args:
+            node (DListNode): Node of this list.
+
+        """
+        self.remove_after(node.prev)
+
+    def pop(self):
+        """
+        Remove the last node from the list in O(1) time.
+
+        Returns:
+            Value of the removed node.
+
+        Raises:
+            IndexError: If the list is empty.
+
+        """
+        node = self._last()
+        if node is None:
+            raise IndexError('pop from empty list')
+        self.remove(node)
+        return node.value
+
+
+class TestDoublyLinkedList(unittest.TestCase):
+
+    def assert_links(self, lst):
+        nodes = list(lst.iter_nodes())
+        prev_node = None
+        for node in nodes:
+            self.assertIs(node.prev, prev_node)
+            prev_node = node
+        self.assertIs(lst.tail, prev_node)
+        self.assertEqual(len(lst), len(nodes))
+
+    def test_init(self):
+        self.assertEqual(DoublyLinkedList(), LinkedList())
+        lst = DoublyLinkedList('abc')
+        self.assertEqual(lst, LinkedList('abc'))
+        self.assertEqual(repr(lst), "DoublyLinkedList(['a', 'b', 'c'])")
+        self.assert_links(lst)
+
+    def test_append(self):
+        lst = DoublyLinkedList()
+        lst.append(2)
+        lst.appendleft(1)
+        lst.extend([3, 4])
+        lst.appendleft(0)
+        self.assertEqual(lst, LinkedList(range(5)))
+        self.assert_links(lst)
+        self.assertEqual(list(reversed(lst)), [4, 3, 2, 1, 0])
+
+    def test_getitem(self):
+        for length in range(8):
+            lst = DoublyLinkedList(range(length))
+            for i in range(length):
+                self.assertEqual(lst[i].value, i)
+            self.assertRaises(IndexError, lst.__getitem__, length)
+            self.assertRaises(IndexError, lst.__getitem__, -1)
+            self.assertEqual(lst[1:6:2], LinkedList(range(1, min(length, 6), 2)))
+            self.assertIs(type(lst[1:6:2]), DoublyLinkedList)
+            lst.build_index(2)
+            for i in range(length):
+                self.assertEqual(lst[i].value, i)
+
+    def test_relink(self):
+        lst = DoublyLinkedList('abcde')
+        lst[1].next = lst[3]
+        self.assertEqual(lst, LinkedList('abde'))
+        self.assert_links(lst)
+
+        lst.head = lst[1]
+        self.assertEqual(lst, LinkedList('bde'))
+        self.assert_links(lst)
+
+    def test_remove_and_pop(self):
+        lst = DoublyLinkedList('abcde')
+        lst.remove(lst[2])
+        lst.remove(lst.head)
+        self.assertEqual(lst, LinkedList('bde'))
+        self.assert_links(lst)
+        self.assertEqual(lst.pop(), 'e')
+        self.assertEqual(lst.pop(), 'd')
+        self.assert_links(lst)
+        lst.remove(lst.tail)
+        self.assertEqual(lst, LinkedList())
+        self.assertRaises(IndexError, lst.pop)
+
+    def test_pop_many(self):
+        lst = DoublyLinkedList(range(1000))
+        self.assertEqual(lst.head.value, 0)
+        self.assertEqual(len(lst), 1000)
+        walks = []
+        recount = lst._recount
+        lst._recount = lambda: walks.append(None) or recount()
+        for i in reversed(range(500, 1000)):
+            self.assertEqual(lst.pop(), i)
+            self.assertEqual(len(lst), i)
+        for i in reversed(range(250, 500)):
+            lst.remove(lst.tail)
+            self.assertEqual(lst.tail.value, i - 1)
+        self.assertEqual(walks, [])
+        self.assertEqual(lst, LinkedList(range(250)))
+        self.assert_links(lst)
@@ -1,8 +1,16 @@
 """
 Simple implementation of linked list data structure for use in exercises from chapter 2.
 """
+from array import array
+from itertools import islice, zip_longest
+from math import isqrt
 import unittest
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class ListNode:
     """
@@ -24,10 +32,55 @@ class ListNode:
         self.next = next_node
 
 
+def flat_memoryview(buffer):
+    """
+    Get a one-dimensional memoryview of an object supporting the buffer protocol.
+
+    Multidimensional buffers are flattened in C order without copying.
+
+    Args:
+        buffer: Bytes, bytearray, array, NumPy array or any other buffer-protocol object.
+
+    Returns:
+        memoryview: One-dimensional view of the buffer with a native format.
+
+    Raises:
+        ValueError: If the buffer format is not native or a multidimensional buffer is not
+            C-contiguous.
+
+    """
+    view = memoryview(buffer)
+    item_format = view.format.lstrip('@')
+    if not item_format.isalpha() or len(item_format) != 1:
+        raise ValueError('unsupported buffer format: {!r}'.format(view.format))
+    if view.ndim == 1 and item_format == view.format:
+        return view
+    if not view.c_contiguous:
+        raise ValueError('multidimensional buffer must be C-contiguous')
+    return view.cast('B').cast(item_format)
+
+
 class LinkedList:
     """
     Singly linked list.
 
+    The list caches its length and its last node, so len(), append() and the tail lookup take O(1)
+    time. The cache is maintained by the methods of the list, and before using it the list checks
+    for nodes relinked directly:
+
+    - The cached tail must still be the last node.
+    - A node handed out by indexing must still point to the node it pointed to when it was handed
+      out. It is checked once, on the next access to the list.
+    - head and iter_nodes() hand out the whole chain of nodes, so on the next access after them the
+      list walks itself once to find its length and tail.
+
+    After relinking a node kept from before such a check, call invalidate().
+
+    Random access by index walks the list from the head. An optional index built with
+    build_index() keeps checkpoints to every step-th node, which reduces the walk to at most step
+    nodes. The index is updated by append() and extend() and rebuilt lazily after other
+    modifications, including relinking detected by the checks above.
+
     Args:
         iterable: Optional iterable of arbitrary objects used to populate the list.
 
@@ -37,27 +90,440 @@ class LinkedList:
     """
 
     def __init__(self, iterable=None):
-        self.head = None
-        if iterable:
-            value_iter = iter(iterable)
-            try:
-                self.head = ListNode(next(value_iter))
-                node = self.head
-                while True:
-                    node.next = ListNode(next(value_iter))
-                    node = node.next
-            except StopIteration:
-                pass
+        self._head = None
+        self._tail = None
+        self._size = 0
+        self._exposed = False
+        self._handed_out = []
+        self._indexed = False
+        self._index_step = None
+        self._checkpoints = None
+        self._checkpoint_step = None
+        if iterable is not None:
+            self.extend(iterable)
+
+    @property
+    def head(self):
+        """
+        First node of the list. None for empty list.
+        """
+        self._expose()
+        return self._head
 
-    def __repr__(self):
-        if not self.head:
-            return 'LinkedList()'
-        node = self.head
-        repr_nodes = []
+    @head.setter
+    def head(self, node):
+        self._head = node
+        self.invalidate()
+
+    @property
+    def tail(self):
+        """
+        Last node of the list. None for empty list.
+
+        Raises:
+            ValueError: If the list has a loop.
+
+        """
+        return self._last()
+
+    def invalidate(self):
+        """
+        Forget the cached length and tail of the list.
+
+        Needed after relinking nodes which the list cannot check, see the class description. The
+        cache is recalculated in O(N) time on the next access.
+
+        """
+        self._size = None
+        self._tail = None
+        self._checkpoints = None
+
+    def _expose(self, node=None):
+        """
+        Note that nodes of the list have been handed out and may be relinked.
+
+        Subclasses whose nodes report relinking to the list override this method.
+
+        Args:
+            node (ListNode): Node handed out alone, checked for relinking on the next access. By
+                default the whole chain of nodes is considered handed out, and the list walks
+                itself on the next access.
+
+        """
+        if node is None:
+            self._exposed = True
+        else:
+            self._handed_out.append((node, node.next))
+
+    def _check_handed_out(self):
+        """
+        Check whether the nodes handed out alone since the last check have been relinked.
+        """
+        handed_out = self._handed_out
+        if handed_out:
+            for node, next_node in handed_out:
+                if node.next is not next_node:
+                    self._exposed = True
+                    break
+            handed_out.clear()
+
+    def _validate(self):
+        """
+        Make sure that the cached length and tail are up to date, walking the list if needed.
+
+        Raises:
+            ValueError: If the list has a loop.
+
+        """
+        self._check_handed_out()
+        tail = self._tail
+        if self._size is None or self._exposed or tail is not None and tail.next is not None:
+            self._checkpoints = None
+            self._recount()
+            self._exposed = False
+
+    def _last(self):
+        """
+        Get the last node of the list.
+        """
+        self._validate()
+        return self._tail
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """
+        Create a list from an object supporting the buffer protocol.
+
+        The values are unpacked by the buffer in C and linked in a single tight loop. Subclasses
+        with array storage may avoid copying the buffer at all.
+
+        Args:
+            buffer: Bytes, bytearray, array, NumPy array or any other buffer-protocol object.
+
+        Returns:
+            LinkedList
+
+        """
+        lst = cls()
+        values = flat_memoryview(buffer).tolist()
+        if values:
+            new_node = lst._new_node
+            head = tail = new_node(values.pop())
+            for value in reversed(values):
+                head = new_node(value, head)
+            lst._head = head
+            lst._tail = tail
+            lst._size = len(values) + 1
+        return lst
+
+    @classmethod
+    def from_numpy(cls, ndarray):
+        """
+        Create a list from a NumPy array.
+
+        A C-contiguous array is passed to from_buffer() as is, other arrays are copied first.
+
+        Args:
+            ndarray (numpy.ndarray): Array of numbers.
+
+        Returns:
+            LinkedList
+
+        """
+        if not ndarray.flags['C_CONTIGUOUS'] or not ndarray.dtype.isnative:
+            ndarray = numpy.ascontiguousarray(ndarray, dtype=ndarray.dtype.newbyteorder('='))
+        return cls.from_buffer(ndarray)
+
+    def to_numpy(self, dtype=None):
+        """
+        Export list values to a NumPy array.
+
+        Args:
+            dtype: NumPy data type of the array. Inferred from the values by default.
+
+        Returns:
+            numpy.ndarray
+
+        Raises:
+            ImportError: If NumPy is not installed.
+
+        """
+        if numpy is None:
+            raise ImportError('to_numpy() requires NumPy')
+        if dtype is None:
+            return numpy.array(list(self))
+        return numpy.fromiter(self, dtype=dtype, count=len(self))
+
+    def build_index(self, step=None):
+        """
+        Build skip-pointer index which speeds up access by index.
+
+        Complexity: O(N) time, O(N / step) space. With the default step indexing takes O(sqrt(N))
+        time.
+
+        Args:
+            step (int): Distance between checkpoints. Square root of the list length by default.
+
+        """
+        if step is not None and step < 1:
+            raise ValueError('index step must be positive')
+        self._indexed = True
+        self._index_step = step
+        self._checkpoints = None
+        self._rebuild_index()
+
+    def drop_index(self):
+        """
+        Remove the skip-pointer index.
+        """
+        self._indexed = False
+        self._index_step = None
+        self._checkpoints = None
+
+    def _rebuild_index(self):
+        length = len(self)
+        step = self._index_step or max(1, isqrt(length))
+        checkpoints = []
+        node = self._head
+        position = 0
         while node:
-            repr_nodes.append(repr(node.value))
+            if position % step == 0:
+                checkpoints.append(node)
             node = node.next
-        return 'LinkedList([{}])'.format(', '.join(repr_nodes))
+            position += 1
+        self._checkpoints = checkpoints
+        self._checkpoint_step = step
+
+    def append(self, value):
+        """
+        Add a value to the end of the list in O(1) time.
+        """
+        node = self._new_node(value)
+        tail = self._last()
+        if tail is None:
+            self._head = node
+        else:
+            self._link(tail, node)
+        if self._checkpoints is not None and self._size % self._checkpoint_step == 0:
+            self._checkpoints.append(node)
+        self._tail = node
+        self._size += 1
+
+    def appendleft(self, value):
+        """
+        Add a value to the beginning of the list in O(1) time.
+        """
+        self._head = self._new_node(value, self._head)
+        self._checkpoints = None
+        if self._size is not None:
+            self._size += 1
+            if self._tail is None:
+                self._tail = self._head
+
+    def extend(self, iterable):
+        """
+        Add values from an iterable to the end of the list.
+
+        Complexity: O(K) time, where K is the number of added values.
+
+        """
+        if iterable is self:
+            iterable = list(iterable)
+        new_node = self._new_node
+        link = self._link
+        tail = self._last()
+        size = self._size
+        checkpoints = self._checkpoints
+        for value in iterable:
+            node = new_node(value)
+            if tail is None:
+                self._head = node
+            else:
+                link(tail, node)
+            if checkpoints is not None and size % self._checkpoint_step == 0:
+                checkpoints.append(node)
+            tail = node
+            size += 1
+        self._tail = tail
+        self._size = size
+
+    def remove_after(self, node):
+        """
+        Unlink the node which follows the given node in O(1) time.
+
+        The cached length and tail are kept up to date. The next pointer of the removed node is
+        left as it is, so iteration over the list may continue past it. The removed node is no
+        longer a part of the list, so it is not considered handed out.
+
+        Args:
+            node (ListNode): Predecessor of the node to remove, None to remove the head.
+
+        Returns:
+            ListNode: Removed node.
+
+        Raises:
+            IndexError: If there is no node to remove.
+
+        """
+        self._check_handed_out()
+        removed = self._head if node is None else node.next
+        if removed is None:
+            raise IndexError('no node to remove')
+        if node is None:
+            self._head = removed.next
+        else:
+            self._link(node, removed.next)
+        self._checkpoints = None
+        if self._size is not None:
+            self._size -= 1
+            if removed is self._tail:
+                self._tail = node
+        return removed
+
+    def _new_node(self, value, next_node=None):
+        """
+        Create a node for this list.
+
+        Subclasses that store their nodes differently override this method.
+
+        """
+        return ListNode(value, next_node)
+
+    def _link(self, node, next_node):
+        """
+        Set the next pointer of a node on behalf of the list, which updates its cache itself.
+        """
+        node.next = next_node
+
+    def _new_list(self):
+        """
+        Create an empty list of the same kind.
+        """
+        return type(self)()
+
+    def _recount(self):
+        """
+        Walk the list to find its length and tail.
+
+        A node remembered each time the length reaches a power of two, as in Brent's algorithm,
+        is met again if the list has a loop, so the walk takes O(N) time either way.
+
+        Raises:
+            ValueError: If the list has a loop.
+
+        """
+        size = 0
+        tail = None
+        node = self._head
+        checkpoint = None
+        power = 1
+        while node:
+            if node is checkpoint:
+                raise ValueError('linked list has a loop')
+            size += 1
+            if size == power:
+                checkpoint = node
+                power *= 2
+            tail = node
+            node = node.next
+        self._size = size
+        self._tail = tail
+
+    def __len__(self):
+        """
+        Get the length of the list.
+
+        Raises:
+            ValueError: If the list has a loop.
+
+        """
+        self._validate()
+        return self._size
+
+    def __iter__(self):
+        node = self._head
+        while node:
+            yield node.value
+            node = node.next
+
+    def iter_nodes(self):
+        """
+        Iterate over the nodes of the list.
+
+        The next node is looked up only after the current one has been processed, so the consumer
+        may relink or remove the nodes which follow the current node.
+
+        Yields:
+            ListNode
+
+        """
+        node = self._head
+        while node:
+            self._expose()
+            yield node
+            node = node.next
+
+    def map(self, func):
+        """
+        Lazily apply a function to every value of the list.
+
+        Yields:
+            Results of func(value) in list order.
+
+        """
+        for value in self:
+            yield func(value)
+
+    def filter(self, predicate):
+        """
+        Lazily select the values for which predicate(value) is true.
+
+        Yields:
+            Values of the list in their order.
+
+        """
+        for value in self:
+            if predicate(value):
+                yield value
+
+    def take(self, count):
+        """
+        Lazily iterate over the first count values of the list.
+
+        Yields:
+            Values of the list in their order.
+
+        """
+        return islice(self, count)
+
+    def chunked(self, size):
+        """
+        Lazily split the values of the list into chunks.
+
+        Only one chunk is kept in memory at a time.
+
+        Args:
+            size (int): Number of values in a chunk. The last chunk may be shorter.
+
+        Yields:
+            tuple: Values of the next chunk.
+
+        Raises:
+            ValueError: If size is not positive.
+
+        """
+        if size < 1:
+            raise ValueError('chunk size must be positive')
+        values = iter(self)
+        chunk = tuple(islice(values, size))
+        while chunk:
+            yield chunk
+            chunk = tuple(islice(values, size))
+
+    def __repr__(self):
+        if not self._head:
+            return '{}()'.format(type(self).__name__)
+        return '{}([{}])'.format(type(self).__name__, ', '.join(self.map(repr)))
 
     def __eq__(self, other):
         """
@@ -67,45 +533,89 @@ class LinkedList:
         corresponding nodes are equal.
 
         """
-        node1 = self.head
-        node2 = other.head
-        while node1 and node2:
-            if node1.value != node2.value:
+        if not isinstance(other, LinkedList):
+            return NotImplemented
+        missing = object()
+        for value1, value2 in zip_longest(self, other, fillvalue=missing):
+            if value1 is missing or value2 is missing or value1 != value2:
                 return False
-            node1 = node1.next
-            node2 = node2.next
-        if (node1 is None) and (node2 is None):
-            return True
-        return False
+        return True
 
     def __getitem__(self, key):
         """
-        Get node by index.
+        Get node by index or a copy of a slice of the list.
+
+        Complexity: O(K) time for index K, O(step) time if the list is indexed.
 
         Returns:
-            ListNode
+            ListNode or LinkedList: Node for an integer key, new list for a slice.
 
         Raises:
-            TypeError: If key is not an integer.
+            TypeError: If key is neither an integer nor a slice.
             IndexError: If index is out of range or negative.
 
+        """
+        if isinstance(key, slice):
+            return self._get_slice(key)
+        node = self._node_at(key)
+        self._expose(node)
+        return node
+
+    def _node_at(self, key):
+        """
+        Get node by index without handing it out.
         """
         if not isinstance(key, int):
             raise TypeError('linked list indices must be integers')
 
-        if not self.head or key < 0:
+        self._check_handed_out()
+        if not self._head or key < 0:
             raise IndexError('linked list index out of range')
 
         i = 0
-        node = self.head
-        while i < key:
-            if not node.next:
+        node = self._head
+        if self._indexed:
+            if key >= len(self):
                 raise IndexError('linked list index out of range')
-            node = node.next
-            i += 1
+            if self._checkpoints is None:
+                self._rebuild_index()
+            node = self._checkpoints[key // self._checkpoint_step]
+            i = key - key % self._checkpoint_step
+
+        node = self._walk(node, key - i)
+        if node is None:
+            raise IndexError('linked list index out of range')
+        return node
 
+    def _walk(self, node, steps):
+        """
+        Get the node which is the given number of steps after a node, None if the list ends earlier.
+        """
+        for i in range(steps):
+            node = node.next
+            if node is None:
+                break
         return node
 
+    def _get_slice(self, key):
+        result = self._new_list()
+        positions = range(*key.indices(len(self)))
+        if not positions:
+            return result
+        if positions.step < 0:
+            positions = positions[::-1]
+
+        node = self._node_at(positions.start)
+        values = [node.value]
+        for i in range(len(positions) - 1):
+            node = self._walk(node, positions.step)
+            values.append(node.value)
+
+        if key.step is not None and key.step < 0:
+            values.reverse()
+        result.extend(values)
+        return result
+
 
 class TestListNode(unittest.TestCase):
     """
@@ -201,8 +711,7 @@ class TestLinkedList(unittest.TestCase):
             node = lst['1']
         self.assertEqual(str(cm.exception), 'linked list indices must be integers')
 
-        with self.assertRaises(TypeError) as cm:
-            node = lst[2:5]
+        self.assertEqual(lst[2:5], LinkedList())
 
         with self.assertRaises(IndexError) as cm:
             node = lst[0]
@@ -219,3 +728,282 @@ class TestLinkedList(unittest.TestCase):
         self.assertEqual(lst[0].value, 'a')
         self.assertEqual(lst[2].value, 'c')
         self.assertEqual(lst[4].value, 'e')
+
+    def test_len_and_tail(self):
+        lst = LinkedList()
+        self.assertEqual(len(lst), 0)
+        self.assertIsNone(lst.tail)
+
+        lst = LinkedList('abc')
+        self.assertEqual(len(lst), 3)
+        self.assertIs(lst.tail, lst[2])
+
+    def test_append(self):
+        lst = LinkedList()
+        for i in range(5):
+            lst.append(i)
+            self.assertEqual(len(lst), i + 1)
+            self.assertEqual(lst.tail.value, i)
+        self.assertEqual(lst, LinkedList(range(5)))
+
+    def test_appendleft(self):
+        lst = LinkedList()
+        for i in range(5):
+            lst.appendleft(i)
+            self.assertEqual(len(lst), i + 1)
+            self.assertEqual(lst.tail.value, 0)
+        self.assertEqual(lst, LinkedList([4, 3, 2, 1, 0]))
+
+    def test_extend(self):
+        lst = LinkedList()
+        lst.extend([])
+        self.assertEqual(lst, LinkedList())
+        lst.extend('ab')
+        lst.extend(iter('cd'))
+        self.assertEqual(lst, LinkedList('abcd'))
+        lst.extend(lst)
+        self.assertEqual(lst, LinkedList('abcdabcd'))
+        self.assertEqual(len(lst), 8)
+        self.assertEqual(lst.tail.value, 'd')
+
+    def test_remove_after(self):
+        lst = LinkedList('abcde')
+        lst.build_index(2)
+        self.assertEqual(lst.remove_after(None).value, 'a')
+        self.assertEqual(lst.remove_after(lst[0]).value, 'c')
+        self.assertEqual(lst, LinkedList('bde'))
+        self.assertEqual(lst[2].value, 'e')
+        self.assertEqual(lst.remove_after(lst[1]).value, 'e')
+        self.assertEqual(len(lst), 2)
+        self.assertEqual(lst.tail.value, 'd')
+        self.assertRaises(IndexError, lst.remove_after, lst.tail)
+        lst.remove_after(None)
+        lst.remove_after(None)
+        self.assertEqual(len(lst), 0)
+        self.assertIsNone(lst.tail)
+        self.assertRaises(IndexError, lst.remove_after, None)
+
+    def test_iter(self):
+        self.assertEqual(list(LinkedList()), [])
+        self.assertEqual(list(LinkedList([1, 'a', None])), [1, 'a', None])
+
+    def test_relink(self):
+        lst = LinkedList('abcde')
+        lst[1].next = lst[3]
+        self.assertEqual(len(lst), 4)
+        self.assertEqual(lst.tail.value, 'e')
+
+        lst.head = lst[2]
+        self.assertEqual(len(lst), 2)
+        lst.append('f')
+        self.assertEqual(lst, LinkedList('def'))
+
+        lst.head.next.next = None
+        lst.appendleft('c')
+        self.assertEqual(len(lst), 3)
+        self.assertEqual(lst.tail.value, 'e')
+
+        # Nodes kept from earlier calls may be relinked at any time.
+        lst = LinkedList('abc')
+        last = lst.tail
+        last.next = ListNode('d')
+        self.assertEqual(len(lst), 4)
+        self.assertEqual(lst.tail.value, 'd')
+        lst.append('e')
+        self.assertEqual(lst, LinkedList('abcde'))
+
+        lst = LinkedList('abc')
+        for node in lst.iter_nodes():
+            pass
+        lst.head.next = node
+        lst.append('d')
+        self.assertEqual(lst, LinkedList('acd'))
+        self.assertEqual(len(lst), 3)
+
+    def test_append_after_handing_out(self):
+        lst = LinkedList('abc')
+        lst.head.next.next.next = ListNode('d')
+        for value in 'efgh':
+            lst.append(value)
+        self.assertEqual(lst, LinkedList('abcdefgh'))
+        self.assertEqual(len(lst), 8)
+
+        # The list walks itself once after handing out the head, not on every append.
+        lst = LinkedList(range(100))
+        self.assertEqual(lst.head.value, 0)
+        walks = []
+        recount = lst._recount
+        lst._recount = lambda: walks.append(None) or recount()
+        for i in range(100, 200):
+            lst.append(i)
+            self.assertEqual(len(lst), i + 1)
+            self.assertEqual(lst.tail.value, i)
+        self.assertEqual(len(walks), 1)
+        self.assertEqual(lst, LinkedList(range(200)))
+
+    def test_invalidate(self):
+        lst = LinkedList('abc')
+        lst.invalidate()
+        self.assertEqual(len(lst), 3)
+        self.assertEqual(lst.tail.value, 'c')
+
+    def test_loop(self):
+        for length in range(1, 40):
+            for start in range(length):
+                lst = LinkedList(range(length))
+                lst[length - 1].next = lst[start]
+                with self.assertRaises(ValueError):
+                    len(lst)
+                with self.assertRaises(ValueError):
+                    lst.tail
+                with self.assertRaises(ValueError):
+                    lst.append(length)
+                with self.assertRaises(ValueError):
+                    lst.build_index()
+
+    def test_getitem_indexed(self):
+        for step in (None, 1, 3, 64):
+            lst = LinkedList()
+            lst.build_index(step)
+            with self.assertRaises(IndexError):
+                lst[0]
+
+            lst.extend(range(50))
+            for i in range(50):
+                self.assertEqual(lst[i].value, i)
+            with self.assertRaises(IndexError):
+                lst[50]
+            with self.assertRaises(IndexError):
+                lst[-1]
+
+            lst.append(50)
+            lst.appendleft(-1)
+            self.assertEqual(lst[0].value, -1)
+            self.assertEqual(lst[51].value, 50)
+
+            lst[9].next = lst[11]
+            self.assertEqual(lst[10].value, 10)
+            self.assertEqual(lst[11].value, 11)
+            self.assertEqual(len(lst), 51)
+
+        lst.drop_index()
+        self.assertEqual(lst[20].value, 20)
+        self.assertRaises(ValueError, lst.build_index, 0)
+
+    def test_getitem_indexed_repeated(self):
+        lst = LinkedList(range(10000))
+        lst.build_index()
+        self.assertEqual(lst.head.value, 0)
+        rebuilds = []
+        steps = []
+        rebuild_index = lst._rebuild_index
+        walk = lst._walk
+        lst._rebuild_index = lambda: rebuilds.append(None) or rebuild_index()
+        lst._walk = lambda node, count: steps.append(count) or walk(node, count)
+        for i in range(0, 10000, 7):
+            self.assertEqual(lst[i].value, i)
+        self.assertEqual(len(rebuilds), 1)
+        self.assertLess(max(steps), 100)
+
+        lst[6999].next = lst[7001]
+        self.assertEqual(lst[7000].value, 7001)
+        self.assertEqual(len(rebuilds), 2)
+        self.assertEqual(lst[9998].value, 9999)
+        self.assertEqual(len(rebuilds), 2)
+
+    def test_getitem_indexed_relink(self):
+        lst = LinkedList('abcde')
+        lst.build_index(2)
+        node = lst[1]
+        node.value = node.next.value
+        node.next = node.next.next
+        self.assertEqual([lst[i].value for i in range(4)], ['a', 'c', 'd', 'e'])
+        with self.assertRaises(IndexError):
+            lst[4]
+
+        lst = LinkedList(range(10))
+        lst.build_index(3)
+        self.assertEqual(lst[2:9:3], LinkedList([2, 5, 8]))
+        for node in lst.iter_nodes():
+            if node.value == 4:
+                node.next = None
+        self.assertEqual(lst[3].value, 3)
+        self.assertRaises(IndexError, lst.__getitem__, 6)
+        self.assertEqual(lst[2:9:3], LinkedList([2]))
+        lst.extend(range(5, 8))
+        self.assertEqual(lst[6].value, 6)
+        self.assertEqual(len(lst), 8)
+
+    def test_slice(self):
+        values = list(range(20))
+        lst = LinkedList(values)
+        lst2 = LinkedList(values)
+        lst2.build_index(4)
+        slices = [
+            slice(None), slice(3, 9), slice(5, 5), slice(9, 3), slice(-5, None), slice(None, -15),
+            slice(2, 17, 3), slice(None, None, -1), slice(15, 2, -4), slice(-1, -30, -7),
+            slice(100, 200)
+        ]
+        for key in slices:
+            with self.subTest(key=key):
+                self.assertEqual(lst[key], LinkedList(values[key]))
+                self.assertEqual(lst2[key], LinkedList(values[key]))
+        self.assertIsNot(lst[:].head, lst.head)
+        self.assertRaises(ValueError, lst.__getitem__, slice(None, None, 0))
+
+    def test_iter_nodes(self):
+        lst = LinkedList('aabcc')
+        self.assertEqual([node.value for node in lst.iter_nodes()], list('aabcc'))
+        self.assertIs(next(lst.iter_nodes()), lst.head)
+
+        for node in lst.iter_nodes():
+            while node.next and node.next.value == node.value:
+                node.next = node.next.next
+        self.assertEqual(lst, LinkedList('abc'))
+
+    def test_combinators(self):
+        lst = LinkedList(range(10))
+        self.assertEqual(list(lst.map(str)), list('0123456789'))
+        self.assertEqual(list(lst.filter(lambda x: x % 3 == 0)), [0, 3, 6, 9])
+        self.assertEqual(list(lst.take(3)), [0, 1, 2])
+        self.assertEqual(list(lst.take(20)), list(range(10)))
+        self.assertEqual(list(lst.chunked(4)), [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9)])
+        self.assertEqual(list(lst.chunked(5)), [(0, 1, 2, 3, 4), (5, 6, 7, 8, 9)])
+        self.assertEqual(list(LinkedList().chunked(2)), [])
+        self.assertRaises(ValueError, next, lst.chunked(0))
+
+        squares = LinkedList(lst.map(lambda x: x * x))
+        self.assertEqual(squares, LinkedList([0, 1, 4, 9, 16, 25, 36, 49, 64, 81]))
+
+    def test_from_buffer(self):
+        import ctypes
+
+        self.assertEqual(LinkedList.from_buffer(b''), LinkedList())
+        self.assertEqual(LinkedList.from_buffer(b'\x01\x02\x03'), LinkedList([1, 2, 3]))
+        self.assertEqual(LinkedList.from_buffer(bytearray(b'ab')), LinkedList([97, 98]))
+        self.assertEqual(LinkedList.from_buffer(array('d', [0.5, 1.5])), LinkedList([0.5, 1.5]))
+
+        lst = LinkedList.from_buffer(array('q', range(10)))
+        self.assertEqual(lst, LinkedList(range(10)))
+        self.assertEqual(len(lst), 10)
+        self.assertEqual(lst.tail.value, 9)
+
+        matrix = memoryview(array('i', range(6))).cast('B').cast('i', shape=[2, 3])
+        self.assertEqual(LinkedList.from_buffer(matrix), LinkedList(range(6)))
+        self.assertEqual(LinkedList.from_buffer(memoryview(b'abcd')[::2]), LinkedList([97, 99]))
+        self.assertRaises(ValueError, LinkedList.from_buffer, (ctypes.c_int * 3)())
+        self.assertRaises(TypeError, LinkedList.from_buffer, [1, 2, 3])
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_numpy(self):
+        ndarray = numpy.arange(12, dtype=numpy.int64)
+        lst = LinkedList.from_numpy(ndarray)
+        self.assertEqual(lst, LinkedList(range(12)))
+        self.assertEqual(lst.head.value, 0)
+        self.assertEqual(LinkedList.from_numpy(ndarray.reshape(3, 4).T),
+                         LinkedList(ndarray.reshape(3, 4).T.ravel().tolist()))
+        self.assertEqual(LinkedList.from_numpy(ndarray.astype('>i8')), LinkedList(range(12)))
+
+        self.assertTrue(numpy.array_equal(lst.to_numpy(), ndarray))
+        self.assertEqual(lst.to_numpy(numpy.float64).dtype, numpy.float64)
+        self.assertEqual(len(LinkedList().to_numpy(numpy.int64)), 0)
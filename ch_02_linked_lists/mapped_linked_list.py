@@ -0,0 +1,272 @@
+"""
+Memory-mapped persistent format for the linked lists used in chapter 2.
+
+A saved list is a single file with a fixed-size header followed by the two columns of an
+ArrayLinkedList: next pointers as 64-bit integers and typed values. MappedLinkedList maps the file
+into memory and uses the columns in place, so opening a list takes the same time regardless of its
+length, and node objects are created only when somebody asks for them.
+
+File layout, the header is little-endian and the columns use the native byte order::
+
+    header   64 bytes: magic, byte order, typecode, slot count, head, tail, length
+             and the first free slot
+    links    slot count * 8 bytes
+    values   slot count * itemsize bytes
+
+"""
+from array import array
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+from .array_linked_list import ArrayLinkedList
+from .linked_list import LinkedList
+from .pr_02_kth_to_last import get_kth_to_last
+from .pr_08_loop_detection import brent_loop, detect_loop
+
+MAGIC = b'CTCILLST'
+HEADER = struct.Struct('<8scc6xqqqqq8x')
+BYTE_ORDER = b'<' if sys.byteorder == 'little' else b'>'
+
+
+def save_list(lst, path, typecode=None):
+    """
+    Save a linked list to a file which can be opened with MappedLinkedList.
+
+    Columns of an ArrayLinkedList with typed values are written as is, including the free-list, so
+    lists with loops can be saved too. Other lists are written in the order of their nodes.
+
+    Complexity: O(C) time, where C is the number of column slots or nodes.
+
+    Args:
+        lst (LinkedList): List to save.
+        path (str): Path of the file.
+        typecode (str): Array typecode for the values. Optional for ArrayLinkedList with typed
+            values, required otherwise.
+
+    Raises:
+        ValueError: If the typecode is not given for a list of Python objects, or if a list which
+            is written node by node has a loop.
+
+    """
+    if isinstance(lst, ArrayLinkedList) and lst.typecode and typecode in (None, lst.typecode):
+        typecode = lst.typecode
+        values = lst.values
+        links = lst.links
+        head = lst.head_index
+        free = lst._free_index
+        length = -1 if lst._size is None else lst._size
+        tail = lst._tail.index if length > 0 else -1
+    else:
+        if typecode is None:
+            raise ValueError('typecode is required to save a list of Python objects')
+        if brent_loop(lst) is not None:
+            raise ValueError('linked list has a loop')
+        values = array(typecode, lst)
+        links = array('q', range(1, len(values) + 1))
+        if values:
+            links[-1] = -1
+        head = 0 if values else -1
+        free = -1
+        length = len(values)
+        tail = length - 1
+
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, BYTE_ORDER, typecode.encode(), len(links), head, tail, length,
+                               free))
+        file.write(links)
+        file.write(values)
+
+
+class MappedLinkedList(ArrayLinkedList):
+    """
+    ArrayLinkedList which uses the columns of a file created by save_list() in place.
+
+    Values and links are memoryviews of the mapped file. Changes of values and links made through
+    a writable list are written to the file, the head, the free-list and the cached length are
+    written by flush() and close(). The list cannot grow beyond the slots stored in the file, but
+    slots returned to the free-list are reused. Slices and other derived lists are ordinary
+    ArrayLinkedLists.
+
+    The list can be used as a context manager which closes it.
+
+    Args:
+        path (str): Path of the file.
+        writable (bool): Map the file for reading and writing instead of reading only.
+
+    Raises:
+        ValueError: If the file is not a saved linked list or was saved on a machine with a
+            different byte order.
+
+    """
+
+    def __init__(self, path, writable=False):
+        super().__init__()
+        self.writable = writable
+        self._mapped = False
+        self._file = open(path, 'r+b' if writable else 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0,
+                                   access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+        try:
+            self._map_columns()
+        except BaseException:
+            self.close()
+            raise
+
+    def _map_columns(self):
+        if len(self._mmap) < HEADER.size:
+            raise ValueError('file is too short to be a saved linked list')
+        header = HEADER.unpack_from(self._mmap)
+        magic, byte_order, typecode, count, head, tail, length, free = header
+        if magic != MAGIC:
+            raise ValueError('file is not a saved linked list')
+        if byte_order != BYTE_ORDER:
+            raise ValueError('file was saved with a different byte order')
+
+        typecode = typecode.decode()
+        links_end = HEADER.size + 8 * count
+        if len(self._mmap) != links_end + count * array(typecode).itemsize:
+            raise ValueError('file size does not match the header')
+
+        self._view = memoryview(self._mmap)
+        self.links = self._view[HEADER.size:links_end].cast('q')
+        self.values = self._view[links_end:].cast(typecode)
+
+        self.head_index = head
+        self._free_index = free
+        if length < 0:
+            self.invalidate()
+        else:
+            self._size = length
+            self._tail = self.node(tail) if length else None
+        self._mapped = True
+
+    def flush(self):
+        """
+        Write the head, the free-list and the cached length to the file and flush the mapping.
+        """
+        if not self.writable:
+            return
+        if self._size is None:
+            length = tail = -1
+        else:
+            length = self._size
+            tail = self._tail.index if length else -1
+        HEADER.pack_into(self._mmap, 0, MAGIC, BYTE_ORDER, self.typecode.encode(), len(self.links),
+                         self.head_index, tail, length, self._free_index)
+        self._mmap.flush()
+
+    def close(self):
+        """
+        Flush a writable list and unmap the file. The list must not be used after the call.
+        """
+        if self._mmap.closed:
+            return
+        try:
+            if self._mapped:
+                self.flush()
+        finally:
+            self._mapped = False
+            for view in (self.values, self.links, getattr(self, '_view', None)):
+                if isinstance(view, memoryview):
+                    view.release()
+            self._nodes.clear()
+            self._mmap.close()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _make_growable(self):
+        raise ValueError('mapped linked list cannot grow')
+
+    def _new_list(self):
+        return ArrayLinkedList(typecode=self.typecode)
+
+
+class TestMappedLinkedList(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'list.bin')
+
+    def test_save_and_open(self):
+        for data in ([], [7], list(range(100))):
+            for lst in (LinkedList(data), ArrayLinkedList(data), ArrayLinkedList(data, 'q')):
+                save_list(lst, self.path, 'q')
+                with MappedLinkedList(self.path) as mapped:
+                    self.assertEqual(mapped, LinkedList(data))
+                    self.assertEqual(len(mapped), len(data))
+                    self.assertEqual(mapped.typecode, 'q')
+                    if data:
+                        self.assertEqual(mapped.tail.value, data[-1])
+                        self.assertEqual(mapped[len(data) // 2].value, data[len(data) // 2])
+                        self.assertEqual(get_kth_to_last(mapped, 1).value, data[-1])
+                        self.assertIsNone(detect_loop(mapped))
+                    else:
+                        self.assertIsNone(mapped.head)
+
+        self.assertRaises(ValueError, save_list, LinkedList([1]), self.path)
+
+        for lst in (LinkedList(range(10)), ArrayLinkedList(range(10))):
+            lst[9].next = lst[4]
+            with self.assertRaises(ValueError):
+                save_list(lst, self.path, 'q')
+
+    def test_slice_and_index(self):
+        save_list(LinkedList(range(20)), self.path, 'i')
+        with MappedLinkedList(self.path) as mapped:
+            mapped.build_index(4)
+            self.assertEqual(mapped[13].value, 13)
+            part = mapped[5:8]
+            self.assertIs(type(part), ArrayLinkedList)
+            self.assertEqual(part, LinkedList([5, 6, 7]))
+            part.append(8)
+            self.assertRaises(ValueError, mapped.append, 20)
+
+    def test_read_only(self):
+        save_list(LinkedList([1, 2, 3]), self.path, 'b')
+        with MappedLinkedList(self.path) as mapped:
+            with self.assertRaises(TypeError):
+                mapped.head.value = 5
+
+    def test_writable(self):
+        lst = ArrayLinkedList(range(10), 'q')
+        lst.node(2).next = lst.node(5)
+        lst.release(lst.node(3))
+        lst.release(lst.node(4))
+        save_list(lst, self.path)
+
+        with MappedLinkedList(self.path, writable=True) as mapped:
+            self.assertEqual(list(mapped), [0, 1, 2, 5, 6, 7, 8, 9])
+            mapped.head.value = 10
+            mapped.appendleft(-1)
+            mapped.appendleft(-2)
+            self.assertRaises(ValueError, mapped.appendleft, -3)
+            mapped.tail.next = mapped[2]
+            self.assertEqual(brent_loop(mapped).start.value, 10)
+
+        with MappedLinkedList(self.path) as mapped:
+            self.assertIsNone(mapped._size)
+            self.assertEqual(brent_loop(mapped).lam, 8)
+            self.assertEqual(mapped.head.value, -2)
+
+    def test_invalid_file(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'x' * HEADER.size)
+        self.assertRaises(ValueError, MappedLinkedList, self.path)
+        save_list(LinkedList(range(5)), self.path, 'q')
+        with open(self.path, 'r+b') as file:
+            file.truncate(HEADER.size + 8 * 5 + 8)
+        self.assertRaises(ValueError, MappedLinkedList, self.path)
@@ -5,8 +5,12 @@ Problem statement: Write code to remove duplicates from an unsorted linked list.
 FOLLOW UP: How would you solve this problem if a temporary buffer is not allowed?
 
 """
+from math import ceil, log
+import pickle
+from tempfile import TemporaryFile
 import unittest
 
+from .array_linked_list import ArrayLinkedList
 from .linked_list import LinkedList
 
 
@@ -20,19 +24,11 @@ def remove_dups1(lst):
         lst (LinkedList): Linked list containing any hashable objects.
 
     """
-    node = lst.head
-    if not node:
-        return
-
     values = set()
-    values.add(node.value)
-
-    while node.next:
-        if node.next.value in values:
+    for node in lst.iter_nodes():
+        values.add(node.value)
+        while node.next and node.next.value in values:
             node.next = node.next.next
-        else:
-            node = node.next
-            values.add(node.value)
 
 
 def remove_dups2(lst):
@@ -56,6 +52,228 @@ def remove_dups2(lst):
         current = current.next
 
 
+def remove_dups_sort(lst):
+    """
+    Remove duplicates from a linked list by sorting a copy of its values.
+
+    Values are copied into an array and positions are sorted by value with a stable sort, so in
+    every group of equal values the first occurrence comes first. The other occurrences are then
+    unlinked in a single pass over the list.
+
+    Takes O(N log N) time and O(N) additional space, but needs no hash table, which makes it
+    cheaper in memory than remove_dups1() for big lists.
+
+    Args:
+        lst (LinkedList): Linked list containing mutually comparable objects.
+
+    """
+    values = list(lst)
+    keep = bytearray(len(values))
+    previous = None
+    for position in sorted(range(len(values)), key=values.__getitem__):
+        value = values[position]
+        if previous is None or value != values[previous]:
+            keep[position] = 1
+        previous = position
+    del values
+    _remove_marked(lst, keep.__getitem__)
+
+
+class BloomFilter:
+    """
+    Bloom filter, a compact probabilistic set.
+
+    Membership test may return false positives with the given probability but never returns false
+    negatives.
+
+    Args:
+        capacity (int): Expected number of values in the filter.
+        error_rate (float): Desired probability of a false positive.
+
+    Raises:
+        ValueError: If error_rate is not between 0 and 1.
+
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        if not 0 < error_rate < 1:
+            raise ValueError('error rate must be between 0 and 1')
+        self._size = max(8, ceil(-max(capacity, 1) * log(error_rate) / log(2) ** 2))
+        self._hashes = max(1, round(self._size / max(capacity, 1) * log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def _positions(self, value):
+        value_hash = hash((value,))
+        step = (value_hash >> 32) | 1
+        for i in range(self._hashes):
+            yield (value_hash + i * step) % self._size
+
+    def add(self, value):
+        """
+        Add a value to the filter.
+        """
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        for position in self._positions(value):
+            if not self._bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+def remove_dups_bloom(lst, error_rate=0.01):
+    """
+    Remove duplicates from a linked list using a Bloom filter with exact fallback.
+
+    The first pass puts all the values to a Bloom filter. Values which are already in the filter
+    are possible duplicates, they are collected into a set of candidates. The second pass removes
+    repeated occurrences of the candidates using an exact set which holds only the candidates.
+    When duplicates are rare the memory is dominated by the filter, which takes about 10 bits per
+    value for 1% error rate.
+
+    Takes O(N) time and O(N) bits plus O(D) additional space, where D is the number of duplicated
+    values and false positives.
+
+    Args:
+        lst (LinkedList): Linked list containing any hashable objects.
+        error_rate (float): Probability of a false positive in the Bloom filter.
+
+    Raises:
+        ValueError: If error_rate is not between 0 and 1.
+
+    """
+    bloom = BloomFilter(len(lst), error_rate)
+    candidates = set()
+    for value in lst:
+        if value in bloom:
+            candidates.add(value)
+        else:
+            bloom.add(value)
+    del bloom
+
+    if not candidates:
+        return
+
+    seen = set()
+    previous = None
+    for node in lst.iter_nodes():
+        value = node.value
+        if value in candidates:
+            if value in seen:
+                previous.next = node.next
+                continue
+            seen.add(value)
+        previous = node
+
+
+def remove_dups_external(lst, partitions=16, directory=None, batch_size=1024):
+    """
+    Remove duplicates from a linked list spilling the values to temporary files.
+
+    Values are tagged with their positions and distributed between temporary files by hash, so all
+    the occurrences of a value end up in the same file. Each file is then read separately and
+    positions of repeated occurrences are marked in a bit array. Finally the marked nodes are
+    unlinked in a single pass over the list.
+
+    Only one partition at a time is loaded into a hash set, so the memory is O(N / partitions)
+    plus N bits for the marks.
+
+    Takes O(N) time and O(N) disk space.
+
+    Args:
+        lst (LinkedList): Linked list containing hashable objects which can be pickled.
+        partitions (int): Number of temporary files.
+        directory (str): Directory for temporary files, system default if None.
+        batch_size (int): Number of values buffered in memory per file before writing.
+
+    Raises:
+        ValueError: If partitions or batch_size is not positive.
+
+    """
+    if partitions < 1:
+        raise ValueError('number of partitions must be positive')
+    if batch_size < 1:
+        raise ValueError('batch size must be positive')
+    duplicates = bytearray((len(lst) + 7) // 8)
+    files = [TemporaryFile(dir=directory) for i in range(partitions)]
+    try:
+        batches = [[] for i in range(partitions)]
+        for position, value in enumerate(lst):
+            partition = hash(value) % partitions
+            batch = batches[partition]
+            batch.append((position, value))
+            if len(batch) == batch_size:
+                pickle.dump(batch, files[partition], pickle.HIGHEST_PROTOCOL)
+                batch.clear()
+        for partition, batch in enumerate(batches):
+            if batch:
+                pickle.dump(batch, files[partition], pickle.HIGHEST_PROTOCOL)
+        del batches
+
+        for file in files:
+            file.seek(0)
+            seen = set()
+            while True:
+                try:
+                    batch = pickle.load(file)
+                except EOFError:
+                    break
+                for position, value in batch:
+                    if value in seen:
+                        duplicates[position >> 3] |= 1 << (position & 7)
+                    else:
+                        seen.add(value)
+            file.close()
+    finally:
+        for file in files:
+            file.close()
+
+    _remove_marked(lst, lambda position: not duplicates[position >> 3] & (1 << (position & 7)))
+
+
+def _remove_marked(lst, keep):
+    """
+    Unlink nodes for which keep(position) is false. The first node must be kept.
+    """
+    previous = None
+    for position, node in enumerate(lst.iter_nodes()):
+        if keep(position):
+            previous = node
+        else:
+            previous.next = node.next
+
+
+REMOVE_DUPS_METHODS = {
+    'buffer': remove_dups1,
+    'runner': remove_dups2,
+    'sort': remove_dups_sort,
+    'bloom': remove_dups_bloom,
+    'external': remove_dups_external,
+}
+
+
+def remove_dups(lst, method='buffer', **kwargs):
+    """
+    Remove duplicates from a linked list using one of the available methods.
+
+    Args:
+        lst (LinkedList): Linked list.
+        method (str): One of 'buffer' (remove_dups1), 'runner' (remove_dups2), 'sort', 'bloom'
+            and 'external'.
+        **kwargs: Options of the selected method.
+
+    Raises:
+        ValueError: If the method is unknown.
+
+    """
+    try:
+        function = REMOVE_DUPS_METHODS[method]
+    except KeyError:
+        raise ValueError('unknown method: {!r}'.format(method)) from None
+    function(lst, **kwargs)
+
+
 class TestRemoveDups(unittest.TestCase):
     data = [
         ([], []),
@@ -81,3 +299,68 @@ class TestRemoveDups(unittest.TestCase):
             lst = LinkedList(data[0])
             remove_dups2(lst)
             self.assertEqual(lst, LinkedList(data[1]))
+
+    def test_remove_dups1_array_linked_list(self):
+        for data in self.data:
+            lst = ArrayLinkedList(data[0])
+            remove_dups1(lst)
+            self.assertEqual(lst, LinkedList(data[1]))
+
+    def test_remove_dups_sort(self):
+        # The last sample contains values of different types which cannot be sorted.
+        for data in self.data[:-1]:
+            lst = LinkedList(data[0])
+            remove_dups_sort(lst)
+            self.assertEqual(lst, LinkedList(data[1]))
+        self.assertRaises(TypeError, remove_dups_sort, LinkedList(self.data[-1][0]))
+
+    def test_remove_dups_bloom(self):
+        for error_rate in (0.01, 0.9):
+            for data in self.data:
+                lst = LinkedList(data[0])
+                remove_dups_bloom(lst, error_rate)
+                self.assertEqual(lst, LinkedList(data[1]))
+
+        lst = LinkedList([1, 1])
+        for error_rate in (0, 1, 1.5, -0.1):
+            self.assertRaises(ValueError, remove_dups_bloom, lst, error_rate)
+        self.assertEqual(lst, LinkedList([1, 1]))
+
+    def test_remove_dups_external(self):
+        for partitions, batch_size in ((1, 1), (3, 2), (16, 1024)):
+            for data in self.data:
+                lst = LinkedList(data[0])
+                remove_dups_external(lst, partitions, batch_size=batch_size)
+                self.assertEqual(lst, LinkedList(data[1]))
+
+        lst = LinkedList([1, 1])
+        self.assertRaises(ValueError, remove_dups_external, lst, 0)
+        self.assertRaises(ValueError, remove_dups_external, lst, -1)
+        self.assertRaises(ValueError, remove_dups_external, lst, batch_size=0)
+        self.assertEqual(lst, LinkedList([1, 1]))
+
+    def test_remove_dups(self):
+        for method in REMOVE_DUPS_METHODS:
+            lst = ArrayLinkedList([3, 1, 3, 2, 1, 1, 4])
+            remove_dups(lst, method)
+            self.assertEqual(lst, LinkedList([3, 1, 2, 4]))
+            self.assertEqual(len(lst), 4)
+        lst = LinkedList([1, 1])
+        remove_dups(lst, 'bloom', error_rate=0.5)
+        self.assertEqual(lst, LinkedList([1]))
+        self.assertRaises(ValueError, remove_dups, lst, 'hash')
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(0, 2000, 2):
+            bloom.add(i)
+        for i in range(0, 2000, 2):
+            self.assertIn(i, bloom)
+        false_positives = sum(i in bloom for i in range(1, 20000, 2))
+        self.assertLess(false_positives, 500)
+
+        for error_rate in (0, 1, 2):
+            self.assertRaises(ValueError, BloomFilter, 10, error_rate)
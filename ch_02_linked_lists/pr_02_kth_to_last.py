@@ -6,17 +6,23 @@ Problem statement: Implement an algorithm to find the k-th to last element of a
 """
 import unittest
 
+from .doubly_linked_list import DoublyLinkedList
 from .linked_list import LinkedList
+from .xor_linked_list import XorLinkedList
 
 
 def get_kth_to_last(lst, k):
     """
     Find k-th to last node of a singly linked list.
 
+    A list which has not handed out its nodes knows its length, so the node is found in a single
+    walk of N - k nodes.
+    DoublyLinkedList and XorLinkedList walk only k - 1 nodes back from the tail if k <= N / 2.
+
     Complexity: O(N) time, O(1) space.
 
     Args:
-        lst (LinkedList): A singly linked list.
+        lst (LinkedList): A singly linked list, DoublyLinkedList or XorLinkedList.
         k (int): Node index starting from the end.
 
     Returns:
@@ -24,18 +30,10 @@ def get_kth_to_last(lst, k):
             means that k = 1 will return the last element.
 
     """
-    runner = lst.head
-    for i in range(k):
-        if not runner:
-            return None
-        runner = runner.next
-
-    result = lst.head
-    while runner:
-        runner = runner.next
-        result = result.next
-
-    return result
+    length = len(lst)
+    if k < 1 or k > length:
+        return None
+    return lst[length - k]
 
 
 class TestKthToLast(unittest.TestCase):
@@ -68,3 +66,12 @@ class TestKthToLast(unittest.TestCase):
         self.assertEqual(get_kth_to_last(lst, 1).value, 'b')
         self.assertEqual(get_kth_to_last(lst, 2).value, 'a')
         self.assertEqual(get_kth_to_last(lst, 3), None)
+
+    def test_get_kth_to_last_doubly_linked(self):
+        for factory in (DoublyLinkedList, XorLinkedList):
+            lst = factory(range(1, 11))
+            for k in range(1, 11):
+                self.assertEqual(get_kth_to_last(lst, k).value, 11 - k)
+            self.assertIsNone(get_kth_to_last(lst, 0))
+            self.assertIsNone(get_kth_to_last(lst, 11))
+            self.assertIsNone(get_kth_to_last(factory(), 1))
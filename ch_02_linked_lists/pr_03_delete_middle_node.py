@@ -11,6 +11,8 @@ Example:
 
 """
 import unittest
+
+from .array_linked_list import ArrayLinkedList
 from .linked_list import LinkedList
 
 
@@ -18,6 +20,9 @@ def delete_middle_node(node):
     """
     Deletes a node from a list. If it is the last node do nothing.
 
+    The value of the next node is moved to the given node, so references to the next node become
+    stale. Use PredecessorIndex.delete() to delete the node itself.
+
     Complexity: O(1) time, O(1) space.
 
     Args:
@@ -30,6 +35,101 @@ def delete_middle_node(node):
     node.next = node.next.next
 
 
+def delete_nodes(lst, predicate_or_nodes):
+    """
+    Delete many nodes from a list in a single pass.
+
+    Nodes are unlinked with LinkedList.remove_after(), so no objects are created per deleted node
+    and the cached length and tail of the list are updated on the way. The walk starts from the
+    head, which hands the nodes out, so the list still walks itself once on its next access to
+    check them. When nodes are given, the pass stops as soon as all of them are deleted.
+
+    Complexity: O(N) time, O(1) space for a predicate, O(K) space for K given nodes.
+
+    Args:
+        lst (LinkedList): List to delete the nodes from.
+        predicate_or_nodes: Function which takes a node value and returns True if the node should
+            be deleted, or an iterable of nodes to delete.
+
+    Returns:
+        int: Number of deleted nodes.
+
+    """
+    if callable(predicate_or_nodes):
+        predicate = predicate_or_nodes
+        nodes = None
+    else:
+        nodes = set(predicate_or_nodes)
+
+    deleted = 0
+    prev_node = None
+    node = lst.head
+    while node:
+        next_node = node.next
+        if predicate(node.value) if nodes is None else node in nodes:
+            lst.remove_after(prev_node)
+            deleted += 1
+            if nodes is not None and deleted == len(nodes):
+                break
+        else:
+            prev_node = node
+        node = next_node
+    return deleted
+
+
+class PredecessorIndex:
+    """
+    Index of node predecessors which allows to delete any node of a list in O(1) time.
+
+    After the index is built the list must be changed only through the index, otherwise the index
+    becomes stale.
+
+    Complexity: O(N) time and space to build.
+
+    Args:
+        lst (LinkedList): Indexed list.
+
+    """
+
+    def __init__(self, lst):
+        self.lst = lst
+        self._predecessors = {}
+        prev_node = None
+        for node in lst.iter_nodes():
+            self._predecessors[node] = prev_node
+            prev_node = node
+
+    def __contains__(self, node):
+        return node in self._predecessors
+
+    def predecessor(self, node):
+        """
+        Get the node which precedes the given one, None for the head.
+
+        Raises:
+            KeyError: If the node is not in the list.
+
+        """
+        return self._predecessors[node]
+
+    def delete(self, node):
+        """
+        Delete any node, including the head and the tail, from the list in O(1) time.
+
+        Args:
+            node (ListNode): Node to delete.
+
+        Raises:
+            KeyError: If the node is not in the list.
+
+        """
+        prev_node = self._predecessors.pop(node)
+        next_node = node.next
+        self.lst.remove_after(prev_node)
+        if next_node is not None:
+            self._predecessors[next_node] = prev_node
+
+
 class TestDeleteMiddleNode(unittest.TestCase):
 
     def test_delete_middle_node(self):
@@ -55,3 +155,72 @@ class TestDeleteMiddleNode(unittest.TestCase):
 
         delete_middle_node(lst[0])
         self.assertEqual(lst, LinkedList(['g']))
+
+    def test_list_after_delete(self):
+        for factory in (LinkedList, ArrayLinkedList):
+            lst = factory('abc')
+            delete_middle_node(lst[1])
+            self.assertEqual(len(lst), 2)
+            self.assertEqual(lst.tail.value, 'c')
+            lst.append('d')
+            self.assertEqual(lst, LinkedList('acd'))
+            self.assertEqual(len(lst), 3)
+            self.assertEqual(lst.tail.value, 'd')
+
+
+class TestDeleteNodes(unittest.TestCase):
+
+    def test_delete_nodes_predicate(self):
+        for factory in (LinkedList, ArrayLinkedList):
+            lst = factory(range(10))
+            self.assertEqual(delete_nodes(lst, lambda value: value % 3 == 0), 4)
+            self.assertEqual(lst, LinkedList([1, 2, 4, 5, 7, 8]))
+            self.assertEqual(len(lst), 6)
+            self.assertEqual(lst.tail.value, 8)
+
+            self.assertEqual(delete_nodes(lst, lambda value: value > 4), 3)
+            self.assertEqual(lst, LinkedList([1, 2, 4]))
+            self.assertEqual(lst.tail.value, 4)
+
+            self.assertEqual(delete_nodes(lst, lambda value: True), 3)
+            self.assertEqual(lst, LinkedList())
+            self.assertIsNone(lst.tail)
+            self.assertEqual(delete_nodes(lst, lambda value: True), 0)
+
+    def test_delete_nodes_iterable(self):
+        for factory in (LinkedList, ArrayLinkedList):
+            lst = factory('abcdef')
+            c = lst[2]
+            self.assertEqual(delete_nodes(lst, [lst[0], lst[2], lst[5]]), 3)
+            self.assertEqual(lst, LinkedList('bde'))
+            self.assertEqual(len(lst), 3)
+            self.assertEqual(lst.tail.value, 'e')
+            self.assertEqual(delete_nodes(lst, [c]), 0)
+            self.assertEqual(delete_nodes(lst, []), 0)
+            self.assertEqual(lst, LinkedList('bde'))
+
+
+class TestPredecessorIndex(unittest.TestCase):
+
+    def test_delete(self):
+        for factory in (LinkedList, ArrayLinkedList):
+            lst = factory('abcdef')
+            nodes = list(lst.iter_nodes())
+            index = PredecessorIndex(lst)
+            self.assertIsNone(index.predecessor(nodes[0]))
+            self.assertIs(index.predecessor(nodes[3]), nodes[2])
+
+            index.delete(nodes[5])
+            self.assertEqual(lst, LinkedList('abcde'))
+            self.assertIs(lst.tail, nodes[4])
+            index.delete(nodes[2])
+            index.delete(nodes[0])
+            self.assertEqual(lst, LinkedList('bde'))
+            self.assertIs(index.predecessor(nodes[3]), nodes[1])
+            self.assertNotIn(nodes[0], index)
+            self.assertRaises(KeyError, index.delete, nodes[0])
+            index.delete(nodes[4])
+            index.delete(nodes[1])
+            index.delete(nodes[3])
+            self.assertEqual(lst, LinkedList())
+            self.assertEqual(len(lst), 0)
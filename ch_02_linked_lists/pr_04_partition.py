@@ -12,8 +12,13 @@ Example:
     Output: 3 -> 1 -> 2 -> 10 -> 5 -> 5 -> 8
 
 """
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 import unittest
 
+from .array_linked_list import ArrayLinkedList
 from .linked_list import LinkedList
 
 
@@ -33,17 +38,170 @@ def partition(lst, pivot):
         pivot: Pivot point.
 
     """
-    if not lst.head:
-        return
-    node = lst.head
-    while node.next:
-        if node.next.value < pivot <= node.value:
+    for node in lst.iter_nodes():
+        while node.next and node.next.value < pivot <= node.value:
             new_head = node.next
             node.next = node.next.next
             new_head.next = lst.head
             lst.head = new_head
+
+
+def partition_stable(lst, pivot):
+    """
+    Partition a list around a pivot value preserving relative order of elements.
+
+    Nodes are relinked in a single pass to the tails of two chains, one for values < pivot and one
+    for the rest. Then the chains are joined.
+
+    Complexity: O(n) time, O(1) additional memory.
+
+    Args:
+        lst (LinkedList): List for partitioning.
+        pivot: Pivot point.
+
+    """
+    less_head = less_tail = None
+    rest_head = rest_tail = None
+    node = lst.head
+    while node:
+        if node.value < pivot:
+            if less_tail is None:
+                less_head = node
+            else:
+                less_tail.next = node
+            less_tail = node
         else:
-            node = node.next
+            if rest_tail is None:
+                rest_head = node
+            else:
+                rest_tail.next = node
+            rest_tail = node
+        node = node.next
+
+    if rest_tail is not None:
+        rest_tail.next = None
+    if less_tail is not None:
+        less_tail.next = rest_head
+        lst.head = less_head
+
+
+def partition_by(lst, pivots):
+    """
+    Partition a list into len(pivots) + 1 ranges preserving relative order of elements.
+
+    A value v goes to range i if pivots[i - 1] <= v < pivots[i]. Ranges are found with a binary
+    search and the nodes are relinked to the tails of the ranges in a single pass.
+
+    Complexity: O(n log k) time, O(k) additional memory, where k is the number of pivots.
+
+    Args:
+        lst (LinkedList): List for partitioning.
+        pivots (list): Sorted pivot points.
+
+    Raises:
+        ValueError: If the pivots are not sorted.
+
+    """
+    pivots = _check_pivots(pivots)
+    heads = [None] * (len(pivots) + 1)
+    tails = [None] * (len(pivots) + 1)
+    node = lst.head
+    while node:
+        i = bisect_right(pivots, node.value)
+        if tails[i] is None:
+            heads[i] = node
+        else:
+            tails[i].next = node
+        tails[i] = node
+        node = node.next
+
+    head = tail = None
+    for i, range_head in enumerate(heads):
+        if range_head is None:
+            continue
+        if tail is None:
+            head = range_head
+        else:
+            tail.next = range_head
+        tail = tails[i]
+    if tail is not None:
+        tail.next = None
+        lst.head = head
+
+
+def partition_parallel(lst, pivots, max_workers=None, chunk_size=1 << 16):
+    """
+    Partition an ArrayLinkedList into ranges with a process pool, preserving relative order.
+
+    Values are copied in the list order and split into chunks. Worker processes find the range of
+    every value in a chunk. Then the links column is rewritten in bulk, without creating node
+    objects. The result is the same as the result of partition_by(). Lists of other types are
+    partitioned with partition_by() in the current process.
+
+    Sending values to the workers and positions back costs more than comparing plain numbers, so
+    this pays off only for values which are expensive to compare.
+
+    Complexity: O(n log k) time, O(n) additional memory, where k is the number of pivots.
+
+    Args:
+        lst (LinkedList): List for partitioning.
+        pivots (list): Sorted pivot points.
+        max_workers (int): Number of worker processes, number of CPUs by default.
+        chunk_size (int): Number of values processed by a worker at once.
+
+    Raises:
+        ValueError: If the pivots are not sorted.
+
+    """
+    if not isinstance(lst, ArrayLinkedList):
+        partition_by(lst, pivots)
+        return
+    pivots = _check_pivots(pivots)
+
+    indices = array('q', lst._indices())
+    values = list(lst) if lst.typecode is None else array(lst.typecode, lst)
+    chunks = [values[start:start + chunk_size] for start in range(0, len(values), chunk_size)]
+    del values
+
+    ranges = [array('q') for i in range(len(pivots) + 1)]
+    with ProcessPoolExecutor(max_workers) as executor:
+        results = executor.map(_classify_chunk, chunks, [pivots] * len(chunks))
+        for chunk_number, chunk_ranges in enumerate(results):
+            start = chunk_number * chunk_size
+            for i, positions in enumerate(chunk_ranges):
+                ranges[i].extend(indices[start + position] for position in positions)
+    del indices
+
+    order = ranges[0]
+    for indices in ranges[1:]:
+        order.extend(indices)
+    if not order:
+        return
+
+    links = lst.links
+    for index, next_index in zip(order, islice(order, 1, None)):
+        links[index] = next_index
+    links[order[-1]] = -1
+    lst.head_index = order[0]
+    lst.invalidate()
+
+
+def _classify_chunk(values, pivots):
+    """
+    Split positions of the values into ranges separated by the pivots.
+    """
+    ranges = [array('q') for i in range(len(pivots) + 1)]
+    appends = [positions.append for positions in ranges]
+    for position, value in enumerate(values):
+        appends[bisect_right(pivots, value)](position)
+    return ranges
+
+
+def _check_pivots(pivots):
+    pivots = list(pivots)
+    if any(a > b for a, b in zip(pivots, pivots[1:])):
+        raise ValueError('pivots must be sorted')
+    return pivots
 
 
 class TestPartition(unittest.TestCase):
@@ -79,3 +237,63 @@ class TestPartition(unittest.TestCase):
             lst = LinkedList(input_lst)
             partition(lst, pivot)
             self.assertEqual(lst, LinkedList(output_lst))
+
+    def test_partition_array_linked_list(self):
+        for input_lst, pivot, output_lst in self.data:
+            lst = ArrayLinkedList(input_lst, typecode='q')
+            partition(lst, pivot)
+            self.assertEqual(lst, LinkedList(output_lst))
+
+
+class TestStablePartition(unittest.TestCase):
+
+    data = [
+        # (Input list, pivots)
+        ([], [5]),
+        ([1], [1]),
+        ([3, 1], [2]),
+        ([3, 2, 1], [2]),
+        ([3, 5, 8, 5, 10, 2, 1], [5]),
+        ([6, 7, 8, 9, 1, 2, 3, 4], [5]),
+        ([1, 2, 3, 4, 5, 6, 7, 8], [0]),
+        ([1, 2, 3, 4, 5, 6, 7, 8], [10]),
+        ([3, 9, 2, 2, 9, 3, 0, 5], [1, 3, 3, 9]),
+        ([-3, 1, -1, 2, -5, 7, -4, 4], [-2, 0, 3]),
+        ([9, 8, 7, 6, 5, 4, 3, 2, 1, 0], [2, 4, 6, 8]),
+    ]
+
+    @staticmethod
+    def expected(values, pivots):
+        return LinkedList(sorted(values, key=lambda value: bisect_right(pivots, value)))
+
+    def test_partition_stable(self):
+        for values, pivots in self.data:
+            for factory in (LinkedList, ArrayLinkedList):
+                lst = factory(values)
+                partition_stable(lst, pivots[0])
+                self.assertEqual(lst, self.expected(values, pivots[:1]))
+                self.assertEqual(len(lst), len(values))
+
+    def test_partition_by(self):
+        for values, pivots in self.data:
+            for factory in (LinkedList, ArrayLinkedList):
+                lst = factory(values)
+                partition_by(lst, pivots)
+                self.assertEqual(lst, self.expected(values, pivots))
+                self.assertEqual(len(lst), len(values))
+        self.assertRaises(ValueError, partition_by, LinkedList([1]), [2, 1])
+
+    def test_partition_parallel(self):
+        for values, pivots in self.data:
+            for lst in (LinkedList(values), ArrayLinkedList(values),
+                        ArrayLinkedList(values, typecode='q')):
+                partition_parallel(lst, pivots, max_workers=2, chunk_size=3)
+                self.assertEqual(lst, self.expected(values, pivots))
+                self.assertEqual(len(lst), len(values))
+
+        lst = ArrayLinkedList(range(10))
+        lst.node(4).next = lst.node(6)
+        lst.release(lst.node(5))
+        lst.appendleft(10)
+        partition_parallel(lst, [5], max_workers=1, chunk_size=4)
+        self.assertEqual(lst, LinkedList([0, 1, 2, 3, 4, 10, 6, 7, 8, 9]))
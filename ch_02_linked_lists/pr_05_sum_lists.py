@@ -16,8 +16,24 @@ Example:
     Output: 9 - > 1 -> 2. That is, 912.
 
 """
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+import random
 import unittest
-from .linked_list import ListNode, LinkedList
+from .array_linked_list import ArrayLinkedList
+from .linked_list import LinkedList
+
+# Number of decimal digits packed into a limb by the bulk algorithms. It must stay below the limit
+# for int/str conversions (sys.get_int_max_str_digits(), 4300 digits by default).
+LIMB_DIGITS = 1000
+
+# Total number of digits below which sum_many_reversed_lists_parallel() sums in the calling process.
+# Packing the lists into strings dominates smaller inputs, so starting worker processes only adds
+# to the time.
+PARALLEL_MIN_DIGITS = 10 ** 6
+
+_TO_ASCII = bytes.maketrans(bytes(range(10)), b'0123456789')
+_FROM_ASCII = bytes.maketrans(b'0123456789', bytes(range(10)))
 
 
 def reverse_list(lst):
@@ -71,25 +87,25 @@ def sum_lists(lst1, lst2):
     result = LinkedList()
 
     while node1 is not None or node2 is not None:
-        new_node = ListNode(carry, result.head)
+        digit = carry
 
         if node1 is not None:
-            new_node.value += node1.value
+            digit += node1.value
             node1 = node1.next
         if node2 is not None:
-            new_node.value += node2.value
+            digit += node2.value
             node2 = node2.next
 
-        if new_node.value > 9:
+        if digit > 9:
             carry = 1
-            new_node.value = new_node.value % 10
+            digit = digit % 10
         else:
             carry = 0
 
-        result.head = new_node
+        result.appendleft(digit)
 
     if carry:
-        result.head = ListNode(1, result.head)
+        result.appendleft(1)
 
     reverse_list(lst1)
     reverse_list(lst2)
@@ -116,36 +132,269 @@ def sum_reversed_lists(lst1, lst2):
     node2 = lst2.head
     carry = 0
     result = LinkedList()
-    result_tail = None
 
     while node1 is not None or node2 is not None:
-        new_node = ListNode(carry)
+        digit = carry
 
         if node1 is not None:
-            new_node.value += node1.value
+            digit += node1.value
             node1 = node1.next
         if node2 is not None:
-            new_node.value += node2.value
+            digit += node2.value
             node2 = node2.next
 
-        if new_node.value > 9:
+        if digit > 9:
             carry = 1
-            new_node.value = new_node.value % 10
+            digit = digit % 10
         else:
             carry = 0
 
-        if result_tail:
-            result_tail.next = new_node
-            result_tail = new_node
-        else:
-            result.head = result_tail = new_node
+        result.append(digit)
 
     if carry:
-        result_tail.next = ListNode(1)
+        result.append(1)
 
     return result
 
 
+def sum_lists_bulk(lst1, lst2, limb_digits=LIMB_DIGITS):
+    """
+    Sum lists in forward order packing the digits into big limbs.
+
+    Digits of each list are collected into a byte string in a single pass, the strings are cut
+    into limbs of limb_digits digits which are added as Python integers, and the sum is unpacked
+    into a new list. Per-digit work is done in C, so for long numbers this is much faster than
+    sum_lists(). The operands are not modified.
+
+    Complexity: O(N+M) time, O(M) space.
+
+    Args:
+        lst1 (LinkedList): First operand.
+        lst2 (LinkedList): Second operand.
+        limb_digits (int): Number of digits in a limb.
+
+    Returns:
+        LinkedList: Sum of the two lists written in forward order.
+
+    Raises:
+        ValueError: If a list contains something other than integers from 0 to 9.
+
+    """
+    return _ascii_to_list(_add_ascii(_list_to_ascii(lst1), _list_to_ascii(lst2), limb_digits))
+
+
+def sum_reversed_lists_bulk(lst1, lst2, limb_digits=LIMB_DIGITS):
+    """
+    Sum lists in reverse order packing the digits into big limbs.
+
+    Works like sum_lists_bulk(), the packed digit strings are reversed before and after the
+    addition.
+
+    Complexity: O(N+M) time, O(M) space.
+
+    Args:
+        lst1 (LinkedList): First operand.
+        lst2 (LinkedList): Second operand.
+        limb_digits (int): Number of digits in a limb.
+
+    Returns:
+        LinkedList: Sum of the two lists written in reverse order.
+
+    Raises:
+        ValueError: If a list contains something other than integers from 0 to 9.
+
+    """
+    text = _add_ascii(_list_to_ascii(lst1)[::-1], _list_to_ascii(lst2)[::-1], limb_digits)
+    return _ascii_to_list(text[::-1])
+
+
+def sum_many_reversed_lists(lists):
+    """
+    Sum any number of lists in reverse order in a single pass.
+
+    All the lists are walked simultaneously. Digits at the same position are added together with
+    the carry from the previous position, which may be wider than a single digit. Exhausted lists
+    are dropped from the walk. Digits of the result are appended to a single output list, no
+    intermediate sums are created.
+
+    Complexity: O(N) time, O(K + M) space, where N is the total number of digits, K is the number
+        of lists and M is the length of the result.
+
+    Args:
+        lists: Iterable of LinkedList operands.
+
+    Returns:
+        LinkedList: Sum of the lists written in reverse order.
+
+    """
+    nodes = [lst.head for lst in lists if lst.head is not None]
+    carry = 0
+    result = LinkedList()
+
+    while nodes or carry:
+        total = carry
+        active = 0
+        for node in nodes:
+            total += node.value
+            node = node.next
+            if node is not None:
+                nodes[active] = node
+                active += 1
+        del nodes[active:]
+
+        carry, digit = divmod(total, 10)
+        result.append(digit)
+
+    return result
+
+
+def sum_many_reversed_lists_parallel(lists, max_workers=None, group_size=64,
+                                     limb_digits=LIMB_DIGITS, min_digits=PARALLEL_MIN_DIGITS):
+    """
+    Sum a big batch of lists in reverse order using a pool of processes.
+
+    The lists are packed into digit strings which are summed by tree reduction: on every round the
+    strings are split into groups of group_size, each group is summed in a worker process with the
+    limb-based algorithm of sum_lists_bulk(), and the group sums are fed to the next round until a
+    single sum is left. Inputs which fit into a single group or have fewer than min_digits digits
+    are summed in the calling process without starting the pool.
+
+    Complexity: O(N) total work, O(log K) rounds, where N is the total number of digits and K is
+        the number of lists.
+
+    Args:
+        lists: Iterable of LinkedList operands.
+        max_workers (int): Number of worker processes, number of CPUs by default.
+        group_size (int): Number of operands summed by a single task, at least 2.
+        limb_digits (int): Number of digits in a limb.
+        min_digits (int): Minimal total number of digits summed in worker processes.
+
+    Returns:
+        LinkedList: Sum of the lists written in reverse order.
+
+    Raises:
+        ValueError: If a list contains something other than integers from 0 to 9.
+
+    """
+    if group_size < 2:
+        raise ValueError('group size must be at least 2')
+    texts = [_list_to_ascii(lst)[::-1] for lst in lists]
+    if not texts:
+        return LinkedList()
+    if len(texts) <= group_size or sum(map(len, texts)) < min_digits:
+        return _ascii_to_list(_add_ascii_many(texts, limb_digits)[::-1])
+
+    with ProcessPoolExecutor(max_workers) as executor:
+        while len(texts) > 1:
+            groups = [texts[i:i + group_size] for i in range(0, len(texts), group_size)]
+            texts = list(executor.map(_add_ascii_many, groups, [limb_digits] * len(groups)))
+
+    return _ascii_to_list(texts[0][::-1])
+
+
+def _add_ascii_many(texts, limb_digits=LIMB_DIGITS):
+    """
+    Add a group of numbers written as byte strings of ASCII digits.
+    """
+    return reduce(lambda text1, text2: _add_ascii(text1, text2, limb_digits), texts)
+
+
+def _list_to_ascii(lst):
+    """
+    Pack digits of a list into a byte string of ASCII digits.
+    """
+    try:
+        digits = bytes(lst)
+    except (TypeError, ValueError):
+        raise ValueError('digit lists must contain integers from 0 to 9') from None
+    if digits and max(digits) > 9:
+        raise ValueError('digit lists must contain integers from 0 to 9')
+    return digits.translate(_TO_ASCII)
+
+
+def _ascii_to_list(text):
+    """
+    Unpack a byte string of ASCII digits into a new list of digits.
+    """
+    return LinkedList.from_buffer(text.translate(_FROM_ASCII))
+
+
+def _add_ascii(text1, text2, limb_digits=LIMB_DIGITS):
+    """
+    Add two numbers written as byte strings of ASCII digits.
+
+    The result has as many digits as the longest operand, plus one if there is a carry from the
+    most significant digit. Leading zeros are preserved like in the per-digit algorithms.
+
+    """
+    length = max(len(text1), len(text2))
+    text1 = text1.rjust(length, b'0')
+    text2 = text2.rjust(length, b'0')
+    base = 10 ** limb_digits
+
+    parts = []
+    carry = 0
+    for end in range(length, 0, -limb_digits):
+        start = max(0, end - limb_digits)
+        limb = int(text1[start:end]) + int(text2[start:end]) + carry
+        if start:
+            carry, limb = divmod(limb, base)
+        parts.append(b'%0*d' % (end - start, limb))
+    parts.reverse()
+    return b''.join(parts)
+
+
+class TestSumManyLists(unittest.TestCase):
+    data = [
+        ([], ()),
+        ([()], ()),
+        ([(), ()], ()),
+        ([(0,)], (0,)),
+        ([(3, 2, 1)], (3, 2, 1)),
+        ([(5,), (5,)], (0, 1)),
+        ([(9, 9), (9, 9), (9, 9)], (7, 9, 2)),
+        ([(9,)] * 12, (8, 0, 1)),
+        ([(1,), (0, 0, 0), (9,)], (0, 1, 0)),
+        ([(7, 1, 6), (5, 9, 2), (), (0,), (1,)], (3, 1, 9)),
+    ]
+
+    def test_sum_many_reversed_lists(self):
+        for operands, result in self.data:
+            lists = [LinkedList(operand) for operand in operands]
+            self.assertEqual(sum_many_reversed_lists(lists), LinkedList(result))
+            self.assertEqual(sum_many_reversed_lists(iter(lists)), LinkedList(result))
+
+    @staticmethod
+    def make_lists(seed):
+        rng = random.Random(seed)
+        return [LinkedList(rng.randint(0, 9) for j in range(rng.randint(0, 30)))
+                for i in range(50)]
+
+    def test_sum_many_matches_pairwise(self):
+        lists = self.make_lists(7)
+        self.assertEqual(sum_many_reversed_lists(lists),
+                         reduce(sum_reversed_lists, lists, LinkedList()))
+
+    def test_sum_many_reversed_lists_parallel(self):
+        for operands, result in self.data:
+            lists = [LinkedList(operand) for operand in operands]
+            for min_digits in (0, PARALLEL_MIN_DIGITS):
+                self.assertEqual(sum_many_reversed_lists_parallel(lists, max_workers=2,
+                                                                  group_size=2,
+                                                                  min_digits=min_digits),
+                                 LinkedList(result))
+
+        lists = self.make_lists(8)
+        expected = sum_many_reversed_lists(lists)
+        for group_size, min_digits in ((4, 0), (4, PARALLEL_MIN_DIGITS), (64, 0)):
+            self.assertEqual(sum_many_reversed_lists_parallel(lists, 2, group_size=group_size,
+                                                              limb_digits=3,
+                                                              min_digits=min_digits),
+                             expected)
+        self.assertRaises(ValueError, sum_many_reversed_lists_parallel, lists, group_size=1)
+        self.assertRaises(ValueError, sum_many_reversed_lists_parallel, [LinkedList([10])])
+
+
 class TestReverse(unittest.TestCase):
     data = [('', ''),
             ('a', 'a'),
@@ -159,6 +408,12 @@ class TestReverse(unittest.TestCase):
             reverse_list(lst)
             self.assertEqual(lst, LinkedList(output))
 
+    def test_reverse_array_linked_list(self):
+        for input, output in self.data:
+            lst = ArrayLinkedList(input)
+            reverse_list(lst)
+            self.assertEqual(lst, LinkedList(output))
+
 
 class TestSumList(unittest.TestCase):
     data = [
@@ -191,3 +446,47 @@ class TestSumList(unittest.TestCase):
             result_lst = LinkedList(reversed(result))
             self.assertEqual(sum_reversed_lists(lst1, lst2), result_lst)
             self.assertEqual(sum_reversed_lists(lst2, lst1), result_lst)
+
+    def test_sum_lists_bulk(self):
+        for limb_digits in (1, 2, 3, LIMB_DIGITS):
+            for num1, num2, result in self.data:
+                lst1 = LinkedList(num1)
+                lst2 = ArrayLinkedList(num2)
+                result_lst = LinkedList(result)
+                self.assertEqual(sum_lists_bulk(lst1, lst2, limb_digits), result_lst)
+                self.assertEqual(sum_lists_bulk(lst2, lst1, limb_digits), result_lst)
+                self.assertEqual(lst1, LinkedList(num1))
+                self.assertEqual(lst2, LinkedList(num2))
+
+    def test_sum_reversed_lists_bulk(self):
+        for limb_digits in (1, 2, 3, LIMB_DIGITS):
+            for num1, num2, result in self.data:
+                lst1 = LinkedList(reversed(num1))
+                lst2 = LinkedList(reversed(num2))
+                result_lst = LinkedList(reversed(result))
+                self.assertEqual(sum_reversed_lists_bulk(lst1, lst2, limb_digits), result_lst)
+                self.assertEqual(sum_reversed_lists_bulk(lst2, lst1, limb_digits), result_lst)
+
+    def test_bulk_long_numbers(self):
+        rng = random.Random(6)
+        for length1, length2 in ((2500, 2500), (3001, 17), (1, 2999), (4000, 3999)):
+            if length1 == length2:
+                num1 = [9] * length1
+            else:
+                num1 = [rng.randint(0, 9) for i in range(length1)]
+            num2 = [rng.randint(0, 9) for i in range(length2)]
+            lst1 = LinkedList(num1)
+            lst2 = LinkedList(num2)
+            expected = sum_lists(lst1, lst2)
+            self.assertEqual(sum_lists_bulk(lst1, lst2), expected)
+            self.assertEqual(sum_lists_bulk(lst1, lst2, limb_digits=7), expected)
+            expected = sum_reversed_lists(lst1, lst2)
+            self.assertEqual(sum_reversed_lists_bulk(lst1, lst2), expected)
+            self.assertEqual(sum_reversed_lists_bulk(lst1, lst2, limb_digits=7), expected)
+
+    def test_bulk_invalid_digits(self):
+        for digits in ([1, 10], [1, -1], [1, 48], [1, 'a'], [1, None], [256]):
+            with self.assertRaises(ValueError):
+                sum_lists_bulk(LinkedList(digits), LinkedList([1]))
+            with self.assertRaises(ValueError):
+                sum_reversed_lists_bulk(LinkedList([1]), LinkedList(digits))
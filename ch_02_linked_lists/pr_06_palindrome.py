@@ -4,8 +4,17 @@ Palindrome:
 Problem statement: Implement a function to check if a linked list is a palindrome.
 
 """
+from math import isqrt
+import random
 import unittest
+
+from .array_linked_list import ArrayLinkedList
+from .doubly_linked_list import DoublyLinkedList
 from .linked_list import LinkedList
+from .xor_linked_list import XorLinkedList
+
+# Mersenne prime used as the modulus of the polynomial hashes.
+HASH_MODULUS = (1 << 61) - 1
 
 
 def is_palindrome1(lst):
@@ -21,13 +30,7 @@ def is_palindrome1(lst):
         bool: True if the list is a palindrome, False otherwise.
 
     """
-    # Get the length of the list
-    length = 0
-    node = lst.head
-    while node:
-        length += 1
-        node = node.next
-
+    length = len(lst)
     if length < 3:
         return True
 
@@ -56,47 +59,139 @@ def is_palindrome2(lst):
     """
     Checks if a linked list is a palindrome. Algorithm 2. Reverses half of the list in place.
 
+    The left half is reversed back before the function returns, even if comparison of the values
+    raises an exception. The list is still modified during the check, so it must not be used
+    concurrently.
+
+    DoublyLinkedList and XorLinkedList are not modified: they are read from both ends at once.
+
     Complexity: O(N) time, O(1) space.
 
     Args:
-        lst (LinkedList): A linked list.
+        lst (LinkedList): A linked list, DoublyLinkedList or XorLinkedList.
 
     Returns:
         bool: True if the list is a palindrome, False otherwise.
 
     """
-    # Get the length of the list.
-    length = 0
-    node = lst.head
-    while node:
-        length += 1
-        node = node.next
-
+    length = len(lst)
     if length < 3:
         return True
 
+    if isinstance(lst, (DoublyLinkedList, XorLinkedList)):
+        for value1, value2, i in zip(lst, reversed(lst), range(length // 2)):
+            if value1 != value2:
+                return False
+        return True
+
     # Go through the left half of the list with forward runner turning the next node pointers.
     prev_node = lst.head
     forward_runner = lst.head.next
-    for i in range(length // 2 - 1):
-        next_node = forward_runner.next
-        forward_runner.next = prev_node
-        prev_node = forward_runner
-        forward_runner = next_node
+    reversed_nodes = 0
+    try:
+        for i in range(length // 2 - 1):
+            next_node = forward_runner.next
+            forward_runner.next = prev_node
+            prev_node = forward_runner
+            forward_runner = next_node
+            reversed_nodes += 1
+        right_start = forward_runner
 
-    # If the length is odd ignore the middle node
+        # If the length is odd ignore the middle node
+        if length % 2:
+            forward_runner = forward_runner.next
+
+        # Go forward through the right half with the forward runner,
+        # go back through the reversed left half with the backward runner,
+        # compare runners' values.
+        backward_runner = prev_node
+        for i in range(length // 2):
+            if backward_runner.value != forward_runner.value:
+                return False
+            forward_runner = forward_runner.next
+            backward_runner = backward_runner.next
+
+        return True
+
+    finally:
+        # Turn the next node pointers of the left half back.
+        next_node = forward_runner if reversed_nodes < length // 2 - 1 else right_start
+        node = prev_node
+        for i in range(reversed_nodes):
+            prev = node.next
+            node.next = next_node
+            next_node = node
+            node = prev
+
+
+def is_palindrome_hash(lst):
+    """
+    Checks if a linked list is a palindrome comparing polynomial hashes. Does not modify the list.
+
+    A single pass computes hashes of the values read forward and backward, using a random base
+    modulo a Mersenne prime. Different hashes prove that the list is not a palindrome. Equal hashes
+    are verified exactly: the left half is read in blocks of sqrt(N) values from checkpoint nodes,
+    and every block is compared backward with the right half. The first and the last values are
+    compared before hashing, which rejects most of the random lists in O(1) time.
+
+    Unlike is_palindrome2(), the list is not relinked, not even temporarily. Values must be
+    hashable.
+
+    Complexity: O(N) time, O(sqrt(N)) space.
+
+    Args:
+        lst (LinkedList): A linked list.
+
+    Returns:
+        bool: True if the list is a palindrome, False otherwise.
+
+    """
+    length = len(lst)
+    if length < 2:
+        return True
+    if lst.head.value != lst.tail.value:
+        return False
+
+    # Both hashes are calculated with Horner's method, the backward one with the inverse base.
+    # Then the backward hash is multiplied by base ** (N - 1) to match the forward one.
+    base = random.randrange(2, HASH_MODULUS - 1)
+    inverse_base = pow(base, -1, HASH_MODULUS)
+    forward_hash = backward_hash = 0
+    for value_hash in map(hash, lst):
+        forward_hash = (forward_hash * base + value_hash) % HASH_MODULUS
+        backward_hash = (backward_hash * inverse_base + value_hash) % HASH_MODULUS
+    if forward_hash != backward_hash * pow(base, length - 1, HASH_MODULUS) % HASH_MODULUS:
+        return False
+
+    return _verify_palindrome(lst, length)
+
+
+def _verify_palindrome(lst, length):
+    """
+    Compare the left half of a list backward with the right half using O(sqrt(N)) space.
+    """
+    half = length // 2
+    step = isqrt(half) or 1
+    checkpoints = []
+    node = lst.head
+    for position in range(half):
+        if position % step == 0:
+            checkpoints.append(node)
+        node = node.next
     if length % 2:
-        forward_runner = forward_runner.next
+        node = node.next
 
-    # Go forward through the right half with the forward runner,
-    # go back through the reversed left half with the backward runner,
-    # compare runners' values.
-    backward_runner = prev_node
-    for i in range(length // 2):
-        if backward_runner.value != forward_runner.value:
-            return False
-        forward_runner = forward_runner.next
-        backward_runner = backward_runner.next
+    right_runner = node
+    for block_number in range(len(checkpoints) - 1, -1, -1):
+        block = []
+        node = checkpoints[block_number]
+        for i in range(min(step, half - block_number * step)):
+            block.append(node.value)
+            node = node.next
+        for value in reversed(block):
+            if value != right_runner.value:
+                return False
+            right_runner = right_runner.next
 
     return True
 
@@ -123,3 +218,55 @@ class TestPalindrome(unittest.TestCase):
         for data in self.data:
             lst = LinkedList(data[0])
             self.assertEqual(is_palindrome2(lst), data[1])
+
+    def test_palindrome2_restores_list(self):
+        for data in self.data:
+            lst = LinkedList(data[0])
+            is_palindrome2(lst)
+            self.assertEqual(lst, LinkedList(data[0]))
+
+        class Value(str):
+            def __ne__(self, other):
+                raise RuntimeError('comparison failed')
+
+        for length in range(3, 9):
+            values = [Value(c) for c in 'abcdefgh'[:length]]
+            lst = LinkedList(values)
+            self.assertRaises(RuntimeError, is_palindrome2, lst)
+            self.assertEqual(list(lst), values)
+
+    def test_palindrome_doubly_linked(self):
+        for data in self.data:
+            for factory in (DoublyLinkedList, XorLinkedList):
+                lst = factory(data[0])
+                self.assertEqual(is_palindrome1(lst), data[1])
+                self.assertEqual(is_palindrome2(lst), data[1])
+                self.assertEqual(is_palindrome_hash(lst), list(data[0]) == list(data[0])[::-1])
+                self.assertEqual(lst, LinkedList(data[0]))
+
+    def test_palindrome_hash(self):
+        for data in self.data:
+            for factory in (LinkedList, ArrayLinkedList):
+                lst = factory(data[0])
+                self.assertEqual(is_palindrome_hash(lst), list(data[0]) == list(data[0])[::-1])
+                self.assertEqual(lst, LinkedList(data[0]))
+
+        for length in range(1, 40):
+            values = list(range(length // 2)) + [-1] * (length % 2) + list(range(length // 2))[::-1]
+            self.assertTrue(is_palindrome_hash(LinkedList(values)))
+            for position in range(1, length - 1):
+                changed = values.copy()
+                changed[position] = -2
+                self.assertEqual(is_palindrome_hash(LinkedList(changed)),
+                                 changed == changed[::-1])
+
+    def test_verify_palindrome(self):
+        # Exact verification is what protects from hash collisions, so test it on its own.
+        for length in range(2, 40):
+            values = list(range(length // 2)) + [-1] * (length % 2) + list(range(length // 2))[::-1]
+            self.assertTrue(_verify_palindrome(LinkedList(values), length))
+            for position in range(length):
+                changed = values.copy()
+                changed[position] = -2
+                self.assertEqual(_verify_palindrome(LinkedList(changed), length),
+                                 changed == changed[::-1])
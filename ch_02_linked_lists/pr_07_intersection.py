@@ -7,7 +7,10 @@ if the k-th node of the first linked list is the exact same node (by reference)
 the second linked list, then they are intersecting.
 
 """
+from itertools import combinations
+import random
 import unittest
+
 from .linked_list import LinkedList
 
 
@@ -59,6 +62,110 @@ def get_intersection(lst1, lst2):
     return runner1
 
 
+class MergeForest:
+    """
+    Intersections of many linked lists.
+
+    Lists are walked one by one remembering which list visited each node first. A walk stops at
+    the first node visited by an earlier list: the list merges into that list there. So every node
+    is visited once, and the lists which share their tails form a tree in which every list points
+    to the list it merges into. The first list of a group is the root of its tree.
+
+    The intersection of two lists is found by climbing from both of them to their lowest common
+    ancestor. The lists enter the ancestor at two nodes, and the one farther from its head is the
+    intersection.
+
+    Complexity: O(N) time and space to build, where N is the total number of distinct nodes,
+    and O(D) time per intersection, where D is the depth of the tree.
+
+    Args:
+        lists (iterable): Linked lists without loops.
+
+    Attributes:
+        lists (list): The linked lists.
+        parent (list): For every list, index of the list it merges into, None for the first list
+            of a group and for lists which don't intersect others.
+        entry (list): For every list, the first node it shares with its parent list, or None.
+
+    """
+
+    def __init__(self, lists):
+        self.lists = list(lists)
+        self.parent = [None] * len(self.lists)
+        self.entry = [None] * len(self.lists)
+        self._entry_position = [0] * len(self.lists)
+        self._depth = [0] * len(self.lists)
+        self._root = list(range(len(self.lists)))
+
+        owners = {}
+        groups = {}
+        for i, lst in enumerate(self.lists):
+            position = 0
+            node = lst.head
+            while node:
+                owner = owners.get(node)
+                if owner is not None:
+                    j, self._entry_position[i] = owner
+                    self.parent[i] = j
+                    self.entry[i] = node
+                    self._depth[i] = self._depth[j] + 1
+                    self._root[i] = self._root[j]
+                    groups.setdefault(self._root[i], [self._root[i]]).append(i)
+                    break
+                owners[node] = (i, position)
+                node = node.next
+                position += 1
+        self._groups = [groups[root] for root in sorted(groups)]
+
+    def groups(self):
+        """
+        Get groups of lists which share their tails.
+
+        Returns:
+            list: Lists of indices of the lists, only groups with at least two lists.
+
+        """
+        return [group.copy() for group in self._groups]
+
+    def intersection(self, i, j):
+        """
+        Find the intersection node of two lists.
+
+        Args:
+            i (int): Index of the first list.
+            j (int): Index of the second list.
+
+        Returns:
+            ListNode: Common intersection node or None.
+
+        """
+        if self._root[i] != self._root[j] or self.lists[i].head is None:
+            return None
+
+        node_i, position_i = self.lists[i].head, 0
+        node_j, position_j = self.lists[j].head, 0
+        while i != j:
+            if self._depth[i] >= self._depth[j]:
+                node_i, position_i = self.entry[i], self._entry_position[i]
+                i = self.parent[i]
+            else:
+                node_j, position_j = self.entry[j], self._entry_position[j]
+                j = self.parent[j]
+        return node_i if position_i >= position_j else node_j
+
+    def pairs(self):
+        """
+        Generate intersections of all the pairs of intersecting lists.
+
+        Yields:
+            tuple: Indices i < j of the lists and their intersection node.
+
+        """
+        for group in self._groups:
+            for i, j in combinations(sorted(group), 2):
+                yield i, j, self.intersection(i, j)
+
+
 class TestIntersection(unittest.TestCase):
     data = [
         # (Head of the 1st list, Head of the 2nd list, Their common tail)
@@ -145,3 +252,52 @@ class TestIntersection(unittest.TestCase):
 
             self.assertIs(get_intersection(lst1, lst2), tail.head)
             self.assertIs(get_intersection(lst2, lst1), tail.head)
+
+
+class TestMergeForest(unittest.TestCase):
+
+    @staticmethod
+    def make_lists(count, seed):
+        generator = random.Random(seed)
+        lists = []
+        for i in range(count):
+            lst = LinkedList(range(generator.randrange(4)))
+            if lists and generator.random() < 0.8:
+                other = generator.choice(lists)
+                if other.head is not None:
+                    node = other[generator.randrange(len(other))]
+                    if lst.head is None:
+                        lst.head = node
+                    else:
+                        lst.tail.next = node
+            lists.append(lst)
+        return lists
+
+    def test_merge_forest(self):
+        for seed in range(50):
+            lists = self.make_lists(12, seed)
+            forest = MergeForest(lists)
+            expected = {}
+            for i, j in combinations(range(len(lists)), 2):
+                node = get_intersection(lists[i], lists[j])
+                self.assertIs(forest.intersection(i, j), node)
+                self.assertIs(forest.intersection(j, i), node)
+                if node is not None:
+                    expected[i, j] = node
+            self.assertEqual({(i, j): node for i, j, node in forest.pairs()}, expected)
+
+            grouped = sorted(i for group in forest.groups() for i in group)
+            self.assertEqual(grouped, sorted({i for pair in expected for i in pair}))
+            for group in forest.groups():
+                self.assertEqual(group, sorted(group))
+                self.assertEqual(len({lists[i].tail for i in group}), 1)
+
+    def test_merge_forest_no_lists(self):
+        forest = MergeForest([])
+        self.assertEqual(forest.groups(), [])
+        self.assertEqual(list(forest.pairs()), [])
+
+        forest = MergeForest([LinkedList(), LinkedList([1])])
+        self.assertIsNone(forest.intersection(0, 1))
+        self.assertIsNone(forest.intersection(0, 0))
+        self.assertIs(forest.intersection(1, 1), forest.lists[1].head)
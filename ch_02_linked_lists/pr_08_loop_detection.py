@@ -12,8 +12,11 @@ Example:
     Output: C
 
 """
+from collections import namedtuple
+from operator import attrgetter
 import unittest
 
+from .array_linked_list import ArrayLinkedList
 from .linked_list import LinkedList
 
 
@@ -76,6 +79,160 @@ def detect_loop(lst):
     return runner_1
 
 
+LoopInfo = namedtuple('LoopInfo', ['start', 'mu', 'lam', 'steps'])
+LoopInfo.__doc__ = """
+Statistics of a loop in a circular linked list.
+
+Attributes:
+    start (ListNode): Node at the beginning of the loop.
+    mu (int): Number of nodes before the loop (length of the tail).
+    lam (int): Number of nodes in the loop (length of the cycle).
+    steps (int): Number of next pointers followed by the algorithm.
+
+"""
+
+
+def floyd_loop(lst):
+    """
+    Find the loop in a linked list with Floyd's "tortoise and hare" algorithm.
+
+    The hare moves two nodes per iteration and the tortoise moves one node until they meet inside
+    the loop. Then the tortoise restarts from the head and both move one node per iteration until
+    they meet at the beginning of the loop. One more round over the loop gives its length.
+
+    For ArrayLinkedList the algorithm follows indices in the links array and doesn't create node
+    objects, which makes it usable for lists with hundreds of millions of nodes.
+
+    Complexity: O(mu + lam) time, O(1) additional space.
+
+    Args:
+        lst (LinkedList): List to check.
+
+    Returns:
+        LoopInfo: Loop statistics. None if there is no loop.
+
+    """
+    return _find_loop(lst, _floyd)
+
+
+def brent_loop(lst):
+    """
+    Find the loop in a linked list with Brent's algorithm.
+
+    The hare moves one node per iteration, and the tortoise is teleported to the hare each time
+    the number of iterations reaches the next power of two, until the hare meets the tortoise.
+    The distance between them is then the length of the loop. Two runners which are the loop
+    length apart find the beginning of the loop.
+
+    Unlike Floyd's algorithm it moves only one runner while searching for the loop, so it usually
+    follows fewer next pointers.
+
+    Complexity: O(mu + lam) time, O(1) additional space.
+
+    Args:
+        lst (LinkedList): List to check.
+
+    Returns:
+        LoopInfo: Loop statistics. None if there is no loop.
+
+    """
+    return _find_loop(lst, _brent)
+
+
+def _find_loop(lst, algorithm):
+    """
+    Run the algorithm over indices of an ArrayLinkedList or over nodes of another list.
+    """
+    if isinstance(lst, ArrayLinkedList):
+        result = algorithm(lst.head_index, lst.links.__getitem__, -1)
+        if result is None:
+            return None
+        return LoopInfo(lst.node(result[0]), *result[1:])
+
+    result = algorithm(lst.head, attrgetter('next'), None)
+    return None if result is None else LoopInfo(*result)
+
+
+def _floyd(first, successor, end):
+    """
+    Floyd's algorithm over nodes given by successor(node), up to the end marker.
+
+    Returns:
+        tuple: Loop start, mu, lambda and number of steps. None if there is no loop.
+
+    """
+    if first == end:
+        return None
+
+    tortoise = hare = first
+    iterations = 0
+    while True:
+        hare = successor(hare)
+        if hare == end:
+            return None
+        hare = successor(hare)
+        if hare == end:
+            return None
+        tortoise = successor(tortoise)
+        iterations += 1
+        if tortoise == hare:
+            break
+
+    mu = 0
+    tortoise = first
+    while tortoise != hare:
+        tortoise = successor(tortoise)
+        hare = successor(hare)
+        mu += 1
+
+    lam = 1
+    hare = successor(tortoise)
+    while hare != tortoise:
+        hare = successor(hare)
+        lam += 1
+
+    return tortoise, mu, lam, 3 * iterations + 2 * mu + lam
+
+
+def _brent(first, successor, end):
+    """
+    Brent's algorithm over nodes given by successor(node), up to the end marker.
+
+    Returns:
+        tuple: Loop start, mu, lambda and number of steps. None if there is no loop.
+
+    """
+    if first == end:
+        return None
+
+    power = lam = 1
+    tortoise = first
+    hare = successor(first)
+    steps = 1
+    while tortoise != hare:
+        if hare == end:
+            return None
+        if power == lam:
+            tortoise = hare
+            power *= 2
+            lam = 0
+        hare = successor(hare)
+        lam += 1
+        steps += 1
+
+    tortoise = hare = first
+    for i in range(lam):
+        hare = successor(hare)
+
+    mu = 0
+    while tortoise != hare:
+        tortoise = successor(tortoise)
+        hare = successor(hare)
+        mu += 1
+
+    return tortoise, mu, lam, steps + lam + 2 * mu
+
+
 class TestLoopDetection(unittest.TestCase):
 
     def test_loop_detection(self):
@@ -86,3 +243,27 @@ class TestLoopDetection(unittest.TestCase):
             for j in range(i):
                 lst[i - 1].next = lst[j]
                 self.assertIs(detect_loop(lst), lst[j])
+
+    def test_loop_detection_array_linked_list(self):
+        self.assertIsNone(detect_loop(ArrayLinkedList()))
+        for i in range(1, 11):
+            lst = ArrayLinkedList(range(i), typecode='q')
+            self.assertIsNone(detect_loop(lst))
+            for j in range(i):
+                lst[i - 1].next = lst[j]
+                self.assertIs(detect_loop(lst), lst[j])
+
+    def test_loop_info(self):
+        for find_loop in (floyd_loop, brent_loop):
+            for factory in (LinkedList, ArrayLinkedList):
+                self.assertIsNone(find_loop(factory()))
+                for i in range(1, 11):
+                    lst = factory(range(i))
+                    self.assertIsNone(find_loop(lst))
+                    for j in range(i):
+                        lst[i - 1].next = lst[j]
+                        info = find_loop(lst)
+                        self.assertIs(info.start, lst[j])
+                        self.assertEqual(info.mu, j)
+                        self.assertEqual(info.lam, i - j)
+                        self.assertGreaterEqual(info.steps, i)
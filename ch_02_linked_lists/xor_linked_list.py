@@ -0,0 +1,309 @@
+"""
+Memory-compact doubly linked list which stores XOR of neighbour indices.
+
+Like ArrayLinkedList, XorLinkedList keeps node values and links in two parallel columns. A single
+link per node is enough to walk the list in both directions: the link is the XOR of the indices
+of the previous and the next node, -1 stands for None. Walking from a node to its neighbour
+requires the index of the node we came from, so nodes are cursors which remember it.
+
+Nodes cannot be relinked, so only the chapter 2 algorithms which read the list accept it.
+
+"""
+from array import array
+from itertools import zip_longest
+import unittest
+
+from .linked_list import LinkedList
+
+
+class XorListNode:
+    """
+    Cursor pointing to a node of an XorLinkedList.
+
+    Cursors are created on demand, so two cursors for the same node are equal but not identical.
+
+    Args:
+        lst (XorLinkedList): List which stores the node.
+        index (int): Index of the node in the list columns.
+        prev_index (int): Index of the previous node, -1 for the head.
+
+    Attributes:
+        index (int): Index of the node in the list columns.
+
+    """
+    __slots__ = ('_list', 'index', '_prev_index')
+
+    def __init__(self, lst, index, prev_index):
+        self._list = lst
+        self.index = index
+        self._prev_index = prev_index
+
+    @property
+    def value(self):
+        """
+        Value of the node.
+        """
+        return self._list.values[self.index]
+
+    @value.setter
+    def value(self, value):
+        self._list.values[self.index] = value
+
+    @property
+    def next(self):
+        """
+        Next node in the list or None. Read-only.
+        """
+        next_index = self._list.links[self.index] ^ self._prev_index
+        if next_index < 0:
+            return None
+        return XorListNode(self._list, next_index, self.index)
+
+    @property
+    def prev(self):
+        """
+        Previous node in the list or None. Read-only.
+        """
+        if self._prev_index < 0:
+            return None
+        return XorListNode(self._list, self._prev_index,
+                           self._list.links[self._prev_index] ^ self.index)
+
+    def __eq__(self, other):
+        if not isinstance(other, XorListNode):
+            return NotImplemented
+        return self._list is other._list and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self._list), self.index))
+
+
+class XorLinkedList:
+    """
+    Doubly linked list with one link per node, stored in arrays.
+
+    Has the same constructor, comparison and indexing interface as LinkedList. Values are added to
+    either end. Access by index walks from the nearer end, and the list is reversed in O(1) time.
+
+    Args:
+        iterable: Optional iterable of arbitrary objects used to populate the list.
+        typecode (str): Optional array typecode for the values column, see the array module.
+
+    Attributes:
+        values (list or array): Values of the nodes.
+        links (array): XOR of the indices of the previous and the next node for every node.
+        head_index (int): Index of the first node of the list, -1 for empty list.
+        tail_index (int): Index of the last node of the list, -1 for empty list.
+
+    """
+
+    def __init__(self, iterable=None, typecode=None):
+        self.values = [] if typecode is None else array(typecode)
+        self.links = array('q')
+        self.head_index = -1
+        self.tail_index = -1
+        if iterable is not None:
+            self.extend(iterable)
+
+    @property
+    def typecode(self):
+        """
+        Typecode of the values column, None if the values are stored in a list.
+        """
+        return None if isinstance(self.values, list) else self.values.typecode
+
+    @property
+    def head(self):
+        """
+        First node of the list. None for empty list.
+        """
+        if self.head_index < 0:
+            return None
+        return XorListNode(self, self.head_index, -1)
+
+    @property
+    def tail(self):
+        """
+        Last node of the list. None for empty list.
+        """
+        if self.tail_index < 0:
+            return None
+        return XorListNode(self, self.tail_index, self.links[self.tail_index] ^ -1)
+
+    def append(self, value):
+        """
+        Add a value to the end of the list in O(1) time.
+        """
+        self._add(value, self.tail_index)
+        if self.head_index < 0:
+            self.head_index = self.tail_index
+
+    def appendleft(self, value):
+        """
+        Add a value to the beginning of the list in O(1) time.
+        """
+        self.head_index, self.tail_index = self.tail_index, self.head_index
+        self.append(value)
+        self.head_index, self.tail_index = self.tail_index, self.head_index
+
+    def _add(self, value, tail_index):
+        index = len(self.values)
+        self.values.append(value)
+        self.links.append(tail_index ^ -1)
+        if tail_index >= 0:
+            # Replace None (-1) with the new node in the link of the old tail.
+            self.links[tail_index] ^= -1 ^ index
+        self.tail_index = index
+
+    def extend(self, iterable):
+        """
+        Add values from an iterable to the end of the list.
+
+        Complexity: O(K) time, where K is the number of added values.
+
+        """
+        if iterable is self:
+            iterable = list(iterable)
+        for value in iterable:
+            self.append(value)
+
+    def reverse(self):
+        """
+        Reverse the list in O(1) time.
+        """
+        self.head_index, self.tail_index = self.tail_index, self.head_index
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return self._iter_from(self.head_index)
+
+    def __reversed__(self):
+        return self._iter_from(self.tail_index)
+
+    def _iter_from(self, index):
+        values = self.values
+        links = self.links
+        prev_index = -1
+        while index >= 0:
+            yield values[index]
+            prev_index, index = index, links[index] ^ prev_index
+
+    def __repr__(self):
+        if not self.values:
+            return '{}()'.format(type(self).__name__)
+        return '{}([{}])'.format(type(self).__name__, ', '.join(map(repr, self)))
+
+    def __eq__(self, other):
+        """
+        Test two lists for equality.
+
+        Lists are equal if they have the same length and values of their corresponding nodes are
+        equal. An XorLinkedList can be compared with a LinkedList.
+
+        """
+        if not isinstance(other, (XorLinkedList, LinkedList)):
+            return NotImplemented
+        missing = object()
+        for value1, value2 in zip_longest(self, other, fillvalue=missing):
+            if value1 is missing or value2 is missing or value1 != value2:
+                return False
+        return True
+
+    def __getitem__(self, key):
+        """
+        Get node by index or a copy of a slice of the list.
+
+        Complexity: O(min(K, N - K)) time for index K, O(N) time for a slice.
+
+        Returns:
+            XorListNode or XorLinkedList: Node for an integer key, new list for a slice.
+
+        Raises:
+            TypeError: If key is neither an integer nor a slice.
+            IndexError: If index is out of range or negative.
+
+        """
+        if isinstance(key, slice):
+            return type(self)(list(self)[key], self.typecode)
+
+        if not isinstance(key, int):
+            raise TypeError('linked list indices must be integers')
+
+        length = len(self)
+        if key < 0 or key >= length:
+            raise IndexError('linked list index out of range')
+
+        if key < length // 2:
+            node = self.head
+            for i in range(key):
+                node = node.next
+        else:
+            node = self.tail
+            for i in range(length - 1 - key):
+                node = node.prev
+        return node
+
+
+class TestXorLinkedList(unittest.TestCase):
+
+    def test_init(self):
+        self.assertEqual(XorLinkedList(), LinkedList())
+        self.assertEqual(LinkedList(), XorLinkedList())
+        self.assertEqual(XorLinkedList('abc'), LinkedList('abc'))
+        self.assertEqual(LinkedList('abc'), XorLinkedList('abc'))
+        self.assertNotEqual(XorLinkedList('abc'), XorLinkedList('ab'))
+        self.assertEqual(repr(XorLinkedList()), 'XorLinkedList()')
+        self.assertEqual(repr(XorLinkedList([1, 2])), 'XorLinkedList([1, 2])')
+
+        lst = XorLinkedList(range(5), typecode='q')
+        self.assertEqual(lst.typecode, 'q')
+        self.assertEqual(list(lst), [0, 1, 2, 3, 4])
+        lst.extend(lst)
+        self.assertEqual(len(lst), 10)
+
+    def test_append_and_reverse(self):
+        lst = XorLinkedList()
+        lst.append(2)
+        lst.appendleft(1)
+        lst.append(3)
+        lst.appendleft(0)
+        self.assertEqual(list(lst), [0, 1, 2, 3])
+        self.assertEqual(list(reversed(lst)), [3, 2, 1, 0])
+        lst.reverse()
+        self.assertEqual(list(lst), [3, 2, 1, 0])
+        lst.append(-1)
+        lst.appendleft(4)
+        self.assertEqual(list(lst), [4, 3, 2, 1, 0, -1])
+        self.assertEqual(lst.head.value, 4)
+        self.assertEqual(lst.tail.value, -1)
+
+    def test_nodes(self):
+        lst = XorLinkedList('abcd')
+        node = lst.head
+        self.assertIsNone(node.prev)
+        values = []
+        while node:
+            values.append(node.value)
+            last = node
+            node = node.next
+        self.assertEqual(values, list('abcd'))
+        self.assertEqual(last, lst.tail)
+        self.assertEqual(last.prev.prev, lst[1])
+        self.assertEqual(len({lst[1], lst.head.next, lst.tail.prev.prev}), 1)
+
+        lst[2].value = 'x'
+        self.assertEqual(lst, LinkedList('abxd'))
+        with self.assertRaises(AttributeError):
+            lst.head.next = None
+
+    def test_getitem(self):
+        for length in range(8):
+            lst = XorLinkedList(range(length))
+            for i in range(length):
+                self.assertEqual(lst[i].value, i)
+            self.assertRaises(IndexError, lst.__getitem__, length)
+            self.assertRaises(IndexError, lst.__getitem__, -1)
+            self.assertEqual(lst[1:6:2], LinkedList(range(1, min(length, 6), 2)))
+        self.assertRaises(TypeError, XorLinkedList('ab').__getitem__, 'a')
@@ -0,0 +1,621 @@
+"""
+Benchmarks for the stacks and queues from chapter 3.
+
+Run from the project directory::
+
+    python -m ch_03_stacks_and_queues.benchmarks [-n SIZE] [NAME ...]
+
+Each benchmark returns a table which is printed by main(). Helpers for measurements are shared
+with the chapter 2 benchmarks.
+
+"""
+import argparse
+from array import array
+import asyncio
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+import gc
+from math import gcd
+import operator
+import queue
+import random
+import threading
+import time
+import unittest
+
+from ch_02_linked_lists.benchmarks import measure_memory, measure_time, print_table
+from ch_10_sorting_and_searching.sorting import merge_sections, merge_sort, merge_sort_section
+
+from .concurrent_containers import AsyncQueue, ConcurrentQueue, ConcurrentStack
+from .pr_01_three_in_one import ElasticStackArray, StackArray, TypedStackArray
+from .pr_02_stack_min import MinMaxStack, MinStack
+from .pr_03_stack_of_plates import IndexedSetOfStacks, SetOfStacks
+from .pr_04_queue_via_stacks import (MyQueue, RealTimeQueue, sliding_window_aggregate,
+                                     sliding_window_extrema)
+from .pr_05_sort_stack import sort_stack_2
+from .queues import Queue, RingQueue
+from .stacks import ArrayStack, Stack
+from .work_stealing import WorkStealingPool
+
+
+def benchmark_stack(size):
+    """
+    Compare throughput and memory footprint of linked and array based stacks.
+    """
+    layouts = [
+        ('Stack', Stack),
+        ('ArrayStack', ArrayStack),
+        ("ArrayStack 'q'", lambda: ArrayStack('q')),
+    ]
+
+    def push_values(stack):
+        for i in range(size):
+            stack.push(i)
+        return stack
+
+    def pop_values(stack):
+        for i in range(size):
+            stack.pop()
+
+    def transfer(stack):
+        factory().push_many(stack.pop_many(size))
+
+    rows = []
+    for name, factory in layouts:
+        memory, stack = measure_memory(push_values, factory())
+        del stack
+        if hasattr(factory(), 'push_many'):
+            bulk = '{:.1f}'.format(2 * size / measure_time(transfer, push_values(factory())) / 1e6)
+        else:
+            bulk = 'n/a'
+        rows.append((
+            name,
+            '{:.1f}'.format(memory / size),
+            '{:.1f}'.format(size / measure_time(push_values, factory()) / 1e6),
+            '{:.1f}'.format(size / measure_time(pop_values, push_values(factory())) / 1e6),
+            bulk,
+        ))
+
+    return ('stack', 'bytes/value', 'push, M/s', 'pop, M/s', 'pop_many + push_many, M/s'), rows
+
+
+def benchmark_stack_array(size):
+    """
+    Compare fixed and elastic multi-stack arrays under skewed load.
+
+    Values are pushed to the stacks chosen with a Pareto distribution, so a few stacks get most
+    of the values. StackArray has to give every stack a section as large as the largest stack.
+    Utilization is the share of the array slots which hold values.
+    """
+    rows = []
+    for length in (3, 100, 1000):
+        rng = random.Random(length)
+        numbers = [min(int(rng.paretovariate(1.2)) - 1, length - 1) for i in range(size)]
+        largest = max(numbers.count(number) for number in set(numbers))
+        layouts = [
+            ('StackArray', lambda: StackArray(largest, length)),
+            ('ElasticStackArray', lambda: ElasticStackArray(length)),
+        ]
+
+        def push_values(stack_array):
+            for number in numbers:
+                stack_array[number].push(number)
+            return stack_array
+
+        def max_push_time(stack_array):
+            slowest = 0
+            for number in numbers:
+                start = time.perf_counter()
+                stack_array[number].push(number)
+                slowest = max(slowest, time.perf_counter() - start)
+            return slowest
+
+        for name, factory in layouts:
+            memory, stack_array = measure_memory(lambda: push_values(factory()))
+            slots = len(stack_array._lst)
+            del stack_array
+            rows.append((
+                length,
+                name,
+                '{:.1%}'.format(size / slots),
+                '{:.1f}'.format(memory / size),
+                '{:.2f}'.format(size / measure_time(push_values, factory()) / 1e6),
+                '{:.3f}'.format(max_push_time(factory()) * 1e3),
+            ))
+    return ('stacks', 'structure', 'utilization', 'bytes/value', 'push, M/s',
+            'slowest push, ms'), rows
+
+
+def benchmark_typed_stack_array(size):
+    """
+    Compare boxed and typed multi-stack arrays with 1000 stacks of floats.
+
+    Values come from a typed array, so every value stored in a StackArray is a separate float
+    object, as it is with numbers computed on the fly. The bulk methods are measured with stack
+    numbers in random order and grouped by stack.
+    """
+    length = 1000
+    rng = random.Random(0)
+    numbers = [rng.randrange(length) for i in range(size)]
+    values = array('d', (rng.random() for i in range(size)))
+    capacity = max(Counter(numbers).values())
+
+    def push_each(stack_array):
+        for number, value in zip(numbers, values):
+            stack_array[number].push(value)
+        return stack_array
+
+    def pop_each(stack_array):
+        for number in numbers:
+            stack_array[number].pop()
+
+    def push_many(stack_array):
+        stack_array.push_many(numbers, values)
+        return stack_array
+
+    def pop_many(stack_array):
+        stack_array.pop_many(numbers)
+
+    grouped_numbers = [number for number, count in sorted(Counter(numbers).items())
+                       for i in range(count)]
+
+    def push_many_grouped(stack_array):
+        stack_array.push_many(grouped_numbers, values)
+        return stack_array
+
+    def pop_many_grouped(stack_array):
+        stack_array.pop_many(grouped_numbers)
+
+    layouts = [
+        ('StackArray', lambda: StackArray(capacity, length), push_each, pop_each),
+        ('TypedStackArray', lambda: TypedStackArray(capacity, length, 'd'), push_each, pop_each),
+        ('TypedStackArray, push_many/pop_many', lambda: TypedStackArray(capacity, length, 'd'),
+         push_many, pop_many),
+        ('TypedStackArray, push_many/pop_many grouped by stack',
+         lambda: TypedStackArray(capacity, length, 'd'), push_many_grouped, pop_many_grouped),
+    ]
+    rows = []
+    for name, factory, push, pop in layouts:
+        memory, stack_array = measure_memory(lambda: push(factory()))
+        del stack_array
+        rows.append((
+            name,
+            '{:.1f}'.format(memory / size),
+            '{:.2f}'.format(size / measure_time(push, factory()) / 1e6),
+            '{:.2f}'.format(size / measure_time(pop, push(factory())) / 1e6),
+        ))
+    return ('structure', 'bytes/value', 'push, M/s', 'pop, M/s'), rows
+
+
+def benchmark_stack_of_plates(size):
+    """
+    Compare pop_at() of SetOfStacks and IndexedSetOfStacks.
+
+    Sets of 10-plate sub-stacks hold size plates, then up to 1000 plates are popped from random
+    sub-stacks, and every plate is read with as_tuples().
+    """
+    capacity = 10
+    pops = min(1000, size // 2)
+    rng = random.Random(0)
+    indices = [rng.randrange(max(1, (size - pops) // capacity)) for i in range(pops)]
+
+    def push_values(stacks):
+        for i in range(size):
+            stacks.push(i)
+        return stacks
+
+    def pop_at(stacks):
+        for index in indices:
+            stacks.pop_at(index)
+
+    rows = []
+    for name, factory in (('SetOfStacks', SetOfStacks), ('IndexedSetOfStacks', IndexedSetOfStacks)):
+        stacks = push_values(factory(capacity))
+        rows.append((
+            name,
+            '{:.2f}'.format(size / measure_time(push_values, factory(capacity)) / 1e6),
+            '{:.1f}'.format(measure_time(pop_at, stacks) / pops * 1e6),
+            '{:.3f}'.format(measure_time(stacks.as_tuples)),
+        ))
+    return ('stacks', 'push, M/s', 'pop_at, us', 'as_tuples, s'), rows
+
+
+def benchmark_min_stack(size):
+    """
+    Compare memory footprint of MinStack and MinMaxStack holding random values.
+    """
+    values = [random.random() for i in range(size)]
+
+    def push_values(stack):
+        for value in values:
+            stack.push(value)
+        return stack
+
+    rows = []
+    for name, factory in (('Stack', Stack), ('MinStack', MinStack), ('MinMaxStack', MinMaxStack)):
+        memory, stack = measure_memory(push_values, factory())
+        extrema = len(stack._mins) + len(stack._maxes) if isinstance(stack, MinMaxStack) else 'n/a'
+        del stack
+        rows.append((name, '{:.1f}'.format(memory / size), extrema,
+                     '{:.2f}'.format(size / measure_time(push_values, factory()) / 1e6)))
+    return ('stack', 'bytes/value', 'extrema entries', 'push, M/s'), rows
+
+
+def benchmark_sliding_window(size):
+    """
+    Compare sliding_window_extrema() with calling min() and max() for every window.
+    """
+    values = [random.random() for i in range(size)]
+
+    def naive(k):
+        window = deque(maxlen=k)
+        for value in values:
+            window.append(value)
+            if len(window) == k:
+                min(window), max(window)
+
+    def with_queue(k):
+        for extrema in sliding_window_extrema(values, k):
+            pass
+
+    rows = []
+    for k in (10, 100, 1000):
+        for name, run in (('min(window), max(window)', naive),
+                          ('sliding_window_extrema', with_queue)):
+            rows.append((k, name, '{:.2f}'.format(size / measure_time(run, k) / 1e6)))
+    return ('window', 'method', 'M values/s'), rows
+
+
+def benchmark_aggregate(size):
+    """
+    Compare sliding_window_aggregate() with reducing every window of 100 values.
+
+    The naive reduction is quadratic in the window size, so it runs on size // 100 values.
+    Matrix product of 2x2 matrices modulo 2 ** 61 - 1 is an example of a non-commutative
+    operation.
+    """
+    k = 100
+    modulus = (1 << 61) - 1
+
+    def matrix_product(a, b):
+        return ((a[0] * b[0] + a[1] * b[2]) % modulus, (a[0] * b[1] + a[1] * b[3]) % modulus,
+                (a[2] * b[0] + a[3] * b[2]) % modulus, (a[2] * b[1] + a[3] * b[3]) % modulus)
+
+    numbers = [random.randrange(1, 1 << 30) for i in range(size)]
+    matrices = [(number, 1, 1, 0) for number in numbers[:size // 10]]
+    aggregates = [
+        ('sum', operator.add, 0, numbers),
+        ('gcd', gcd, 0, numbers),
+        ('bitwise or', operator.or_, 0, numbers),
+        ('max', max, 0, numbers),
+        ('2x2 matrix product', matrix_product, (1, 0, 0, 1), matrices),
+    ]
+
+    def naive(values, op, identity):
+        window = deque(maxlen=k)
+        for value in values:
+            window.append(value)
+            if len(window) == k:
+                reduce(op, window, identity)
+
+    def with_queue(values, op, identity):
+        for aggregate in sliding_window_aggregate(values, k, op, identity):
+            pass
+
+    rows = []
+    for name, op, identity, values in aggregates:
+        naive_values = values[:max(k, len(values) // 100)]
+        rows.append((
+            name,
+            '{:.2f}'.format(len(naive_values) / measure_time(naive, naive_values, op, identity)
+                            / 1e6),
+            '{:.2f}'.format(len(values) / measure_time(with_queue, values, op, identity) / 1e6),
+        ))
+    return ('aggregate', 'reduce(window), M values/s', 'AggregateQueue, M values/s'), rows
+
+
+def benchmark_sort_stack(size):
+    """
+    Compare sort_stack_2() on linked and array based stacks. The sort is quadratic, so the size
+    is divided by 10000.
+    """
+    values = [random.random() for i in range(max(2, size // 10000))]
+    rows = []
+    for name, factory in (('Stack', Stack), ('ArrayStack', ArrayStack)):
+        stack = factory()
+        for value in values:
+            stack.push(value)
+        rows.append((name, len(values), '{:.3f}'.format(measure_time(sort_stack_2, stack))))
+    return ('stack', 'values', 'sort_stack_2, s'), rows
+
+
+def benchmark_queue(size):
+    """
+    Compare linked and ring buffer queues with collections.deque in a producer/consumer pattern.
+
+    Values are added and removed in batches of 100, one by one and with the batch operations.
+    """
+    batch = 100
+
+    def one_by_one(add, remove):
+        values = range(batch)
+        for i in range(size // batch):
+            for value in values:
+                add(value)
+            for value in values:
+                remove()
+
+    def batched(queue):
+        values = range(batch)
+        for i in range(size // batch):
+            queue.add_many(values)
+            queue.remove_many(batch)
+
+    def deque_batched(queue):
+        values = range(batch)
+        popleft = queue.popleft
+        for i in range(size // batch):
+            queue.extend(values)
+            [popleft() for value in values]
+
+    layouts = [
+        ('Queue', Queue, lambda queue: one_by_one(queue.add, queue.remove)),
+        ('RingQueue', RingQueue, lambda queue: one_by_one(queue.add, queue.remove)),
+        ('RingQueue, capacity', lambda: RingQueue(batch),
+         lambda queue: one_by_one(queue.add, queue.remove)),
+        ('RingQueue, add_many/remove_many', RingQueue, batched),
+        ('deque', deque, lambda queue: one_by_one(queue.append, queue.popleft)),
+        ('deque, extend/popleft', deque, deque_batched),
+    ]
+    rows = []
+    for name, factory, run in layouts:
+        operations = 2 * (size // batch) * batch
+        rows.append((name, '{:.1f}'.format(operations / measure_time(run, factory()) / 1e6)))
+    return ('queue', 'M operations/s'), rows
+
+
+def benchmark_queue_latency(size):
+    """
+    Measure latency percentiles of remove() for queues made of two stacks.
+
+    A queue of a given length gets size operations, alternately adding and removing a value, so
+    the head stack of MyQueue empties and is refilled from the tail once per length removals.
+    Garbage collector is disabled during the measurement.
+    """
+    class LinkedMyQueue(MyQueue):
+        stack_class = Stack
+
+    queues = [
+        ('MyQueue, Stack', LinkedMyQueue, 'add', 'remove'),
+        ('MyQueue, ArrayStack', MyQueue, 'add', 'remove'),
+        ('RealTimeQueue', RealTimeQueue, 'add', 'remove'),
+        ('deque', deque, 'append', 'popleft'),
+    ]
+    timer = time.perf_counter_ns
+
+    def latencies(add, remove, length):
+        for i in range(length):
+            add(i)
+        result = []
+        gc.disable()
+        try:
+            for i in range(size // 2):
+                add(i)
+                start = timer()
+                remove()
+                result.append(timer() - start)
+        finally:
+            gc.enable()
+        return result
+
+    rows = []
+    for length in (1000, 100000):
+        for name, factory, add, remove in queues:
+            container = factory()
+            times = sorted(latencies(getattr(container, add), getattr(container, remove), length))
+            rows.append((length, name) + tuple(
+                '{:.2f}'.format(times[min(len(times) - 1, int(len(times) * quantile))] / 1e3)
+                for quantile in (0.5, 0.99, 0.999, 1)
+            ))
+    return ('length', 'queue', 'p50, us', 'p99, us', 'p999, us', 'max, us'), rows
+
+
+class LockedQueue(Queue):
+    """
+    Queue with a single lock around every call, the baseline for ConcurrentQueue.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+
+    def add(self, value):
+        with self._lock:
+            super().add(value)
+
+    def remove(self):
+        with self._lock:
+            return super().remove()
+
+
+def benchmark_contention(size):
+    """
+    Measure throughput of thread-safe containers shared by 1 to 32 threads.
+
+    Every thread adds a value and removes a value in a loop, so containers stay short and
+    threads contend for them all the time.
+    """
+    def run_threads(container, add, remove, threads):
+        operations = size // threads
+
+        def work():
+            for i in range(operations):
+                add(i)
+                remove()
+
+        workers = [threading.Thread(target=work) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    containers = [
+        ('Queue with a lock', LockedQueue, 'add', 'remove'),
+        ('ConcurrentQueue', ConcurrentQueue, 'add', 'remove'),
+        ('ConcurrentStack', ConcurrentStack, 'push', 'pop'),
+        ('queue.Queue', queue.Queue, 'put', 'get'),
+        ('queue.SimpleQueue', queue.SimpleQueue, 'put', 'get'),
+    ]
+    rows = []
+    for threads in (1, 2, 4, 8, 16, 32):
+        for name, factory, add, remove in containers:
+            container = factory()
+            seconds = measure_time(run_threads, container, getattr(container, add),
+                                   getattr(container, remove), threads)
+            rows.append((threads, name, '{:.2f}'.format(2 * size / seconds / 1e6)))
+    return ('threads', 'container', 'M operations/s'), rows
+
+
+def benchmark_fan_in(size):
+    """
+    Measure asyncio fan-in: many producer tasks add values, one consumer task removes them.
+    """
+    async def fan_in(container, add, remove, producers):
+        values = size // producers
+
+        async def produce():
+            for i in range(values):
+                add(i)
+                if i % 100 == 0:
+                    await asyncio.sleep(0)
+
+        tasks = [asyncio.create_task(produce()) for i in range(producers)]
+        for i in range(values * producers):
+            await remove()
+        await asyncio.gather(*tasks)
+
+    containers = [
+        ('AsyncQueue', AsyncQueue, 'add', 'remove'),
+        ('asyncio.Queue', asyncio.Queue, 'put_nowait', 'get'),
+    ]
+    rows = []
+    for producers in (1, 10, 100):
+        for name, factory, add, remove in containers:
+            def run():
+                async def main():
+                    container = factory()
+                    await fan_in(container, getattr(container, add), getattr(container, remove),
+                                 producers)
+                asyncio.run(main())
+            rows.append((producers, name, '{:.2f}'.format(size / measure_time(run) / 1e6)))
+    return ('producers', 'container', 'M values/s'), rows
+
+
+def benchmark_work_stealing(size):
+    """
+    Run merge sort as recursive tasks on a WorkStealingPool.
+
+    A task sorting more than 1/64 of the list submits a task for the left half, sorts the right
+    half itself, waits for the left half and merges. The baseline is a ThreadPoolExecutor, which
+    is fed by a queue.SimpleQueue: its tasks cannot wait for subtasks, so it sorts 64 chunks and
+    the calling thread merges them.
+    """
+    values = [random.random() for i in range(size)]
+    cutoff = max(1, size // 64)
+
+    def sequential():
+        merge_sort(values.copy())
+
+    def work_stealing(workers):
+        lst = values.copy()
+        buffer = lst.copy()
+
+        def sort(pool, start, end):
+            if end - start < cutoff:
+                merge_sort_section(lst, start, end, buffer)
+                return
+            middle = (start + end) // 2
+            left = pool.submit(sort, pool, start, middle)
+            sort(pool, middle + 1, end)
+            left.result()
+            merge_sections(lst, start, middle, end, buffer)
+
+        with WorkStealingPool(workers) as pool:
+            pool.submit(sort, pool, 0, len(lst) - 1).result()
+        return pool.steals
+
+    def executor(workers):
+        lst = values.copy()
+        buffer = lst.copy()
+        bounds = [len(lst) * i // 64 for i in range(65)]
+        with ThreadPoolExecutor(workers) as pool:
+            list(pool.map(lambda i: merge_sort_section(lst, bounds[i], bounds[i + 1] - 1, buffer),
+                          range(64)))
+        width = 1
+        while width < 64:
+            for i in range(0, 64 - width, 2 * width):
+                merge_sections(lst, bounds[i], bounds[i + width] - 1,
+                               bounds[min(i + 2 * width, 64)] - 1, buffer)
+            width *= 2
+
+    rows = [('merge_sort', 1, '{:.3f}'.format(measure_time(sequential)), 'n/a')]
+    for workers in (1, 2, 4, 8):
+        steals = []
+        seconds = measure_time(lambda: steals.append(work_stealing(workers)))
+        rows.append(('WorkStealingPool', workers, '{:.3f}'.format(seconds), steals[0]))
+        rows.append(('ThreadPoolExecutor', workers,
+                     '{:.3f}'.format(measure_time(executor, workers)), 'n/a'))
+    return ('scheduler', 'workers', 'merge sort, s', 'steals'), rows
+
+
+BENCHMARKS = {
+    'aggregate': (benchmark_aggregate, 10000000),
+    'contention': (benchmark_contention, 1000000),
+    'fan_in': (benchmark_fan_in, 1000000),
+    'min_stack': (benchmark_min_stack, 1000000),
+    'queue': (benchmark_queue, 10000000),
+    'queue_latency': (benchmark_queue_latency, 1000000),
+    'sliding_window': (benchmark_sliding_window, 1000000),
+    'sort_stack': (benchmark_sort_stack, 10000000),
+    'stack': (benchmark_stack, 10000000),
+    'stack_array': (benchmark_stack_array, 1000000),
+    'stack_of_plates': (benchmark_stack_of_plates, 1000000),
+    'typed_stack_array': (benchmark_typed_stack_array, 1000000),
+    'work_stealing': (benchmark_work_stealing, 200000),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run chapter 3 benchmarks.')
+    parser.add_argument('names', nargs='*', metavar='NAME',
+                        help='benchmarks to run, all by default: ' + ', '.join(sorted(BENCHMARKS)))
+    parser.add_argument('-n', '--size', type=int, help='problem size')
+    args = parser.parse_args(argv)
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error('unknown benchmark: {}'.format(name))
+
+    for name in args.names or sorted(BENCHMARKS):
+        benchmark, default_size = BENCHMARKS[name]
+        size = args.size or default_size
+        header, rows = benchmark(size)
+        print_table('{} (size={})'.format(name, size), header, rows)
+
+
+class TestBenchmarks(unittest.TestCase):
+    """
+    Run all the benchmarks on tiny inputs to make sure they keep working.
+    """
+
+    def test_benchmarks(self):
+        for name, (benchmark, default_size) in BENCHMARKS.items():
+            with self.subTest(name=name):
+                header, rows = benchmark(100)
+                self.assertTrue(rows)
+                for row in rows:
+                    self.assertEqual(len(row), len(header))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,507 @@
+"""
+Thread-safe and asyncio-aware stacks and queues.
+
+ConcurrentStack and ConcurrentQueue can be shared between threads. The stack is guarded by a single
+lock. The queue is the two-lock queue of Michael and Scott: producers take only the rear lock and
+consumers take only the front lock, so adding and removing don't block each other.
+
+AsyncStack and AsyncQueue are for coroutines running in one event loop. Their pop() and remove()
+are awaitable and wait for a value instead of raising an exception. A value added while some
+coroutines are waiting is handed to the first waiting one directly.
+
+"""
+import asyncio
+from collections import deque
+import threading
+import unittest
+
+from .queues import EmptyQueueError, FullQueueError, QueueItem
+from .stacks import ArrayStack, EmptyStackError, Stack
+
+
+class ConcurrentStack(Stack):
+    """
+    Thread-safe stack based on linked list.
+
+    pop() and peek() raise EmptyStackError for an empty stack unless asked to wait.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._not_empty = threading.Condition(threading.Lock())
+
+    def push(self, value):
+        """
+        Push value to the stack.
+        """
+        with self._not_empty:
+            super().push(value)
+            self._not_empty.notify()
+
+    def pop(self, block=False, timeout=None):
+        """
+        Remove top item from the stack and return its value.
+
+        Args:
+            block (bool): Wait for a value if the stack is empty.
+            timeout (float): Maximal time to wait in seconds, None to wait forever.
+
+        Raises:
+            EmptyStackError: If stack is empty and block is False, or timeout has expired.
+
+        """
+        with self._not_empty:
+            if block and not self._not_empty.wait_for(self._has_items, timeout):
+                raise EmptyStackError
+            return super().pop()
+
+    def _has_items(self):
+        return self._top is not None
+
+    def peek(self):
+        with self._not_empty:
+            return super().peek()
+
+
+class ConcurrentQueue:
+    """
+    Thread-safe queue based on linked list, with separate locks for the front and the rear.
+
+    The list always starts with a dummy item, the front of the queue is the item after it. Adding
+    links a new item after the rear, removing makes the first item the new dummy. So producers and
+    consumers never change the same item, and the only state they share is the size of the queue,
+    which is guarded by a third lock held for a few instructions.
+
+    Threads waiting in add() and remove() are counted, so the other side takes the opposite lock to
+    wake them up only if somebody waits.
+
+    A bounded queue raises FullQueueError or waits when it is full.
+
+    Args:
+        capacity (int): Maximal number of items in the queue, None for unbounded queue.
+
+    Raises:
+        ValueError: If capacity is not positive.
+
+    """
+
+    def __init__(self, capacity=None):
+        if capacity is not None and capacity < 1:
+            raise ValueError('capacity must be positive')
+        self._capacity = capacity
+        self._front = self._rear = QueueItem(None)
+        self._size = 0
+        self._size_lock = threading.Lock()
+        self._not_full = threading.Condition(threading.Lock())
+        self._not_empty = threading.Condition(threading.Lock())
+        self._waiting_producers = 0
+        self._waiting_consumers = 0
+
+    @property
+    def capacity(self):
+        """
+        Maximal number of items in the queue, None for unbounded queue.
+        """
+        return self._capacity
+
+    def add(self, value, block=False, timeout=None):
+        """
+        Add item to the end of the queue.
+
+        Args:
+            value: Value to add.
+            block (bool): Wait for a free place if bounded queue is full.
+            timeout (float): Maximal time to wait in seconds, None to wait forever.
+
+        Raises:
+            FullQueueError: If bounded queue is full and block is False, or timeout has expired.
+
+        """
+        item = QueueItem(value)
+        with self._not_full:
+            if self._capacity is not None and self._size >= self._capacity:
+                if not block:
+                    raise FullQueueError
+                # The counter is increased before the size is checked again by wait_for(), so a
+                # consumer either sees the counter or this thread sees the decreased size.
+                self._waiting_producers += 1
+                try:
+                    has_room = self._not_full.wait_for(self._has_room, timeout)
+                finally:
+                    self._waiting_producers -= 1
+                if not has_room:
+                    raise FullQueueError
+            self._rear.next = item
+            self._rear = item
+            with self._size_lock:
+                size = self._size
+                self._size += 1
+            if self._waiting_producers and size + 1 < self._capacity:
+                self._not_full.notify()
+        if size == 0 and self._waiting_consumers:
+            with self._not_empty:
+                self._not_empty.notify()
+
+    def remove(self, block=False, timeout=None):
+        """
+        Remove the first item from the front of the queue and return its value.
+
+        Args:
+            block (bool): Wait for a value if the queue is empty.
+            timeout (float): Maximal time to wait in seconds, None to wait forever.
+
+        Raises:
+            EmptyQueueError: If queue is empty and block is False, or timeout has expired.
+
+        """
+        with self._not_empty:
+            if not self._size:
+                if not block:
+                    raise EmptyQueueError
+                self._waiting_consumers += 1
+                try:
+                    has_items = self._not_empty.wait_for(self._has_items, timeout)
+                finally:
+                    self._waiting_consumers -= 1
+                if not has_items:
+                    raise EmptyQueueError
+            first = self._front.next
+            value = first.value
+            first.value = None
+            self._front = first
+            with self._size_lock:
+                size = self._size
+                self._size -= 1
+            if self._waiting_consumers and size > 1:
+                self._not_empty.notify()
+        if size == self._capacity and self._waiting_producers:
+            with self._not_full:
+                self._not_full.notify()
+        return value
+
+    def _has_room(self):
+        return self._size < self._capacity
+
+    def _has_items(self):
+        return self._size > 0
+
+    def peek(self):
+        """
+        Get the value of the front item without removing it.
+
+        Raises:
+            EmptyQueueError: If queue is empty.
+
+        """
+        with self._not_empty:
+            if not self._size:
+                raise EmptyQueueError
+            return self._front.next.value
+
+    def is_empty(self):
+        """
+        Return True if queue is empty, False otherwise.
+        """
+        return not self._size
+
+    def __len__(self):
+        return self._size
+
+
+class AsyncQueue:
+    """
+    Queue for coroutines of one event loop, remove() waits while the queue is empty.
+    """
+
+    def __init__(self):
+        self._items = deque()
+        self._waiters = deque()
+
+    def add(self, value):
+        """
+        Add item to the end of the queue, or hand it to the first coroutine waiting in remove().
+        """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(value)
+                return
+        self._items.append(value)
+
+    async def remove(self):
+        """
+        Remove the first item from the front of the queue and return its value.
+
+        Waits until a value is added if the queue is empty.
+
+        """
+        if self._items:
+            return self._items.popleft()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The value was handed over, but the task was cancelled before it was resumed.
+                self._return(waiter.result())
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def _return(self, value):
+        self._items.appendleft(value)
+        self._wake_up()
+
+    def _wake_up(self):
+        while self._items and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(self._items.popleft())
+
+    def peek(self):
+        """
+        Get the value of the front item without removing it.
+
+        Raises:
+            EmptyQueueError: If queue is empty.
+
+        """
+        if not self._items:
+            raise EmptyQueueError
+        return self._items[0]
+
+    def is_empty(self):
+        """
+        Return True if queue is empty, False otherwise.
+        """
+        return not self._items
+
+    def __len__(self):
+        return len(self._items)
+
+
+class AsyncStack:
+    """
+    Stack for coroutines of one event loop, pop() waits while the stack is empty.
+    """
+
+    def __init__(self):
+        self._items = ArrayStack()
+        self._waiters = deque()
+
+    def push(self, value):
+        """
+        Push value to the stack, or hand it to the first coroutine waiting in pop().
+        """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(value)
+                return
+        self._items.push(value)
+
+    async def pop(self):
+        """
+        Remove top item from the stack and return its value.
+
+        Waits until a value is pushed if the stack is empty.
+
+        """
+        if not self._items.is_empty():
+            return self._items.pop()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The value was handed over, but the task was cancelled before it was resumed.
+                self.push(waiter.result())
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def peek(self):
+        """
+        Get the value of top item without removing it.
+
+        Raises:
+            EmptyStackError: If stack is empty.
+
+        """
+        return self._items.peek()
+
+    def is_empty(self):
+        """
+        Return True if stack is empty, False otherwise.
+        """
+        return self._items.is_empty()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class TestConcurrentStack(unittest.TestCase):
+
+    def test_stack(self):
+        stack = ConcurrentStack()
+        self.assertTrue(stack.is_empty())
+        self.assertRaises(EmptyStackError, stack.pop)
+        self.assertRaises(EmptyStackError, stack.peek)
+        self.assertRaises(EmptyStackError, stack.pop, block=True, timeout=0.01)
+        stack.push(1)
+        stack.push(2)
+        self.assertEqual(stack.peek(), 2)
+        self.assertEqual(stack.pop(), 2)
+        self.assertEqual(stack.pop(block=True), 1)
+
+    def test_threads(self):
+        stack = ConcurrentStack()
+        results = []
+
+        def consume():
+            results.extend(stack.pop(block=True, timeout=10) for i in range(1000))
+
+        def produce(start):
+            for i in range(start, start + 1000):
+                stack.push(i)
+
+        threads = [threading.Thread(target=consume) for i in range(4)]
+        threads += [threading.Thread(target=produce, args=(i * 1000,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(results), list(range(4000)))
+        self.assertTrue(stack.is_empty())
+
+
+class TestConcurrentQueue(unittest.TestCase):
+
+    def test_queue(self):
+        queue = ConcurrentQueue()
+        self.assertIsNone(queue.capacity)
+        self.assertTrue(queue.is_empty())
+        self.assertRaises(EmptyQueueError, queue.remove)
+        self.assertRaises(EmptyQueueError, queue.peek)
+        self.assertRaises(EmptyQueueError, queue.remove, block=True, timeout=0.01)
+        for i in range(5):
+            queue.add(i)
+        self.assertEqual(len(queue), 5)
+        self.assertEqual(queue.peek(), 0)
+        self.assertEqual([queue.remove() for i in range(5)], list(range(5)))
+        self.assertTrue(queue.is_empty())
+
+    def test_capacity(self):
+        self.assertRaises(ValueError, ConcurrentQueue, 0)
+        queue = ConcurrentQueue(capacity=2)
+        queue.add(1)
+        queue.add(2)
+        self.assertRaises(FullQueueError, queue.add, 3)
+        self.assertRaises(FullQueueError, queue.add, 3, block=True, timeout=0.01)
+        timer = threading.Timer(0.01, queue.remove)
+        timer.start()
+        queue.add(3, block=True, timeout=10)
+        timer.join()
+        self.assertEqual([queue.remove(), queue.remove()], [2, 3])
+
+    def test_threads(self):
+        for capacity in (None, 1, 10):
+            queue = ConcurrentQueue(capacity)
+            results = [[] for i in range(4)]
+
+            def consume(result):
+                result.extend(queue.remove(block=True, timeout=10) for i in range(1000))
+
+            def produce(producer):
+                for i in range(1000):
+                    queue.add((producer, i), block=True, timeout=10)
+
+            threads = [threading.Thread(target=consume, args=(result,)) for result in results]
+            threads += [threading.Thread(target=produce, args=(i,)) for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertTrue(queue.is_empty())
+            self.assertEqual(sum(len(result) for result in results), 4000)
+            for result in results:
+                for producer in range(4):
+                    values = [i for p, i in result if p == producer]
+                    self.assertEqual(values, sorted(values))
+
+
+class TestAsyncContainers(unittest.TestCase):
+
+    def test_async_queue(self):
+        async def run():
+            queue = AsyncQueue()
+            queue.add(1)
+            self.assertEqual(queue.peek(), 1)
+            self.assertEqual(await queue.remove(), 1)
+            self.assertTrue(queue.is_empty())
+            self.assertRaises(EmptyQueueError, queue.peek)
+
+            consumers = [asyncio.create_task(queue.remove()) for i in range(3)]
+            await asyncio.sleep(0)
+            for i in range(5):
+                queue.add(i)
+            self.assertEqual(await asyncio.gather(*consumers), [0, 1, 2])
+            self.assertEqual(len(queue), 2)
+            self.assertEqual([await queue.remove(), await queue.remove()], [3, 4])
+
+        asyncio.run(run())
+
+    def test_async_stack(self):
+        async def run():
+            stack = AsyncStack()
+            stack.push(1)
+            stack.push(2)
+            self.assertEqual(stack.peek(), 2)
+            self.assertEqual(await stack.pop(), 2)
+            self.assertEqual(await stack.pop(), 1)
+            self.assertTrue(stack.is_empty())
+            self.assertRaises(EmptyStackError, stack.peek)
+
+            consumers = [asyncio.create_task(stack.pop()) for i in range(2)]
+            await asyncio.sleep(0)
+            for i in range(4):
+                stack.push(i)
+            self.assertEqual(await asyncio.gather(*consumers), [0, 1])
+            self.assertEqual(len(stack), 2)
+            self.assertEqual(await stack.pop(), 3)
+
+        asyncio.run(run())
+
+    def test_cancellation(self):
+        async def run():
+            queue = AsyncQueue()
+            stack = AsyncStack()
+
+            # Cancelled while waiting.
+            waiting = [asyncio.create_task(queue.remove()), asyncio.create_task(stack.pop())]
+            await asyncio.sleep(0)
+            for task in waiting:
+                task.cancel()
+            await asyncio.gather(*waiting, return_exceptions=True)
+            queue.add(1)
+            stack.push(1)
+            self.assertEqual((len(queue), len(stack)), (1, 1))
+            self.assertEqual(await queue.remove(), 1)
+            self.assertEqual(await stack.pop(), 1)
+
+            # Cancelled after a value was handed over, the value must not be lost.
+            waiting = [asyncio.create_task(queue.remove()), asyncio.create_task(stack.pop())]
+            await asyncio.sleep(0)
+            queue.add(2)
+            stack.push(2)
+            queue.add(3)
+            for task in waiting:
+                task.cancel()
+            await asyncio.gather(*waiting, return_exceptions=True)
+            self.assertEqual([await queue.remove(), await queue.remove()], [2, 3])
+            self.assertEqual(await stack.pop(), 2)
+
+        asyncio.run(run())
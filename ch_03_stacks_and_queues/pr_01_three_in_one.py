@@ -3,7 +3,15 @@ Three in one
 
 Describe how you could use a single array to implement three stacks.
 
+StackArray gives every stack a fixed section of the array. ElasticStackArray lets the stacks
+share free space: a stack which runs out of room triggers a relayout which moves the boundaries,
+and the array grows when the stacks fill most of it. TypedStackArray keeps numbers unboxed in a
+typed array and pushes to or pops from many stacks in one call.
+
 """
+from array import array
+from collections import Counter
+import random
 import unittest
 from .stacks import EmptyStackError, StackOverflowError
 
@@ -89,6 +97,441 @@ class StackArray:
         return self._length
 
 
+class ElasticStackItem:
+    """
+    Stack which occupies a movable section of the array of an ElasticStackArray.
+
+    This class is not supposed to be used by itself but as a part of an ElasticStackArray.
+
+    Args:
+        stack_array (ElasticStackArray): Owner of the array.
+        start (int): Start of the section occupied by the stack.
+        end (int): End of the section, exclusive.
+
+    """
+
+    def __init__(self, stack_array, start, end):
+        self._stack_array = stack_array
+        self._start = start
+        self._end = end
+        self._size = 0
+
+    def push(self, value):
+        """
+        Push value to the stack, moving the section boundaries if the section is full.
+
+        Complexity: O(1) amortized time for most of the workloads, O(N) when the array is laid out
+        again, where N is the size of the array.
+
+        """
+        top = self._start + self._size
+        if top == self._end:
+            self._stack_array._relayout(self)
+            top = self._start + self._size
+        self._stack_array._lst[top] = value
+        self._size += 1
+
+    def pop(self):
+        if not self._size:
+            raise EmptyStackError
+        self._size -= 1
+        lst = self._stack_array._lst
+        top = self._start + self._size
+        value = lst[top]
+        lst[top] = None
+        return value
+
+    def peek(self):
+        if not self._size:
+            raise EmptyStackError
+        return self._stack_array._lst[self._start + self._size - 1]
+
+    def is_empty(self):
+        return not self._size
+
+    def __len__(self):
+        return self._size
+
+
+class ElasticStackArray:
+    """
+    Data structure which uses a single list to store multiple stacks with shared free space.
+
+    Stacks occupy adjacent sections of the list. When a stack fills its section, all the sections
+    are laid out again: every stack gets an equal share of 10% of the free space and a share of
+    the rest proportional to its size, so growing stacks get more room, but at least one slot. If
+    the stacks and their minimal slack take more than 3/4 of the list, the list is doubled first.
+    Stacks never overflow, and the list grows to fewer than 3 slots per stored value and stack.
+
+    Args:
+        length (int): Number of stacks in ElasticStackArray.
+        capacity (int): Initial size of the list, at least one slot per stack.
+
+    """
+    MAX_LOAD = 0.75
+    EVEN_SHARE = 0.1
+
+    def __init__(self, length=3, capacity=None):
+        capacity = max(length, capacity or 0)
+        self._length = length
+        self._lst = [None] * capacity
+        self._stacks = []
+        for i in range(length):
+            self._stacks.append(
+                ElasticStackItem(self, i * capacity // length, (i + 1) * capacity // length)
+            )
+
+    @property
+    def capacity(self):
+        """
+        Current size of the list shared by the stacks.
+        """
+        return len(self._lst)
+
+    def size(self):
+        """
+        Return the total number of values in all the stacks.
+        """
+        return sum(stack._size for stack in self._stacks)
+
+    def _relayout(self, full_stack):
+        """
+        Move the sections so that full_stack has room for one more value, growing the list if
+        needed.
+
+        Complexity: O(N) time, where N is the size of the list.
+
+        """
+        # The full stack is counted with the value being pushed.
+        sizes = [stack._size for stack in self._stacks]
+        used = sum(sizes) + 1
+        capacity = len(self._lst)
+        while used + self._length > capacity * self.MAX_LOAD:
+            capacity *= 2
+
+        free = capacity - used
+        even_share = max(1, int(free * self.EVEN_SHARE) // self._length)
+        proportional_free = free - even_share * self._length
+
+        old_lst = self._lst
+        lst = [None] * capacity
+        start = 0
+        for stack, size in zip(self._stacks, sizes):
+            end = start + size
+            lst[start:end] = old_lst[stack._start:stack._start + size]
+            if stack is full_stack:
+                end += 1
+            slack = even_share + proportional_free * (size + (stack is full_stack)) // used
+            stack._start = start
+            stack._end = start = end + slack
+        # Rounding down leaves a few slots, the last stack gets them.
+        self._stacks[-1]._end = capacity
+        self._lst = lst
+
+    def __getitem__(self, key):
+        return self._stacks[key]
+
+    def __len__(self):
+        return self._length
+
+
+class TypedStackArrayItem:
+    """
+    Stack which occupies a fixed section of the typed array of a TypedStackArray.
+
+    This class is not supposed to be used by itself but as a part of a TypedStackArray.
+
+    Args:
+        stack_array (TypedStackArray): Owner of the array.
+        number (int): Number of the stack in the TypedStackArray.
+
+    """
+
+    def __init__(self, stack_array, number):
+        self._stack_array = stack_array
+        self._number = number
+        self._values = stack_array._values
+        self._tops = stack_array._tops
+        self._min_index = number * stack_array.capacity
+        self._max_index = self._min_index + stack_array.capacity
+
+    def push(self, value):
+        top = self._tops[self._number]
+        if top == self._max_index:
+            raise StackOverflowError
+        self._values[top] = value
+        self._tops[self._number] = top + 1
+
+    def push_many(self, values):
+        """
+        Push values from an iterable to the stack, the last one ends up on the top.
+
+        Raises:
+            StackOverflowError: If the values don't fit into the section. The stack is not changed
+                then.
+
+        """
+        values = array(self._values.typecode, values)
+        top = self._tops[self._number]
+        if top + len(values) > self._max_index:
+            raise StackOverflowError
+        self._values[top:top + len(values)] = values
+        self._tops[self._number] = top + len(values)
+
+    def pop(self):
+        top = self._tops[self._number]
+        if top == self._min_index:
+            raise EmptyStackError
+        top -= 1
+        self._tops[self._number] = top
+        return self._values[top]
+
+    def pop_many(self, count):
+        """
+        Remove count top items from the stack.
+
+        Returns:
+            array: Values of the removed items, the former top first.
+
+        Raises:
+            EmptyStackError: If stack has less than count items. The stack is not changed then.
+            ValueError: If count is negative.
+
+        """
+        if count < 0:
+            raise ValueError('count must not be negative')
+        top = self._tops[self._number]
+        if top - count < self._min_index:
+            raise EmptyStackError
+        values = self._values[top - count:top]
+        values.reverse()
+        self._tops[self._number] = top - count
+        return values
+
+    def peek(self):
+        top = self._tops[self._number]
+        if top == self._min_index:
+            raise EmptyStackError
+        return self._values[top - 1]
+
+    def is_empty(self):
+        return self._tops[self._number] == self._min_index
+
+    def __len__(self):
+        return self._tops[self._number] - self._min_index
+
+
+class TypedStackArray:
+    """
+    Data structure which uses a single typed array to store multiple stacks of numbers.
+
+    Like StackArray, every stack has a fixed section of the array. Values are stored unboxed, see
+    the array module, so a value takes 8 bytes instead of a list slot and a number object. Stacks
+    can be used through TypedStackArrayItem objects or by number: push_many() and pop_many() work
+    with many stacks in one call.
+
+    If the values of a bulk call are grouped by stack, every stack gets a single slice copy, so
+    they are moved at the speed of the array module. Values for interleaved stacks are moved one
+    at a time, which is about as fast as pushing them to a StackArray.
+
+    Args:
+        capacity (int): Stack size, equal for all.
+        length (int): Number of stacks in TypedStackArray.
+        typecode (str): Array typecode for the values, 'q' (64-bit integers) by default.
+
+    """
+
+    def __init__(self, capacity, length=3, typecode='q'):
+        self._capacity = capacity
+        self._length = length
+        self._values = array(typecode, [0]) * (capacity * length)
+        # Index of the slot above the top of every stack.
+        self._tops = [i * capacity for i in range(length)]
+        self._stacks = [TypedStackArrayItem(self, i) for i in range(length)]
+
+    @property
+    def capacity(self):
+        """
+        Stack size, equal for all.
+        """
+        return self._capacity
+
+    @property
+    def typecode(self):
+        """
+        Typecode of the values array.
+        """
+        return self._values.typecode
+
+    def push(self, number, value):
+        """
+        Push value to the stack with the given number.
+
+        Raises:
+            IndexError: If there is no stack with this number.
+            StackOverflowError: If the stack is full.
+
+        """
+        self._stacks[number].push(value)
+
+    def push_many(self, numbers, values):
+        """
+        Push every value to the stack with the corresponding number.
+
+        Values pushed to the same stack are pushed in order, the last one ends up on the top.
+
+        Complexity: O(K + S) time, where K is the number of values and S is the number of stacks.
+
+        Args:
+            numbers (sequence): Numbers of the stacks.
+            values (iterable): Values to push, as many as numbers.
+
+        Raises:
+            ValueError: If there are more or fewer values than numbers.
+            TypeError: If some of the numbers is not an integer.
+            IndexError: If there is no stack with some of the numbers.
+            StackOverflowError: If some of the values don't fit into their stack.
+
+        Nothing is pushed if an exception is raised.
+
+        """
+        values = array(self.typecode, values)
+        if len(values) != len(numbers):
+            raise ValueError('numbers and values must have the same length')
+        numbers, counts = self._count(numbers)
+        tops = self._tops
+        for number, count in counts.items():
+            if tops[number] + count > self._stacks[number]._max_index:
+                raise StackOverflowError
+
+        items = self._values
+        sections = self._sections(numbers, counts)
+        if sections is None:
+            for number, value in zip(numbers, values):
+                top = tops[number]
+                items[top] = value
+                tops[number] = top + 1
+        else:
+            for number, start, end in sections:
+                top = tops[number]
+                items[top:top + end - start] = values[start:end]
+                tops[number] = top + end - start
+
+    def pop(self, number):
+        """
+        Remove top item from the stack with the given number and return its value.
+
+        Raises:
+            IndexError: If there is no stack with this number.
+            EmptyStackError: If the stack is empty.
+
+        """
+        return self._stacks[number].pop()
+
+    def pop_many(self, numbers):
+        """
+        Pop a value from the stack with every number.
+
+        Complexity: O(K + S) time, where K is the number of values and S is the number of stacks.
+
+        Args:
+            numbers (sequence): Numbers of the stacks, a number repeats to pop several values.
+
+        Returns:
+            array: Popped values in the order of the numbers.
+
+        Raises:
+            TypeError: If some of the numbers is not an integer.
+            IndexError: If there is no stack with some of the numbers.
+            EmptyStackError: If some stack has fewer values than requested.
+
+        Nothing is popped if an exception is raised.
+
+        """
+        numbers, counts = self._count(numbers)
+        tops = self._tops
+        for number, count in counts.items():
+            if tops[number] - count < self._stacks[number]._min_index:
+                raise EmptyStackError
+
+        items = self._values
+        values = array(self.typecode, [0]) * len(numbers)
+        sections = self._sections(numbers, counts)
+        if sections is None:
+            for i, number in enumerate(numbers):
+                top = tops[number] - 1
+                values[i] = items[top]
+                tops[number] = top
+        else:
+            for number, start, end in sections:
+                top = tops[number]
+                popped = items[top - end + start:top]
+                popped.reverse()
+                values[start:end] = popped
+                tops[number] = top - end + start
+        return values
+
+    def peek(self, number):
+        """
+        Get the value of top item of the stack with the given number without removing it.
+
+        Raises:
+            IndexError: If there is no stack with this number.
+            EmptyStackError: If the stack is empty.
+
+        """
+        return self._stacks[number].peek()
+
+    def _count(self, numbers):
+        """
+        Count the numbers of every stack.
+
+        Negative numbers are replaced with non-negative ones first, so every stack has a single
+        number. Only the distinct numbers are checked when there are no negative ones.
+
+        Returns:
+            tuple: The numbers and a Counter of them, in the order of first appearance.
+
+        Raises:
+            IndexError: If there is no stack with some of the numbers.
+            TypeError: If some of the numbers is not an integer.
+
+        """
+        stack_numbers = range(self._length)
+        counts = Counter(numbers)
+        normalized = {number: stack_numbers[number] for number in counts}
+        if any(number != stack_number for number, stack_number in normalized.items()):
+            numbers = [normalized[number] for number in numbers]
+            counts = Counter(numbers)
+        return numbers, counts
+
+    @staticmethod
+    def _sections(numbers, counts):
+        """
+        Find the section of the numbers which every stack occupies.
+
+        Returns:
+            list: (number, start, end) for every stack, None if the numbers are not grouped by
+                stack.
+
+        """
+        sections = []
+        start = 0
+        for number, count in counts.items():
+            end = start + count
+            if numbers[start:end].count(number) != count:
+                return None
+            sections.append((number, start, end))
+            start = end
+        return sections
+
+    def __getitem__(self, key):
+        return self._stacks[key]
+
+    def __len__(self):
+        return self._length
+
+
 class TestStackArray(unittest.TestCase):
 
     def test_stack_array_4x1(self):
@@ -340,3 +783,149 @@ class TestStackArray(unittest.TestCase):
         self.assertIs(stack_array[2].is_empty(), True)
         self.assertRaises(EmptyStackError, stack_array[2].peek)
         self.assertRaises(EmptyStackError, stack_array[2].pop)
+
+
+class TestElasticStackArray(unittest.TestCase):
+
+    def test_shared_space(self):
+        stack_array = ElasticStackArray(3, 12)
+        self.assertEqual(len(stack_array), 3)
+        self.assertEqual(stack_array.capacity, 12)
+        for i in range(3):
+            self.assertIs(type(stack_array[i]), ElasticStackItem)
+            self.assertIs(stack_array[i].is_empty(), True)
+            self.assertRaises(EmptyStackError, stack_array[i].pop)
+            self.assertRaises(EmptyStackError, stack_array[i].peek)
+
+        # The first stack takes the space of its empty neighbours.
+        for i in range(1, 6):
+            stack_array[0].push(i)
+        stack_array[2].push('a')
+        self.assertEqual(stack_array.capacity, 12)
+        self.assertEqual(stack_array[0].peek(), 5)
+        self.assertEqual(stack_array[2].peek(), 'a')
+        self.assertIs(stack_array[1].is_empty(), True)
+
+        for i in range(6, 13):
+            stack_array[0].push(i)
+        self.assertGreater(stack_array.capacity, 12)
+        self.assertEqual(len(stack_array[0]), 12)
+        self.assertEqual(stack_array.size(), 13)
+        self.assertEqual([stack_array[0].pop() for i in range(12)], list(range(12, 0, -1)))
+        self.assertEqual(stack_array[2].pop(), 'a')
+        self.assertEqual(stack_array.size(), 0)
+
+    def test_random_operations(self):
+        rng = random.Random(3)
+        stack_array = ElasticStackArray(20)
+        stacks = [[] for i in range(20)]
+        for i in range(5000):
+            # Stacks with lower numbers are used more often.
+            number = min(rng.randrange(20), rng.randrange(20))
+            if stacks[number] and rng.random() < 0.4:
+                self.assertEqual(stack_array[number].pop(), stacks[number].pop())
+            else:
+                stack_array[number].push(i)
+                stacks[number].append(i)
+
+        used = sum(map(len, stacks))
+        self.assertEqual(stack_array.size(), used)
+        self.assertLess(stack_array.capacity, 3 * (used + 20))
+        for number, stack in enumerate(stacks):
+            self.assertEqual(len(stack_array[number]), len(stack))
+            while stack:
+                self.assertEqual(stack_array[number].peek(), stack[-1])
+                self.assertEqual(stack_array[number].pop(), stack.pop())
+            self.assertIs(stack_array[number].is_empty(), True)
+
+
+class TestTypedStackArray(unittest.TestCase):
+
+    def test_items(self):
+        stack_array = TypedStackArray(3, 2)
+        self.assertEqual(len(stack_array), 2)
+        self.assertEqual(stack_array.typecode, 'q')
+        self.assertRaises(IndexError, lambda: stack_array[2])
+        for i in range(2):
+            self.assertIs(type(stack_array[i]), TypedStackArrayItem)
+            self.assertIs(stack_array[i].is_empty(), True)
+            self.assertRaises(EmptyStackError, stack_array[i].pop)
+            self.assertRaises(EmptyStackError, stack_array[i].peek)
+
+        stack_array[0].push(1)
+        stack_array[0].push_many([2, 3])
+        self.assertRaises(StackOverflowError, stack_array[0].push, 4)
+        self.assertRaises(StackOverflowError, stack_array[0].push_many, [4])
+        stack_array[-1].push_many([])
+        stack_array[1].push(-5)
+        self.assertEqual(stack_array[0].peek(), 3)
+        self.assertEqual(len(stack_array[0]), 3)
+        self.assertEqual(stack_array[1].pop(), -5)
+        self.assertIs(stack_array[1].is_empty(), True)
+
+        self.assertEqual(list(stack_array[0].pop_many(2)), [3, 2])
+        self.assertRaises(EmptyStackError, stack_array[0].pop_many, 2)
+        self.assertRaises(ValueError, stack_array[0].pop_many, -1)
+        self.assertEqual(stack_array[0].pop(), 1)
+        self.assertEqual(list(stack_array[0].pop_many(0)), [])
+        self.assertRaises(TypeError, stack_array[0].push, 'a')
+
+    def test_many_stacks(self):
+        stack_array = TypedStackArray(4, 3, 'd')
+        stack_array.push_many([0, 2, 0, 1], [1.5, 2.5, 3.5, 4.5])
+        self.assertEqual(stack_array.peek(0), 3.5)
+        self.assertEqual(stack_array.peek(2), 2.5)
+        self.assertEqual(list(stack_array.pop_many([0, 1, 0])), [3.5, 4.5, 1.5])
+        self.assertIs(stack_array[0].is_empty(), True)
+
+        # Failed calls don't change the stacks.
+        self.assertRaises(StackOverflowError, stack_array.push_many, [1] * 5, range(5))
+        self.assertRaises(IndexError, stack_array.push_many, [1, 3], [1, 2])
+        self.assertRaises(IndexError, stack_array.push, 3, 1)
+        self.assertRaises(ValueError, stack_array.push_many, [1], [1, 2])
+        self.assertRaises(EmptyStackError, stack_array.pop_many, [2, 2])
+        self.assertRaises(EmptyStackError, stack_array.pop, 1)
+        self.assertEqual([len(stack_array[i]) for i in range(3)], [0, 0, 1])
+        self.assertEqual(stack_array.pop(2), 2.5)
+
+        stack_array.push_many([1] * 4, range(4))
+        self.assertEqual(list(stack_array.pop_many([1] * 4)), [3, 2, 1, 0])
+
+    def test_grouped(self):
+        rng = random.Random(20)
+        for grouped in (False, True):
+            stack_array = TypedStackArray(1000, 5)
+            stacks = [[] for i in range(5)]
+            for i in range(10):
+                numbers = [rng.randrange(-5, 5) for j in range(rng.randrange(100))]
+                if grouped:
+                    numbers.sort(key=lambda number: number % 5)
+                values = [rng.randrange(100) for number in numbers]
+                stack_array.push_many(numbers, values)
+                for number, value in zip(numbers, values):
+                    stacks[number].append(value)
+
+                numbers = [rng.randrange(5) for j in range(rng.randrange(100))]
+                numbers = [number for i, number in enumerate(numbers)
+                           if numbers[:i + 1].count(number) <= len(stacks[number])]
+                if grouped:
+                    numbers.sort()
+                self.assertEqual(list(stack_array.pop_many(numbers)),
+                                 [stacks[number].pop() for number in numbers])
+                self.assertEqual([len(stack_array[i]) for i in range(5)], list(map(len, stacks)))
+
+    def test_negative_numbers(self):
+        stack_array = TypedStackArray(2, 3)
+        # -2 and 1 are the same stack, so three values don't fit into it.
+        self.assertRaises(StackOverflowError, stack_array.push_many, [1, -2, 1], [1, 2, 3])
+        self.assertRaises(IndexError, stack_array.push_many, [0, 0, -4], [1, 2, 3])
+        self.assertRaises(TypeError, stack_array.push_many, [0, 1.0], [1, 2])
+        self.assertEqual([len(stack_array[i]) for i in range(3)], [0, 0, 0])
+
+        stack_array.push_many([1, -2, -1], [1, 2, 3])
+        self.assertEqual([len(stack_array[i]) for i in range(3)], [0, 2, 1])
+        self.assertEqual(stack_array.peek(1), 2)
+        self.assertRaises(EmptyStackError, stack_array.pop_many, [-2, 1, 1])
+        self.assertRaises(IndexError, stack_array.pop_many, [1, 3])
+        self.assertEqual(list(stack_array.pop_many([-2, 2, 1])), [2, 3, 1])
+        self.assertTrue(all(stack_array[i].is_empty() for i in range(3)))
@@ -4,7 +4,14 @@ Stack Min
 How would you design a stack which, in addition to push and pop, has a function min()
 which returns the minimum element? Push, pop and min should all operate in 0(1) time.
 
+MinStack stores a pointer to the minimum in every item. MinMaxStack keeps both the minimum and the
+maximum, and stores an extremum only when it changes. AggregateStack generalizes MinStack to any
+associative operation: sum, gcd, bitwise or, matrix product and so on.
+
 """
+from math import gcd
+import operator
+import random
 import unittest
 from .stacks import Stack, EmptyStackError
 
@@ -59,6 +66,116 @@ class MinStack(Stack):
         return self._top.min.value
 
 
+class MinMaxStack(Stack):
+    """
+    Stack which gives the values of the minimum and the maximum elements in O(1) time.
+
+    Besides the stack itself, there are two lists of the extrema, each entry is a pair of a value
+    and the number of times it has been pushed in a row. An entry is added only when a pushed
+    value is a new extremum, so for random values the lists hold O(log N) entries rather than N
+    pointers.
+
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._mins = []
+        self._maxes = []
+
+    def push(self, value):
+        super().push(value)
+        mins = self._mins
+        if not mins or value < mins[-1][0]:
+            mins.append([value, 1])
+        elif value == mins[-1][0]:
+            mins[-1][1] += 1
+        maxes = self._maxes
+        if not maxes or value > maxes[-1][0]:
+            maxes.append([value, 1])
+        elif value == maxes[-1][0]:
+            maxes[-1][1] += 1
+
+    def pop(self):
+        value = super().pop()
+        # A popped value equal to the extremum was counted when it was pushed.
+        for extrema in (self._mins, self._maxes):
+            if value == extrema[-1][0]:
+                extrema[-1][1] -= 1
+                if not extrema[-1][1]:
+                    extrema.pop()
+        return value
+
+    def peek_min(self):
+        if not self._mins:
+            raise EmptyStackError
+        return self._mins[-1][0]
+
+    def peek_max(self):
+        if not self._maxes:
+            raise EmptyStackError
+        return self._maxes[-1][0]
+
+
+class AggregateStackItem:
+    """
+    Item of an AggregateStack.
+
+    Args:
+        value: Item value.
+        next_item (AggregateStackItem): Next item in a stack.
+        aggregate: Aggregate of the values of this item and the items added to a stack earlier.
+
+    Attributes:
+        value: Item value.
+        next (AggregateStackItem): Next item in a stack.
+        aggregate: Aggregate of the values of this item and the items added to a stack earlier.
+
+    """
+    __slots__ = ('value', 'next', 'aggregate')
+
+    def __init__(self, value, next_item, aggregate):
+        self.value = value
+        self.next = next_item
+        self.aggregate = aggregate
+
+
+class AggregateStack(Stack):
+    """
+    Stack which gives the aggregate of all its values in O(1) time.
+
+    The aggregate is calculated with an associative operation, which need not be commutative,
+    starting from the identity: for values a, b, c pushed in this order it is op(op(a, b), c), or
+    op(c, op(b, a)) if the stack is reversed. Every item stores the aggregate of itself and the
+    items below it, so push() calls the operation once.
+
+    Args:
+        op (callable): Associative function of two arguments.
+        identity: Identity element of the operation: op(identity, x) == op(x, identity) == x.
+        reverse (bool): Aggregate the values from the top to the bottom.
+
+    """
+
+    def __init__(self, op, identity, reverse=False):
+        super().__init__()
+        self.op = op
+        self.identity = identity
+        self.reverse = reverse
+
+    def push(self, value):
+        aggregate = self._top.aggregate if self._top else self.identity
+        if self.reverse:
+            aggregate = self.op(value, aggregate)
+        else:
+            aggregate = self.op(aggregate, value)
+        self._top = AggregateStackItem(value, self._top, aggregate)
+
+    def aggregate(self):
+        """
+        Get the aggregate of all the values, the identity for an empty stack.
+        """
+        return self._top.aggregate if self._top else self.identity
+
+
 class TestMinStack(unittest.TestCase):
 
     def test_min_stack(self):
@@ -221,3 +338,72 @@ class TestMinStack(unittest.TestCase):
         self.assertRaises(EmptyStackError, stack.peek)
         self.assertRaises(EmptyStackError, stack.peek_min)
         self.assertIs(stack.is_empty(), True)
+
+
+class TestMinMaxStack(unittest.TestCase):
+
+    def test_min_max_stack(self):
+        stack = MinMaxStack()
+        self.assertRaises(EmptyStackError, stack.pop)
+        self.assertRaises(EmptyStackError, stack.peek_min)
+        self.assertRaises(EmptyStackError, stack.peek_max)
+
+        values = [8, 16, 8, 4, 16, 4, 24, 2, 12]
+        for value in values:
+            stack.push(value)
+        self.assertEqual(stack._mins, [[8, 2], [4, 2], [2, 1]])
+        self.assertEqual(stack._maxes, [[8, 1], [16, 2], [24, 1]])
+
+        while values:
+            self.assertEqual(stack.peek_min(), min(values))
+            self.assertEqual(stack.peek_max(), max(values))
+            self.assertEqual(stack.pop(), values.pop())
+        self.assertIs(stack.is_empty(), True)
+        self.assertRaises(EmptyStackError, stack.peek_min)
+
+    def test_random_values(self):
+        rng = random.Random(1)
+        stack = MinMaxStack()
+        values = []
+        for i in range(2000):
+            if values and rng.random() < 0.4:
+                self.assertEqual(stack.pop(), values.pop())
+            else:
+                values.append(rng.randrange(50))
+                stack.push(values[-1])
+            if values:
+                self.assertEqual(stack.peek_min(), min(values))
+                self.assertEqual(stack.peek_max(), max(values))
+
+
+class TestAggregateStack(unittest.TestCase):
+
+    def test_aggregates(self):
+        for op, identity in ((operator.add, 0), (gcd, 0), (operator.or_, 0), (max, -1)):
+            stack = AggregateStack(op, identity)
+            self.assertEqual(stack.aggregate(), identity)
+            values = [12, 18, 7, 30, 0, 42]
+            for i, value in enumerate(values):
+                stack.push(value)
+                expected = identity
+                for pushed in values[:i + 1]:
+                    expected = op(expected, pushed)
+                self.assertEqual(stack.aggregate(), expected)
+            for i in range(len(values)):
+                self.assertEqual(stack.pop(), values.pop())
+                expected = identity
+                for pushed in values:
+                    expected = op(expected, pushed)
+                self.assertEqual(stack.aggregate(), expected)
+            self.assertRaises(EmptyStackError, stack.pop)
+
+    def test_order(self):
+        # String concatenation is associative but not commutative.
+        stack = AggregateStack(operator.add, '')
+        reversed_stack = AggregateStack(operator.add, '', reverse=True)
+        for value in 'abc':
+            stack.push(value)
+            reversed_stack.push(value)
+        self.assertEqual(stack.aggregate(), 'abc')
+        self.assertEqual(reversed_stack.aggregate(), 'cba')
+        self.assertEqual(stack.peek(), 'c')
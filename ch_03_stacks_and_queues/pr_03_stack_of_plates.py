@@ -11,8 +11,15 @@ SetOfStacks.push() and SetOfStacks.pop() should behave identically to a single s
 FOLLOW UP
 Implement a function popAt (int index) which performs a pop operation on a specific sub-stack.
 
+SetOfStacks keeps all the sub-stacks but the newest one full, so pop_at() shifts a plate through
+every following sub-stack. IndexedSetOfStacks gives the same results in O(log N) time: it lets
+sub-stacks run under capacity, finds plates by position with a Fenwick tree over the sub-stack
+sizes and compacts the sub-stacks when too many of them are half empty.
+
 """
 from collections import deque
+from itertools import chain, islice
+import random
 import unittest
 
 from .stacks import EmptyStackError
@@ -182,7 +189,236 @@ class SetOfStacks:
         return tuples
 
 
+class FenwickTree:
+    """
+    Fenwick tree (binary indexed tree) of integers, used by IndexedSetOfStacks.
+
+    Keeps prefix sums of a growing sequence of numbers. Numbers are changed, prefix sums are
+    calculated and positions are found in O(log N) time.
+
+    Args:
+        values (iterable): Optional initial values.
+
+    """
+
+    def __init__(self, values=()):
+        # The tree is 1-based: tree[i] is the sum of values[i - lowbit(i):i].
+        self._tree = tree = [0]
+        tree.extend(values)
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+
+    def __len__(self):
+        return len(self._tree) - 1
+
+    def append(self, value):
+        """
+        Add a value to the end of the sequence in O(log N) time.
+        """
+        i = len(self._tree)
+        self._tree.append(value + self.prefix_sum(i - 1) - self.prefix_sum(i - (i & -i)))
+
+    def truncate(self, length):
+        """
+        Remove the values after the first length values in O(1) amortized time.
+        """
+        del self._tree[length + 1:]
+
+    def add(self, index, delta):
+        """
+        Add delta to the value with the given index.
+        """
+        tree = self._tree
+        i = index + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, length):
+        """
+        Return the sum of the first length values.
+        """
+        tree = self._tree
+        total = 0
+        while length:
+            total += tree[length]
+            length &= length - 1
+        return total
+
+    def find(self, position):
+        """
+        Find the value which covers a position, if values are sizes of consecutive segments.
+
+        Values must not be negative.
+
+        Returns:
+            tuple: Index of the value and the offset of the position within its segment.
+
+        """
+        tree = self._tree
+        index = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            if index + step < len(tree) and tree[index + step] <= position:
+                index += step
+                position -= tree[index]
+            step >>= 1
+        return index, position
+
+
+class IndexedSetOfStacks:
+    """
+    Stack of plates with pop_at() and positional access in O(log N) time.
+
+    Gives the same results as SetOfStacks. Logically plates are grouped into sub-stacks by capacity
+    counting from the bottom, as if sub-stacks were always full. Physically they are stored in a
+    list of deques which may run under capacity: pop_at() removes the plate from the deque where
+    it is, instead of shifting plates between sub-stacks. A Fenwick tree over the deque sizes
+    finds the deque holding the plate at any position.
+
+    The deques are compacted when there are more than twice as many of them as full sub-stacks
+    needed, so the amortized cost of compaction is O(1) per removal.
+
+    Complexity: O(1) amortized time for push() and pop(), O(log N + C) time for pop_at() and
+        positional access, where N is the number of sub-stacks and C is the capacity.
+
+    Args:
+        capacity (int): Capacity of the sub-stacks.
+
+    """
+
+    def __init__(self, capacity):
+        self._capacity = capacity
+        self._substacks = []
+        self._sizes = FenwickTree()
+        self._count = 0
+
+    def __len__(self):
+        """
+        Return the number of logical sub-stacks, one for an empty set.
+        """
+        return max(1, -(-self._count // self._capacity))
+
+    @property
+    def capacity(self):
+        """
+        Capacity of the sub-stacks.
+        """
+        return self._capacity
+
+    def push(self, value):
+        """
+        Push a new item to the set of stacks in O(1) amortized time.
+        """
+        if not self._substacks or len(self._substacks[-1]) >= self._capacity:
+            self._substacks.append(deque())
+            self._sizes.append(0)
+        self._substacks[-1].append(value)
+        self._sizes.add(len(self._substacks) - 1, 1)
+        self._count += 1
+
+    def pop(self):
+        """
+        Pop the newest item in O(1) amortized time.
+
+        Raises:
+            EmptyStackError: If the set is empty.
+
+        """
+        if not self._count:
+            raise EmptyStackError
+        value = self._substacks[-1].pop()
+        self._removed(len(self._substacks) - 1)
+        return value
+
+    def peek(self):
+        """
+        Peek the newest item in O(1) time.
+
+        Raises:
+            EmptyStackError: If the set is empty.
+
+        """
+        if not self._count:
+            raise EmptyStackError
+        return self._substacks[-1][-1]
+
+    def is_empty(self):
+        """
+        Return True is set is empty, False otherwise.
+        """
+        return not self._count
+
+    def pop_at(self, i):
+        """
+        Pop an item from a specific logical sub-stack.
+
+        Args:
+            i (int): Index of sub-stack, zero based.
+
+        Raises:
+            IndexError: If index is out of range.
+            EmptyStackError: If the set is empty.
+
+        """
+        if i < 0 or i > len(self) - 1:
+            raise IndexError
+        if not self._count:
+            raise EmptyStackError
+
+        index, offset = self._sizes.find(min((i + 1) * self._capacity, self._count) - 1)
+        substack = self._substacks[index]
+        value = substack[offset]
+        del substack[offset]
+        self._removed(index)
+        return value
+
+    def _removed(self, index):
+        # Trailing empty deques are dropped at once, so the last deque holds the top plate.
+        self._sizes.add(index, -1)
+        self._count -= 1
+        substacks = self._substacks
+        if not substacks[index] and index == len(substacks) - 1:
+            while substacks and not substacks[-1]:
+                substacks.pop()
+            self._sizes.truncate(len(substacks))
+        if len(substacks) > 2 * len(self) + 1:
+            self.compact()
+
+    def compact(self):
+        """
+        Move the plates to full sub-stacks in O(P) time, where P is the number of plates.
+        """
+        plates = chain.from_iterable(self._substacks)
+        self._substacks = [deque(islice(plates, self._capacity))
+                           for i in range(-(-self._count // self._capacity))]
+        self._sizes = FenwickTree(map(len, self._substacks))
+
+    def __getitem__(self, position):
+        """
+        Get the plate at a position counting from the bottom, zero based.
+
+        Raises:
+            IndexError: If position is out of range.
+
+        """
+        if position < 0 or position >= self._count:
+            raise IndexError('plate position out of range')
+        index, offset = self._sizes.find(position)
+        return self._substacks[index][offset]
+
+    def as_tuples(self):
+        """
+        Represent the logical sub-stacks as a list of tuples.
+        """
+        plates = chain.from_iterable(self._substacks)
+        return [tuple(islice(plates, self._capacity)) for i in range(len(self))]
+
+
 class TestSetOfStacks(unittest.TestCase):
+    stack_class = SetOfStacks
 
     def _check_state(self, stack, expected_state):
         self.assertEqual(stack.as_tuples(), expected_state)
@@ -198,7 +434,7 @@ class TestSetOfStacks(unittest.TestCase):
             self.assertEqual(stack.peek(), expected_state[-1][-1])
 
     def test_capacity_1(self):
-        s = SetOfStacks(1)
+        s = self.stack_class(1)
         self.assertEqual(s.capacity, 1)
         self._check_state(s, [()])
 
@@ -259,7 +495,7 @@ class TestSetOfStacks(unittest.TestCase):
         self._check_state(s, [()])
 
     def test_capacity_2(self):
-        s = SetOfStacks(2)
+        s = self.stack_class(2)
         self.assertEqual(s.capacity, 2)
         self._check_state(s, [()])
 
@@ -341,7 +577,7 @@ class TestSetOfStacks(unittest.TestCase):
         self._check_state(s, [(12,)])
 
     def test_capacity_3(self):
-        s = SetOfStacks(3)
+        s = self.stack_class(3)
         self.assertEqual(s.capacity, 3)
         self._check_state(s, [()])
 
@@ -478,3 +714,45 @@ class TestSetOfStacks(unittest.TestCase):
 
         self.assertEqual(s.pop(), 3)
         self._check_state(s, [()])
+
+
+class TestIndexedSetOfStacks(TestSetOfStacks):
+    stack_class = IndexedSetOfStacks
+
+    def test_random_operations(self):
+        rng = random.Random(5)
+        for capacity in (1, 3, 10):
+            expected = SetOfStacks(capacity)
+            s = IndexedSetOfStacks(capacity)
+            for i in range(3000):
+                operation = rng.random()
+                if operation < 0.5 or expected.is_empty():
+                    expected.push(i)
+                    s.push(i)
+                elif operation < 0.7:
+                    self.assertEqual(s.pop(), expected.pop())
+                else:
+                    index = rng.randrange(len(expected))
+                    self.assertEqual(s.pop_at(index), expected.pop_at(index))
+                self.assertEqual(len(s), len(expected))
+            self.assertEqual(s.as_tuples(), expected.as_tuples())
+            plates = [plate for substack in expected.as_tuples() for plate in substack]
+            self.assertEqual([s[position] for position in range(len(plates))], plates)
+            self.assertRaises(IndexError, s.__getitem__, len(plates))
+            s.compact()
+            self.assertEqual(s.as_tuples(), expected.as_tuples())
+
+    def test_fenwick_tree(self):
+        values = [3, 0, 2, 5, 1, 0, 4]
+        tree = FenwickTree(values[:3])
+        for value in values[3:]:
+            tree.append(value)
+        self.assertEqual(len(tree), len(values))
+        for length in range(len(values) + 1):
+            self.assertEqual(tree.prefix_sum(length), sum(values[:length]))
+        self.assertEqual([tree.find(position) for position in (0, 2, 3, 5, 9, 10, 14)],
+                         [(0, 0), (0, 2), (2, 0), (3, 0), (3, 4), (4, 0), (6, 3)])
+        tree.add(1, 2)
+        tree.truncate(3)
+        self.assertEqual(tree.prefix_sum(3), 7)
+        self.assertEqual(tree.find(4), (1, 1))
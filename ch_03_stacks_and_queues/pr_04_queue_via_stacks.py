@@ -3,10 +3,22 @@ Queue via Stacks
 
 Implement a MyQueue class which implements a queue using two stacks.
 
+MinMaxQueue is MyQueue made of two MinMaxStacks, which gives the minimum and the maximum of the
+queue in O(1) time, and sliding_window_extrema() uses it to find extrema of a sliding window.
+AggregateQueue and sliding_window_aggregate() do the same for any associative operation.
+
+RealTimeQueue spreads the transfer between the stacks over the following operations, so every
+operation takes O(1) time in the worst case rather than amortized.
+
 """
+from collections import deque
+from math import gcd
+import operator
+import random
 import unittest
 
-from .stacks import Stack
+from .pr_02_stack_min import AggregateStack, MinMaxStack
+from .stacks import ArrayStack, Stack
 from .queues import EmptyQueueError
 
 
@@ -34,13 +46,18 @@ class MyQueue:
         4. Pop/peek the element from the head. Return.
 
     Transfer between stacks takes O(N) time, but since each element must be transferred only once
-    the amortized cost of pop and peek is O(1).
+    the amortized cost of pop and peek is O(1). Stacks with pop_many() and push_many(), like the
+    default ArrayStack, are transferred in bulk: the values are copied in reverse order at once.
+
+    Attributes:
+        stack_class (type): Class of the head and the tail stacks, subclasses may change it.
 
     """
+    stack_class = ArrayStack
 
     def __init__(self):
-        self._tail = Stack()
-        self._head = Stack()
+        self._tail = self.stack_class()
+        self._head = self.stack_class()
 
     def add(self, value):
         self._tail.push(value)
@@ -49,23 +66,249 @@ class MyQueue:
         if self._head.is_empty():
             if self._tail.is_empty():
                 raise EmptyQueueError
-            while not self._tail.is_empty():
-                self._head.push(self._tail.pop())
+            self._transfer()
         return self._head.pop()
 
     def peek(self):
         if self._head.is_empty():
             if self._tail.is_empty():
                 raise EmptyQueueError
-            while not self._tail.is_empty():
-                self._head.push(self._tail.pop())
+            self._transfer()
         return self._head.peek()
 
+    def _transfer(self):
+        if hasattr(self._tail, 'pop_many') and hasattr(self._head, 'push_many'):
+            self._head.push_many(self._tail.pop_many(len(self._tail)))
+            return
+        while not self._tail.is_empty():
+            self._head.push(self._tail.pop())
+
     def is_empty(self):
         return self._head.is_empty() and self._tail.is_empty()
 
 
+class RealTimeQueue:
+    """
+    Queue implementation using two stacks, with O(1) worst-case time of every operation.
+
+    This is the queue of Hood and Melville. Values are added to the rear stack and removed from
+    the front stack, both are lists with the top at the end. When the rear becomes longer than the
+    front, a rotation starts: a new front is built from the rear reversed, followed by a copy of
+    the old front, while the old front keeps serving removals and new values go to a new rear.
+    Every operation performs a few steps of the rotation. A rotation of a front of F values takes
+    at most 2F + 1 steps, so it ends before the F values of the old front are removed.
+
+    A value removed from the old front after it has been copied is removed from the new front too.
+    When the rotation ends, the old front still holds the copied values, it is cleared a few
+    values per operation as well: releasing it at once would take O(N) time.
+
+    """
+    STEPS = 3
+
+    def __init__(self):
+        self._front = []
+        self._rear = []
+        # Rotation state: the reversed part of the rear, the new front and the number of values of
+        # the old front copied to it. The new front is None if there is no rotation.
+        self._rotated_rear = []
+        self._new_front = None
+        self._copied = 0
+        self._garbage = []
+
+    def add(self, value):
+        self._rear.append(value)
+        self._rotate()
+
+    def remove(self):
+        if not self._front:
+            raise EmptyQueueError
+        value = self._front.pop()
+        if self._new_front is not None and self._copied > len(self._front):
+            self._new_front.pop()
+            self._copied -= 1
+        self._rotate()
+        return value
+
+    def peek(self):
+        if not self._front:
+            raise EmptyQueueError
+        return self._front[-1]
+
+    def is_empty(self):
+        return not self._front
+
+    def __len__(self):
+        length = len(self._front) + len(self._rear) + len(self._rotated_rear)
+        if self._new_front is not None:
+            # Values of the old front in the new front are counted in the old one.
+            length += len(self._new_front) - self._copied
+        return length
+
+    def _rotate(self):
+        if self._garbage:
+            del self._garbage[-1][-self.STEPS:]
+            if not self._garbage[-1]:
+                self._garbage.pop()
+
+        if self._new_front is None:
+            if len(self._rear) <= len(self._front):
+                return
+            self._rotated_rear = self._rear
+            self._rear = []
+            self._new_front = []
+            self._copied = 0
+
+        new_front = self._new_front
+        for i in range(self.STEPS):
+            if self._rotated_rear:
+                new_front.append(self._rotated_rear.pop())
+            elif self._copied < len(self._front):
+                new_front.append(self._front[self._copied])
+                self._copied += 1
+            else:
+                if self._front:
+                    self._garbage.append(self._front)
+                self._front = new_front
+                self._new_front = None
+                break
+
+
+class MinMaxQueue(MyQueue):
+    """
+    Queue which gives the values of the minimum and the maximum elements in O(1) time.
+
+    Both stacks of the queue are MinMaxStacks, so the extremum of the queue is the extremum of the
+    extrema of the stacks. add() and remove() take O(1) amortized time like in MyQueue.
+
+    """
+    stack_class = MinMaxStack
+
+    def peek_min(self):
+        """
+        Get the value of the minimum element.
+
+        Raises:
+            EmptyQueueError: If queue is empty.
+
+        """
+        head, tail = self._head, self._tail
+        if head.is_empty():
+            if tail.is_empty():
+                raise EmptyQueueError
+            return tail.peek_min()
+        if tail.is_empty():
+            return head.peek_min()
+        return min(head.peek_min(), tail.peek_min())
+
+    def peek_max(self):
+        """
+        Get the value of the maximum element.
+
+        Raises:
+            EmptyQueueError: If queue is empty.
+
+        """
+        head, tail = self._head, self._tail
+        if head.is_empty():
+            if tail.is_empty():
+                raise EmptyQueueError
+            return tail.peek_max()
+        if tail.is_empty():
+            return head.peek_max()
+        return max(head.peek_max(), tail.peek_max())
+
+
+def sliding_window_extrema(iterable, k):
+    """
+    Generate the minimum and the maximum of every k consecutive values.
+
+    Complexity: O(N) time, O(K) space.
+
+    Args:
+        iterable: Values, they must be comparable with each other.
+        k (int): Size of the window.
+
+    Yields:
+        tuple: Minimum and maximum of the window which ends at the current value, starting with
+            the k-th value.
+
+    Raises:
+        ValueError: If k is not positive.
+
+    """
+    if k < 1:
+        raise ValueError('window size must be positive')
+    window = MinMaxQueue()
+    for count, value in enumerate(iterable, 1):
+        window.add(value)
+        if count > k:
+            window.remove()
+        if count >= k:
+            yield window.peek_min(), window.peek_max()
+
+
+class AggregateQueue(MyQueue):
+    """
+    Queue which gives the aggregate of all its values in O(1) time.
+
+    The tail stack aggregates values from the bottom to the top, the head stack from the top to
+    the bottom, so both go from the older values to the newer ones, and the aggregate of the queue
+    is op(head aggregate, tail aggregate). The operation must be associative, it need not be
+    commutative. add() and remove() take O(1) amortized time and call the operation once per
+    stack an element passes through.
+
+    Args:
+        op (callable): Associative function of two arguments.
+        identity: Identity element of the operation.
+
+    """
+
+    def __init__(self, op, identity):
+        self.op = op
+        self.identity = identity
+        self._tail = AggregateStack(op, identity)
+        self._head = AggregateStack(op, identity, reverse=True)
+
+    def aggregate(self):
+        """
+        Get the aggregate of all the values from the oldest to the newest, the identity for an
+        empty queue.
+        """
+        return self.op(self._head.aggregate(), self._tail.aggregate())
+
+
+def sliding_window_aggregate(iterable, k, op, identity):
+    """
+    Generate the aggregates of every k consecutive values.
+
+    Complexity: O(N) time and calls of the operation, O(K) space.
+
+    Args:
+        iterable: Values.
+        k (int): Size of the window.
+        op (callable): Associative function of two arguments.
+        identity: Identity element of the operation.
+
+    Yields:
+        Aggregate of the window which ends at the current value, starting with the k-th value.
+
+    Raises:
+        ValueError: If k is not positive.
+
+    """
+    if k < 1:
+        raise ValueError('window size must be positive')
+    window = AggregateQueue(op, identity)
+    for count, value in enumerate(iterable, 1):
+        window.add(value)
+        if count > k:
+            window.remove()
+        if count >= k:
+            yield window.aggregate()
+
+
 class TestMyQueue(unittest.TestCase):
+    queue_class = MyQueue
 
     def _check_state(self, queue, expected_state):
         if expected_state == ():
@@ -77,7 +320,7 @@ class TestMyQueue(unittest.TestCase):
             self.assertEqual(queue.peek(), expected_state[0])
 
     def test_my_queue(self):
-        q = MyQueue()                                   # head tail
+        q = self.queue_class()                          # head tail
         self._check_state(q, ())                        # () ()
 
         q.add(1)
@@ -199,3 +442,107 @@ class TestMyQueue(unittest.TestCase):
 
         self.assertEqual(q.remove(), 20)
         self._check_state(q, ())                        # () ()
+
+
+class TestMinMaxQueue(TestMyQueue):
+    queue_class = MinMaxQueue
+
+    def test_extrema(self):
+        rng = random.Random(2)
+        queue = MinMaxQueue()
+        self.assertRaises(EmptyQueueError, queue.peek_min)
+        self.assertRaises(EmptyQueueError, queue.peek_max)
+        values = deque()
+        for i in range(2000):
+            if values and rng.random() < 0.45:
+                self.assertEqual(queue.remove(), values.popleft())
+            else:
+                values.append(rng.randrange(100))
+                queue.add(values[-1])
+            if values:
+                self.assertEqual(queue.peek_min(), min(values))
+                self.assertEqual(queue.peek_max(), max(values))
+            else:
+                self.assertRaises(EmptyQueueError, queue.peek_min)
+
+    def test_sliding_window_extrema(self):
+        rng = random.Random(3)
+        values = [rng.random() for i in range(300)]
+        for k in (1, 2, 5, 299, 300, 301):
+            expected = [(min(values[i - k:i]), max(values[i - k:i]))
+                        for i in range(k, len(values) + 1)]
+            self.assertEqual(list(sliding_window_extrema(values, k)), expected)
+        self.assertEqual(list(sliding_window_extrema('bacd', 2)),
+                         [('a', 'b'), ('a', 'c'), ('c', 'd')])
+        self.assertRaises(ValueError, list, sliding_window_extrema([1], 0))
+
+
+class TestAggregateQueue(TestMyQueue):
+    queue_class = staticmethod(lambda: AggregateQueue(operator.add, 0))
+
+    def test_aggregate(self):
+        rng = random.Random(4)
+        for op, identity in ((operator.add, 0), (gcd, 0), (operator.or_, 0), (operator.add, '')):
+            queue = AggregateQueue(op, identity)
+            values = deque()
+            for i in range(1000):
+                if values and rng.random() < 0.45:
+                    self.assertEqual(queue.remove(), values.popleft())
+                else:
+                    value = rng.randrange(1, 1000)
+                    values.append(value if identity != '' else chr(ord('a') + value % 26))
+                    queue.add(values[-1])
+                expected = identity
+                for value in values:
+                    expected = op(expected, value)
+                self.assertEqual(queue.aggregate(), expected)
+
+    def test_sliding_window_aggregate(self):
+        values = [30, 18, 48, 6, 54, 12, 42]
+        self.assertEqual(list(sliding_window_aggregate(values, 3, operator.add, 0)),
+                         [sum(values[i - 3:i]) for i in range(3, len(values) + 1)])
+        self.assertEqual(list(sliding_window_aggregate(values, 2, gcd, 0)),
+                         [gcd(values[i - 2], values[i - 1]) for i in range(2, len(values) + 1)])
+        self.assertEqual(list(sliding_window_aggregate('abcd', 2, operator.add, '')),
+                         ['ab', 'bc', 'cd'])
+        self.assertRaises(ValueError, list, sliding_window_aggregate([1], 0, operator.add, 0))
+
+
+class TestLinkedMyQueue(TestMyQueue):
+
+    class LinkedMyQueue(MyQueue):
+        stack_class = Stack
+
+    queue_class = LinkedMyQueue
+
+
+class TestRealTimeQueue(TestMyQueue):
+    queue_class = RealTimeQueue
+
+    def test_random_operations(self):
+        rng = random.Random(6)
+        for remove_probability in (0.3, 0.5, 0.7):
+            queue = RealTimeQueue()
+            values = deque()
+            for i in range(3000):
+                if values and rng.random() < remove_probability:
+                    self.assertEqual(queue.remove(), values.popleft())
+                else:
+                    values.append(i)
+                    queue.add(i)
+                self.assertEqual(len(queue), len(values))
+                self.assertIs(queue.is_empty(), not values)
+                if values:
+                    self.assertEqual(queue.peek(), values[0])
+            while values:
+                self.assertEqual(queue.remove(), values.popleft())
+            self.assertRaises(EmptyQueueError, queue.remove)
+
+    def test_bounded_work(self):
+        # Rotations keep up with the additions: the rear never grows much longer than the front.
+        queue = RealTimeQueue()
+        for i in range(1000):
+            queue.add(i)
+            self.assertLessEqual(len(queue._rear), len(queue._front) + 1)
+        for i in range(1000):
+            self.assertEqual(queue.remove(), i)
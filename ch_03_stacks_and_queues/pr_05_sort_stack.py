@@ -6,9 +6,11 @@ additional temporary stack, but you may not copy the elements into any other dat
 (such as an array). The stack supports the following operations: push, pop, peek, and isEmpty.
 
 """
+import operator
 import unittest
 
-from .stacks import Stack
+from .pr_02_stack_min import AggregateStack
+from .stacks import ArrayStack, Stack
 
 
 def sort_stack(stack):
@@ -20,16 +22,17 @@ def sort_stack(stack):
     Complexity: O(N²) time, O(1) additional space.
 
     Args:
-        stack (Stack): Stack to sort.
+        stack (Stack or ArrayStack): Stack to sort. The buffer is an ArrayStack.
 
     """
     if stack.is_empty():
         return
 
     size = 0
-    buffer = Stack()  # Second stack, the buffer
+    buffer = ArrayStack()  # Second stack, the buffer
 
-    # Move all elements from the first stack to the second, except for the biggest. Count the elements.
+    # Move all elements from the first stack to the second, except for the biggest.
+    # Count the elements.
     maximum = stack.pop()
     while not stack.is_empty():
         value = stack.pop()
@@ -41,7 +44,8 @@ def sort_stack(stack):
             buffer.push(value)
     stack.push(maximum)
 
-    # Move elements between the stacks back and forth, until both contain half of the elements and sorted.
+    # Move elements between the stacks back and forth, until both contain half of the elements
+    # and sorted.
     # At the end the first stack will contain the bigger items sorted ascending from top to bottom.
     # The second stack will contain the smaller items sorted descending from top to bottom.
     while size:
@@ -84,10 +88,10 @@ def sort_stack_2(stack):
     Complexity: O(N²) time, O(1) additional space.
 
     Args:
-        stack (Stack): Stack to sort.
+        stack (Stack or ArrayStack): Stack to sort. The buffer is an ArrayStack.
 
     """
-    buffer = Stack()
+    buffer = ArrayStack()
 
     # Move all items from the stack to the buffer in sorted order, placing the biggest on the top.
     while not stack.is_empty():
@@ -133,8 +137,10 @@ class TestSortStack(unittest.TestCase):
         ([6, 7, 5, 8, 4, 3, 9, 2, 0, 1], [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]),
     ]
 
+    stack_class = Stack
+
     def create_stack(self, values):
-        stack = Stack()
+        stack = self.stack_class()
         for value in values:
             stack.push(value)
         return stack
@@ -158,3 +164,21 @@ class TestSortStack(unittest.TestCase):
                 stack = self.create_stack(values)
                 sort_stack_2(stack)
                 self.assertEqual(self.stack_to_list(stack), sorted_values)
+
+
+class TestSortArrayStack(TestSortStack):
+    stack_class = ArrayStack
+
+
+class TestSortAggregateStack(unittest.TestCase):
+
+    def test_sort_aggregate_stack(self):
+        # Stacks whose constructors take arguments use the same buffer.
+        for sort in (sort_stack, sort_stack_2):
+            stack = AggregateStack(operator.add, 0)
+            for value in (3, 1, 4, 2):
+                stack.push(value)
+            sort(stack)
+            self.assertEqual(stack.aggregate(), 10)
+            self.assertEqual([stack.pop() for i in range(4)], [1, 2, 3, 4])
+            self.assertTrue(stack.is_empty())
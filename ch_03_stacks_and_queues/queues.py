@@ -1,6 +1,7 @@
 """
 Queue implementation.
 """
+from itertools import repeat
 import unittest
 
 
@@ -18,6 +19,13 @@ class EmptyQueueError(QueueError):
     pass
 
 
+class FullQueueError(QueueError):
+    """
+    Raised if add() is attempted on a queue which has reached its full capacity.
+    """
+    pass
+
+
 class QueueItem:
     """
     Item of a linked list that constitutes a queue, used internally by Queue class.
@@ -92,6 +100,157 @@ class Queue:
         return self._front is None
 
 
+class RingQueue:
+    """
+    Queue implementation based on circular buffer.
+
+    Values are stored in a list whose length is a power of two, so wrapping of the front and rear
+    positions takes a bitwise AND. An unbounded queue doubles the buffer when it is full, which
+    gives amortized O(1) add. A bounded queue raises FullQueueError instead.
+
+    Args:
+        capacity (int): Maximal number of items in the queue, None for unbounded queue.
+
+    Raises:
+        ValueError: If capacity is not positive.
+
+    """
+    MIN_BUFFER_SIZE = 8
+
+    def __init__(self, capacity=None):
+        if capacity is not None and capacity < 1:
+            raise ValueError('capacity must be positive')
+        self._capacity = capacity
+        size = self.MIN_BUFFER_SIZE
+        while capacity is not None and size < capacity:
+            size *= 2
+        self._buffer = [None] * size
+        self._mask = size - 1
+        self._front = 0
+        self._size = 0
+
+    @property
+    def capacity(self):
+        """
+        Maximal number of items in the queue, None for unbounded queue.
+        """
+        return self._capacity
+
+    def add(self, value):
+        """
+        Add item to the end of the queue.
+
+        Raises:
+            FullQueueError: If bounded queue is full.
+
+        """
+        if self._size == len(self._buffer) or self._size == self._capacity:
+            self._make_room(1)
+        self._buffer[(self._front + self._size) & self._mask] = value
+        self._size += 1
+
+    def add_many(self, values):
+        """
+        Add items from an iterable to the end of the queue, copying them in at most two slices.
+
+        Raises:
+            FullQueueError: If bounded queue has no room for all the values. The queue is not
+                changed then.
+
+        """
+        values = list(values)
+        count = len(values)
+        self._make_room(count)
+        rear = (self._front + self._size) & self._mask
+        first_part = min(count, len(self._buffer) - rear)
+        self._buffer[rear:rear + first_part] = values[:first_part]
+        self._buffer[:count - first_part] = values[first_part:]
+        self._size += count
+
+    def _make_room(self, count):
+        """
+        Grow the buffer of unbounded queue so that count more items fit into it. Check the
+        capacity of bounded queue.
+        """
+        size = self._size + count
+        if self._capacity is not None:
+            if size > self._capacity:
+                raise FullQueueError
+            return
+        buffer_size = len(self._buffer)
+        if size <= buffer_size:
+            return
+        while buffer_size < size:
+            buffer_size *= 2
+        values = self._buffer[self._front:] + self._buffer[:self._front]
+        self._buffer = values[:self._size] + [None] * (buffer_size - self._size)
+        self._mask = buffer_size - 1
+        self._front = 0
+
+    def remove(self):
+        """
+        Remove the first item from the front of the queue and return its value.
+
+        Raises:
+            EmptyQueueError: If queue is empty.
+
+        """
+        if not self._size:
+            raise EmptyQueueError
+        value = self._buffer[self._front]
+        self._buffer[self._front] = None
+        self._front = (self._front + 1) & self._mask
+        self._size -= 1
+        return value
+
+    def remove_many(self, count):
+        """
+        Remove count items from the front of the queue, copying them in at most two slices.
+
+        Returns:
+            list: Values of the removed items, the former front first.
+
+        Raises:
+            EmptyQueueError: If queue has less than count items. The queue is not changed then.
+            ValueError: If count is negative.
+
+        """
+        if count < 0:
+            raise ValueError('count must not be negative')
+        if count > self._size:
+            raise EmptyQueueError
+        front = self._front
+        first_part = min(count, len(self._buffer) - front)
+        values = self._buffer[front:front + first_part]
+        values += self._buffer[:count - first_part]
+        self._buffer[front:front + first_part] = repeat(None, first_part)
+        self._buffer[:count - first_part] = repeat(None, count - first_part)
+        self._front = (front + count) & self._mask
+        self._size -= count
+        return values
+
+    def peek(self):
+        """
+        Get the value of the front item without removing it.
+
+        Raises:
+            EmptyQueueError: If queue is empty.
+
+        """
+        if not self._size:
+            raise EmptyQueueError
+        return self._buffer[self._front]
+
+    def is_empty(self):
+        """
+        Return True if queue is empty, False otherwise.
+        """
+        return not self._size
+
+    def __len__(self):
+        return self._size
+
+
 class TestQueue(unittest.TestCase):
 
     def setUp(self):
@@ -211,3 +370,61 @@ class TestQueue(unittest.TestCase):
 
         self.assertEqual(q.remove(), 17)
         self._check_state(None)           # ()
+
+
+class TestRingQueue(TestQueue):
+
+    def setUp(self):
+        self.queue = RingQueue()
+
+    def test_growth(self):
+        q = self.queue
+        for i in range(3):
+            q.add(-1)
+            q.remove()
+        for i in range(100):
+            q.add(i)
+        self.assertEqual(len(q), 100)
+        self.assertEqual(len(q._buffer), 128)
+        self.assertEqual([q.remove() for i in range(100)], list(range(100)))
+        self.assertTrue(q.is_empty())
+
+    def test_bulk_operations(self):
+        q = self.queue
+        self.assertEqual(q.remove_many(0), [])
+        for i in range(6):
+            q.add(i)
+        q.remove_many(5)
+        q.add_many(range(6, 11))
+        self.assertEqual(q.remove_many(3), [5, 6, 7])
+        q.add_many(iter(range(11, 31)))
+        self.assertEqual(len(q), 23)
+        self.assertRaises(EmptyQueueError, q.remove_many, 24)
+        self.assertRaises(ValueError, q.remove_many, -1)
+        self.assertEqual(q.remove_many(20), list(range(8, 28)))
+        self.assertEqual(q.remove(), 28)
+        self.assertEqual(q.remove_many(2), [29, 30])
+        self.assertTrue(q.is_empty())
+        self.assertTrue(all(value is None for value in q._buffer))
+
+
+class TestBoundedRingQueue(TestQueue):
+
+    def setUp(self):
+        self.queue = RingQueue(capacity=5)
+
+    def test_capacity(self):
+        self.assertEqual(RingQueue(capacity=8)._mask, 7)
+        self.assertEqual(RingQueue(capacity=9)._mask, 15)
+        self.assertRaises(ValueError, RingQueue, 0)
+
+        q = self.queue
+        self.assertEqual(q.capacity, 5)
+        q.add_many(range(4))
+        self.assertRaises(FullQueueError, q.add_many, [4, 5])
+        q.add(4)
+        self.assertRaises(FullQueueError, q.add, 5)
+        self.assertEqual(q.remove_many(3), [0, 1, 2])
+        q.add_many([5, 6, 7])
+        self.assertEqual(len(q), 5)
+        self.assertEqual(q.remove_many(5), [3, 4, 5, 6, 7])
@@ -1,6 +1,7 @@
 """
 Stack implementation.
 """
+from array import array
 import unittest
 
 
@@ -92,6 +93,100 @@ class Stack:
         return self._top is None
 
 
+class ArrayStack:
+    """
+    Stack implementation based on dynamic array.
+
+    Values are stored in a list, or in a typed array if typecode is given. Both grow by
+    over-allocation, so push takes amortized O(1) time and no object is allocated per value.
+
+    Args:
+        typecode (str): Optional array typecode for the values, see the array module.
+
+    """
+
+    def __init__(self, typecode=None):
+        self._items = [] if typecode is None else array(typecode)
+
+    @property
+    def typecode(self):
+        """
+        Typecode of the values array, None if the values are stored in a list.
+        """
+        return None if isinstance(self._items, list) else self._items.typecode
+
+    def push(self, value):
+        """
+        Push value to the stack.
+        """
+        self._items.append(value)
+
+    def push_many(self, values):
+        """
+        Push values from an iterable to the stack, the last one ends up on the top.
+        """
+        self._items.extend(values)
+
+    def pop(self):
+        """
+        Remove top item from the stack and return its value.
+
+        Raises:
+            EmptyStackError: If stack is empty.
+
+        """
+        if not self._items:
+            raise EmptyStackError
+        return self._items.pop()
+
+    def pop_many(self, count):
+        """
+        Remove count top items from the stack.
+
+        Args:
+            count (int): Number of items to remove.
+
+        Returns:
+            list or array: Values of the removed items in the order they would be popped one by
+                one, the former top first.
+
+        Raises:
+            EmptyStackError: If stack has less than count items. The stack is not changed then.
+            ValueError: If count is negative.
+
+        """
+        if count < 0:
+            raise ValueError('count must not be negative')
+        if count > len(self._items):
+            raise EmptyStackError
+        if count == 0:
+            return self._items[:0]
+        values = self._items[:-count - 1:-1]
+        del self._items[-count:]
+        return values
+
+    def peek(self):
+        """
+        Get the value of top item without removing it.
+
+        Raises:
+            EmptyStackError: If stack is empty.
+
+        """
+        if not self._items:
+            raise EmptyStackError
+        return self._items[-1]
+
+    def is_empty(self):
+        """
+        Return True if stack is empty, False otherwise.
+        """
+        return not self._items
+
+    def __len__(self):
+        return len(self._items)
+
+
 class TestStack(unittest.TestCase):
 
     def setUp(self):
@@ -138,3 +233,32 @@ class TestStack(unittest.TestCase):
 
         self.assertEqual(s.pop(), 2)
         self._check_stack_state(is_empty=True)          # []
+
+
+class TestArrayStack(TestStack):
+
+    def setUp(self):
+        self.stack = ArrayStack()
+
+    def test_typed_stack(self):
+        self.stack = ArrayStack('q')
+        self.assertEqual(self.stack.typecode, 'q')
+        self.test_stack()
+        self.assertRaises(TypeError, self.stack.push, 'a')
+
+    def test_bulk_operations(self):
+        for typecode in (None, 'q'):
+            s = ArrayStack(typecode)
+            self.assertEqual(list(s.pop_many(0)), [])
+            s.push_many(range(5))
+            s.push(5)
+            self.assertEqual(len(s), 6)
+            self.assertEqual(s.peek(), 5)
+            self.assertRaises(EmptyStackError, s.pop_many, 7)
+            self.assertRaises(ValueError, s.pop_many, -1)
+            self.assertEqual(len(s), 6)
+            self.assertEqual(list(s.pop_many(4)), [5, 4, 3, 2])
+            self.assertEqual(list(s.pop_many(0)), [])
+            self.assertEqual(s.pop(), 1)
+            self.assertEqual(list(s.pop_many(1)), [0])
+            self.assertTrue(s.is_empty())
@@ -0,0 +1,449 @@
+"""
+Work-stealing scheduler built on the stack of plates.
+
+Every worker thread of a WorkStealingPool owns a WorkStealingDeque, a SetOfStacks whose sub-stacks
+are linked in both directions. The owner pushes and pops tasks at the top, so it runs the newest,
+smallest tasks of a divide-and-conquer algorithm first and keeps its data in cache. An idle worker
+steals from the bottom of the oldest sub-stack of another worker, taking the oldest task, which
+is usually the largest one, so steals are rare.
+
+A task waiting for another task helps instead of blocking: it runs tasks from its own deque or
+steals them until the awaited task is done. So recursive tasks may wait for their subtasks
+without exhausting the pool.
+
+"""
+from collections import deque
+import os
+import random
+import threading
+import time
+import unittest
+
+from .pr_03_stack_of_plates import SetOfStacks, SubStack
+from .stacks import EmptyStackError
+
+
+class WorkStealingDeque(SetOfStacks):
+    """
+    Thread-safe SetOfStacks which also gives away values from the bottom.
+
+    Every sub-stack has a pointer to the newer one, so the oldest sub-stack is found in O(1) time
+    and dropped when the last value is stolen from it. A lock guards the links. The owner and a
+    thief contend for it only if they access the deque at the same moment, and deque operations
+    under the lock are short, so it is cheap compared to running a task.
+
+    Args:
+        capacity (int): Capacity of the sub-stacks.
+
+    """
+
+    def __init__(self, capacity=64):
+        super().__init__(capacity)
+        self._top.newer = None
+        self._bottom = self._top
+        self._lock = threading.Lock()
+
+    def push(self, value):
+        """
+        Push a new item to the top in O(1) time.
+        """
+        with self._lock:
+            if len(self._top) == self._capacity:
+                substack = SubStack(self._top)
+                substack.newer = None
+                self._top.newer = substack
+                self._top = substack
+                self._length += 1
+            self._top.append(value)
+
+    def pop(self):
+        """
+        Pop the newest item from the top in O(1) time.
+
+        Raises:
+            EmptyStackError: If there is a single sub-stack which is empty.
+
+        """
+        with self._lock:
+            value = super().pop()
+            self._top.newer = None
+            return value
+
+    def pop_at(self, i):
+        """
+        Pop an item from a specific sub-stack.
+
+        Sub-stacks are counted from the oldest one as in SetOfStacks, but steals leave the oldest
+        sub-stack partially filled. So indices address the sub-stacks as they are: the top item of
+        the i-th sub-stack is popped and the newer sub-stacks shift down to fill the gap.
+
+        Args:
+            i (int): Index of sub-stack, zero based.
+
+        Raises:
+            IndexError: If index is out of range.
+            EmptyStackError: If there is a single sub-stack which is empty.
+
+        """
+        with self._lock:
+            if i == self._length - 1:
+                # SetOfStacks.pop_at() would call self.pop(), which takes the lock again.
+                value = SetOfStacks.pop(self)
+            else:
+                value = super().pop_at(i)
+            self._top.newer = None
+            return value
+
+    def peek(self):
+        with self._lock:
+            return super().peek()
+
+    def steal(self):
+        """
+        Remove the oldest item from the bottom in O(1) time.
+
+        Raises:
+            EmptyStackError: If there is a single sub-stack which is empty.
+
+        """
+        with self._lock:
+            bottom = self._bottom
+            if not bottom:
+                raise EmptyStackError
+            value = bottom.popleft()
+            if not bottom and bottom is not self._top:
+                self._bottom = bottom.newer
+                self._bottom.next = None
+                self._length -= 1
+            return value
+
+
+class Task:
+    """
+    Function call scheduled by WorkStealingPool.submit().
+
+    Args:
+        pool (WorkStealingPool): Pool which runs the task.
+        func (callable): Function to call.
+        args (tuple): Positional arguments of the call.
+
+    """
+
+    def __init__(self, pool, func, args):
+        self._pool = pool
+        self._func = func
+        self._args = args
+        self._done = threading.Event()
+        self._result = None
+        self._exception = None
+
+    def run(self):
+        """
+        Call the function and save the result or the exception it raises.
+        """
+        try:
+            self._result = self._func(*self._args)
+        except BaseException as exception:
+            self._exception = exception
+        finally:
+            self._func = self._args = None
+            self._done.set()
+
+    def done(self):
+        """
+        Return True if the task has finished, False otherwise.
+        """
+        return self._done.is_set()
+
+    def result(self, timeout=None):
+        """
+        Wait for the task to finish and return the result of the call.
+
+        A worker thread of the pool runs other tasks while it waits, other threads block.
+
+        Args:
+            timeout (float): Maximal time to wait in seconds, None to wait forever. Ignored in the
+                worker threads.
+
+        Raises:
+            TimeoutError: If timeout has expired.
+            Exception: Exception raised by the function.
+
+        """
+        index = getattr(self._pool._local, 'index', None)
+        if index is not None:
+            while not self._done.is_set():
+                task = self._pool._find_task(index)
+                if task is None:
+                    # Somebody else runs the awaited task, or its subtasks.
+                    self._done.wait(0.001)
+                else:
+                    task.run()
+        elif not self._done.wait(timeout):
+            raise TimeoutError
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+
+class WorkStealingPool:
+    """
+    Thread pool where every worker has its own WorkStealingDeque of tasks.
+
+    Tasks submitted by a worker go to the top of its deque. Tasks submitted by other threads go to
+    a shared queue. A worker looks for a task in its deque, then in the shared queue, then steals
+    from the other workers starting with a random one. Workers without tasks sleep until a task is
+    submitted.
+
+    The pool can be used as a context manager which shuts it down.
+
+    Args:
+        workers (int): Number of worker threads, the number of CPUs by default.
+        capacity (int): Capacity of the sub-stacks of the deques.
+
+    """
+
+    def __init__(self, workers=None, capacity=64):
+        workers = workers or os.cpu_count() or 1
+        self._deques = [WorkStealingDeque(capacity) for i in range(workers)]
+        self._steals = [0] * workers
+        self._injected = deque()
+        self._local = threading.local()
+        self._sleeping = 0
+        self._wake_up = threading.Condition(threading.Lock())
+        self._shutdown = False
+        self._threads = [threading.Thread(target=self._work, args=(i,), daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def steals(self):
+        """
+        Number of tasks taken from the deques of other workers.
+        """
+        return sum(self._steals)
+
+    def submit(self, func, *args):
+        """
+        Schedule func(*args) to be run by a worker.
+
+        Workers may submit tasks after shutdown, so running tasks can still split their work.
+
+        Returns:
+            Task: The scheduled task.
+
+        Raises:
+            RuntimeError: If the pool has been shut down and the caller is not a worker.
+
+        """
+        task = Task(self, func, args)
+        index = getattr(self._local, 'index', None)
+        if index is None:
+            # Under the lock no worker can exit between the check and the append.
+            with self._wake_up:
+                if self._shutdown:
+                    raise RuntimeError('cannot submit tasks after shutdown')
+                self._injected.append(task)
+                if self._sleeping:
+                    self._wake_up.notify()
+            return task
+
+        self._deques[index].push(task)
+        # A worker increases the counter before it looks for tasks the last time, so either it
+        # finds this task or the counter is seen here.
+        if self._sleeping:
+            with self._wake_up:
+                self._wake_up.notify()
+        return task
+
+    def _find_task(self, index):
+        try:
+            return self._deques[index].pop()
+        except EmptyStackError:
+            pass
+        try:
+            return self._injected.popleft()
+        except IndexError:
+            pass
+        count = len(self._deques)
+        start = random.randrange(count)
+        for offset in range(count):
+            victim = (start + offset) % count
+            if victim == index:
+                continue
+            try:
+                task = self._deques[victim].steal()
+            except EmptyStackError:
+                continue
+            self._steals[index] += 1
+            return task
+        return None
+
+    def _work(self, index):
+        self._local.index = index
+        while True:
+            task = self._find_task(index)
+            if task is None:
+                with self._wake_up:
+                    self._sleeping += 1
+                    task = self._find_task(index)
+                    if task is None:
+                        if self._shutdown:
+                            self._sleeping -= 1
+                            return
+                        self._wake_up.wait()
+                    self._sleeping -= 1
+            if task is not None:
+                task.run()
+
+    def shutdown(self):
+        """
+        Run the remaining tasks, including the tasks they submit, and stop the worker threads.
+        """
+        with self._wake_up:
+            self._shutdown = True
+            self._wake_up.notify_all()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+
+class TestWorkStealingDeque(unittest.TestCase):
+
+    def test_push_pop_steal(self):
+        work = WorkStealingDeque(2)
+        self.assertRaises(EmptyStackError, work.pop)
+        self.assertRaises(EmptyStackError, work.steal)
+        for i in range(7):
+            work.push(i)
+        self.assertEqual(work.as_tuples(), [(0, 1), (2, 3), (4, 5), (6,)])
+
+        # The owner takes the newest values, thieves take the oldest ones.
+        self.assertEqual(work.pop(), 6)
+        self.assertEqual(work.steal(), 0)
+        self.assertEqual(work.steal(), 1)
+        self.assertEqual(work.as_tuples(), [(2, 3), (4, 5)])
+        self.assertEqual(len(work), 2)
+        self.assertEqual(work.peek(), 5)
+        self.assertEqual(work.pop_at(0), 3)
+        self.assertEqual(work.as_tuples(), [(2, 4), (5,)])
+
+        self.assertEqual(work.steal(), 2)
+        self.assertEqual(work.steal(), 4)
+        self.assertEqual(work.as_tuples(), [(5,)])
+        self.assertEqual(work.steal(), 5)
+        self.assertTrue(work.is_empty())
+        self.assertRaises(EmptyStackError, work.steal)
+
+        # The deque keeps working after it has been emptied from the bottom.
+        for i in range(5):
+            work.push(i)
+        self.assertEqual([work.steal() for i in range(3)], [0, 1, 2])
+        self.assertEqual([work.pop(), work.pop()], [4, 3])
+        self.assertTrue(work.is_empty())
+
+    def test_pop_at_after_steal(self):
+        work = WorkStealingDeque(3)
+        for i in range(8):
+            work.push(i)
+        self.assertEqual(work.steal(), 0)
+        self.assertEqual(work.as_tuples(), [(1, 2), (3, 4, 5), (6, 7)])
+
+        # Indices address the sub-stacks as they are, the oldest one stays partially filled.
+        self.assertEqual(work.pop_at(0), 2)
+        self.assertEqual(work.as_tuples(), [(1, 3), (4, 5, 6), (7,)])
+        self.assertEqual(work.pop_at(1), 6)
+        self.assertEqual(work.as_tuples(), [(1, 3), (4, 5, 7)])
+        self.assertRaises(IndexError, work.pop_at, 2)
+        self.assertRaises(IndexError, work.pop_at, -1)
+
+        self.assertEqual([work.steal(), work.steal()], [1, 3])
+        self.assertEqual(work.pop_at(0), 7)
+        self.assertEqual(work.as_tuples(), [(4, 5)])
+        work.push(8)
+        work.push(9)
+        self.assertEqual(work.steal(), 4)
+        self.assertEqual(work.pop_at(0), 8)
+        self.assertEqual(work.as_tuples(), [(5, 9)])
+        self.assertEqual([work.pop(), work.steal()], [9, 5])
+        self.assertRaises(EmptyStackError, work.pop_at, 0)
+
+    def test_threads(self):
+        work = WorkStealingDeque(4)
+        taken = []
+
+        def steal():
+            while len(taken) < 20000:
+                try:
+                    taken.append(work.steal())
+                except EmptyStackError:
+                    pass
+
+        thieves = [threading.Thread(target=steal) for i in range(3)]
+        for thief in thieves:
+            thief.start()
+        for i in range(10000):
+            work.push(2 * i)
+            work.push(2 * i + 1)
+            try:
+                taken.append(work.pop())
+            except EmptyStackError:
+                pass
+        for thief in thieves:
+            thief.join()
+        self.assertEqual(sorted(taken), list(range(20000)))
+
+
+class TestWorkStealingPool(unittest.TestCase):
+
+    def test_recursive_tasks(self):
+        def fibonacci(pool, n):
+            if n < 2:
+                return n
+            first = pool.submit(fibonacci, pool, n - 1)
+            return fibonacci(pool, n - 2) + first.result()
+
+        for workers in (1, 4):
+            with WorkStealingPool(workers) as pool:
+                self.assertEqual(pool.submit(fibonacci, pool, 15).result(timeout=60), 610)
+                tasks = [pool.submit(pow, i, 2) for i in range(100)]
+                self.assertEqual([task.result(timeout=60) for task in tasks],
+                                 [i * i for i in range(100)])
+                self.assertTrue(all(task.done() for task in tasks))
+
+    def test_shutdown_with_running_tasks(self):
+        def fibonacci(pool, n):
+            if n < 2:
+                return n
+            first = pool.submit(fibonacci, pool, n - 1)
+            return fibonacci(pool, n - 2) + first.result()
+
+        def start_after_shutdown(pool):
+            while not pool._shutdown:
+                time.sleep(0.001)
+            return fibonacci(pool, 12)
+
+        for workers in (1, 3):
+            pool = WorkStealingPool(workers)
+            task = pool.submit(start_after_shutdown, pool)
+            pool.shutdown()
+            self.assertEqual(task.result(timeout=0), 144)
+            self.assertRaises(RuntimeError, pool.submit, int, 1)
+
+    def test_exceptions(self):
+        with WorkStealingPool(2) as pool:
+            task = pool.submit(int, 'x')
+            self.assertRaises(ValueError, task.result, 60)
+            blocked = threading.Event()
+            task = pool.submit(blocked.wait)
+            self.assertRaises(TimeoutError, task.result, 0.01)
+            blocked.set()
+            self.assertTrue(task.result(timeout=60))
+        self.assertRaises(RuntimeError, pool.submit, int, 1)
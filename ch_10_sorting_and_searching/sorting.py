@@ -51,6 +51,36 @@ def merge_sort(lst: list) -> None:
     _merge_sort(lst, 0, len(lst) - 1, buffer)
 
 
+def merge_sort_section(lst: list, start: int, end: int, buffer: list) -> None:
+    """Sort section of a list using merge sort.
+
+    Only the same section of the buffer is used, so sections which don't overlap may be sorted
+    concurrently with a shared buffer and merged later with merge_sections().
+
+    Complexity: O(K log K) time for a section of K items.
+
+    :param lst: List to sort.
+    :param start: First index of the section.
+    :param end: Last index of the section.
+    :param buffer: Auxiliary buffer at least as long as the list.
+    """
+    _merge_sort(lst, start, end, buffer)
+
+
+def merge_sections(lst: list, start: int, middle: int, end: int, buffer: list) -> None:
+    """Merge two sorted adjacent sections of a list into one sorted section.
+
+    Complexity: O(K) time for K items in both sections.
+
+    :param lst: List which contains the sections.
+    :param start: First index of the left section.
+    :param middle: Last index of the left section.
+    :param end: Last index of the right section.
+    :param buffer: Auxiliary buffer at least as long as the list.
+    """
+    _merge(lst, start, middle, end, buffer)
+
+
 def _merge_sort(lst: list, start: int, end: int, buffer: list) -> None:
     """Sort section of a list using merge sort.
 
@@ -206,6 +236,19 @@ class TestSorting(unittest.TestCase):
                 merge_sort(lst_copy)
                 assert lst_copy == sorted_list
 
+    def test_merge_sections(self):
+        for lst in self.generate_lists():
+            with self.subTest(values=lst):
+                lst_copy = lst.copy()
+                buffer = lst.copy()
+                middle = len(lst) // 3
+                merge_sort_section(lst_copy, 0, middle, buffer)
+                merge_sort_section(lst_copy, middle + 1, len(lst) - 1, buffer)
+                assert lst_copy[:middle + 1] == sorted(lst[:middle + 1])
+                assert lst_copy[middle + 1:] == sorted(lst[middle + 1:])
+                merge_sections(lst_copy, 0, middle, len(lst) - 1, buffer)
+                assert lst_copy == sorted(lst)
+
     def test_quicksort(self):
         for lst in self.generate_lists():
             with self.subTest(values=lst):